@@ -0,0 +1,103 @@
+"""
+Compares polygon display mesh triangulation: earcut (converter/geometry/triangulation.py)
+against the previous per-polygon panda3d Triangulator path. Runs without arcpy.
+
+    python scripts/benchmark_triangulation.py [polygon_count] [vertices_per_ring]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "speckle_toolbox", "esri", "toolboxes"))
+from speckle.speckle.converter.geometry.triangulation import triangulatePolygons
+
+
+def makePolygons(count: int, vertices: int, seed: int = 0):
+    """Star-shaped rings with one hole each, similar to building footprints with courtyards"""
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for n in range(count):
+        angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+        radius = 10 + 3 * rng.random(vertices)
+        x0, y0 = 100 * (n % 100), 100 * (n // 100)
+        outer = np.column_stack(
+            (
+                x0 + radius * np.cos(angles),
+                y0 + radius * np.sin(angles),
+                np.zeros(vertices),
+            )
+        )
+        holeAngles = angles[::-4]
+        hole = np.column_stack(
+            (
+                x0 + 3 * np.cos(holeAngles),
+                y0 + 3 * np.sin(holeAngles),
+                np.zeros(len(holeAngles)),
+            )
+        )
+        polygons.append([outer, hole])
+    return polygons
+
+
+def panda3dTriangulation(polygons):
+    """Previous path: one Triangulator per polygon, midpoints added on boundary edges"""
+    from panda3d.core import Triangulator
+
+    vertices = []
+    faces = []
+    for outer, *holes in polygons:
+        trianglator = Triangulator()
+        existing = len(vertices) // 3
+        count = len(outer)
+        for k in range(count):
+            pt = outer[k]
+            pt2 = outer[(k + 1) % count]
+            trianglator.addPolygonVertex(trianglator.addVertex(pt[0], pt[1]))
+            vertices.extend([pt[0], pt[1], pt[2]])
+            mid = (pt + pt2) / 2
+            trianglator.addPolygonVertex(trianglator.addVertex(mid[0], mid[1]))
+            vertices.extend([mid[0], mid[1], mid[2]])
+        for hole in holes:
+            trianglator.beginHole()
+            for pt in hole:
+                trianglator.addHoleVertex(trianglator.addVertex(pt[0], pt[1]))
+                vertices.extend([pt[0], pt[1], pt[2]])
+        trianglator.triangulate()
+        for i in range(trianglator.getNumTriangles()):
+            faces.extend(
+                [
+                    3,
+                    trianglator.getTriangleV0(i) + existing,
+                    trianglator.getTriangleV1(i) + existing,
+                    trianglator.getTriangleV2(i) + existing,
+                ]
+            )
+    return vertices, faces
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    vertices = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    polygons = makePolygons(count, vertices)
+    print(f"{count} polygons, {vertices} vertices per exterior ring, 1 hole each")
+
+    start = time.perf_counter()
+    meshVertices, meshFaces = triangulatePolygons(polygons)
+    elapsed = time.perf_counter() - start
+    print(f"earcut:   {elapsed:.3f} s, {len(meshFaces) // 4} triangles")
+
+    try:
+        start = time.perf_counter()
+        meshVertices, meshFaces = panda3dTriangulation(polygons)
+        elapsed = time.perf_counter() - start
+        print(f"panda3d:  {elapsed:.3f} s, {len(meshFaces) // 4} triangles")
+    except ImportError:
+        print("panda3d:  not installed, skipped")
+
+
+if __name__ == "__main__":
+    main()
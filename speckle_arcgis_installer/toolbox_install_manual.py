@@ -58,6 +58,6 @@ def installDependencies(pythonExec: str, pkgName: str, pkgVersion: str):
     return True
 
 installToolbox(pythonPath)
-installDependencies(pythonPath, "specklepy", "2.9.0"  )
+installDependencies(pythonPath, "specklepy", "2.17.17")
 installDependencies(pythonPath, "panda3d", "1.10.11" )
 
@@ -2,7 +2,7 @@ from datetime import datetime
 import inspect
 import math
 import os
-from typing import List, Union
+from typing import List, Tuple, Union
 import arcpy
 from arcpy._mp import ArcGISProject, Map, Layer as arcLayer
 
@@ -15,7 +15,9 @@ from speckle.speckle.plugin_utils.helpers import (
 )
 from speckle.speckle.converter.layers.utils import (
     apply_reproject,
-    findTransformation,
+    findTransformationCached,
+    getLayerDescribe,
+    getLayerSetting,
     getVariantFromValue,
     traverseDict,
     validateAttributeName,
@@ -24,13 +26,40 @@ from speckle.speckle.converter.layers.utils import (
 # from speckle.speckle.converter.geometry.conversions import transform
 from speckle.speckle.converter.geometry.conversions import (
     convertToNative,
+    convertToNativeCoords,
     convertToNativeMulti,
+    convertToNativeMultiCoords,
     convertToSpeckle,
+    nativeGeometryFromCoords,
 )
 from speckle.speckle.converter.geometry.mesh import constructMeshFromRaster
-from speckle.speckle.converter.geometry.utils import apply_pt_offsets_rotation_on_send
+from speckle.speckle.converter.geometry.raster_mesh import (
+    RASTER_LOD_METHODS,
+    RASTER_MESH_SHARED,
+    rasterGreyscaleColors,
+    rasterGridColors,
+    rasterGridFaces,
+    rasterGridVertices,
+    rasterMergedGridVertices,
+    rasterMergedRectangles,
+    rasterNoDataMask,
+    rasterDownsampleFactor,
+    rasterDownsample,
+    rasterRgbColors,
+    rasterSharedGridColors,
+    rasterSharedGridCull,
+    rasterSharedGridFaces,
+    rasterSharedGridVertices,
+    rasterStretchColors,
+    rasterUniqueValueColors,
+)
+from speckle.speckle.converter.geometry.utils import apply_coords_offsets_rotation_on_send
 from speckle.speckle.utils.panel_logging import logToUser
 from speckle.speckle.converter.features.utils import updateFeat
+from speckle.speckle.converter.features.raster_reader import (
+    rasterBandDimensions,
+    readRasterBand,
+)
 from specklepy.objects.GIS.geometry import (
     GisRasterElement,
     GisPolygonGeometry,
@@ -41,7 +70,10 @@ from specklepy.objects.GIS.geometry import (
 from specklepy.objects import Base
 
 from speckle.speckle.converter.geometry.point import pointToSpeckle
-from speckle.speckle.converter.layers.symbology import jsonFromLayerStyle
+from speckle.speckle.converter.layers.symbology import (
+    jsonFromLayerStyle,
+    symbol_color_to_speckle,
+)
 
 
 def featureToSpeckle(
@@ -52,7 +84,14 @@ def featureToSpeckle(
     projectCRS: arcpy.SpatialReference,
     selectedLayer: arcLayer,
     plugin,
+    x_form=None,
+    color: int = None,
+    meshes: List = None,
 ):
+    """Converts the feature with its attributes; color is the display color looked up
+    from the layer renderer color table, if any, and meshes are the polygon display meshes
+    computed for the chunk of features, if any
+    """
     dataStorage = plugin.dataStorage
     if dataStorage is None:
         return
@@ -61,7 +100,7 @@ def featureToSpeckle(
     iterations = 0
     try:
         geom = None
-        data = arcpy.Describe(selectedLayer.dataSource)
+        data = getLayerDescribe(selectedLayer, dataStorage)
         geomType = data.shapeType
         if (
             hasattr(data, "isRevit")
@@ -79,7 +118,7 @@ def featureToSpeckle(
         skipped_msg = f"'{geomType}' feature skipped due to invalid geometry"
         try:
             geom, iterations = convertToSpeckle(
-                f_shape, index, selectedLayer, data, dataStorage
+                f_shape, index, selectedLayer, data, dataStorage, x_form, color, meshes
             )
             print(geom)
             if geom is not None and geom != "None":
@@ -196,8 +235,7 @@ def rasterFeatureToSpeckle(
         #rasterDimensions = [my_raster.width, my_raster.height] #wrong result
         
         rb = my_raster.getRasterBands(rasterBandNames[0])
-        size = np.shape(rb.read())
-        rasterDimensions = [size[1], size[0]]
+        rasterDimensions = rasterBandDimensions(rb)
         print(rasterDimensions)
 
         # ds = gdal.Open(selectedLayer.source(), gdal.GA_ReadOnly)
@@ -235,11 +273,12 @@ def rasterFeatureToSpeckle(
         )
 
         # Try to extract geometry
-        x_form: tuple = findTransformation(
+        x_form: tuple = findTransformationCached(
             "Point",
             my_raster.spatialReference,
             projectCRS,
             selectedLayer,
+            dataStorage,
         )
 
         reprojectedPt = apply_reproject(rasterOriginPoint, x_form, dataStorage)
@@ -248,8 +287,16 @@ def rasterFeatureToSpeckle(
             reprojectedPt = rasterOriginPoint
             reprojectedPt_max = rasterOriginPoint_max
 
-        new_x_min, new_y_min = apply_pt_offsets_rotation_on_send(reprojectedPt.getPart().X, reprojectedPt.getPart().Y, dataStorage)
-        new_x_max, new_y_max = apply_pt_offsets_rotation_on_send(reprojectedPt_max.getPart().X, reprojectedPt_max.getPart().Y, dataStorage)
+        # raster corners moved and rotated together, with one affine transform
+        corners = apply_coords_offsets_rotation_on_send(
+            [
+                [reprojectedPt.getPart().X, reprojectedPt.getPart().Y],
+                [reprojectedPt_max.getPart().X, reprojectedPt_max.getPart().Y],
+            ],
+            dataStorage,
+        )
+        new_x_min, new_y_min = float(corners[0][0]), float(corners[0][1])
+        new_x_max, new_y_max = float(corners[1][0]), float(corners[1][1])
         res_x = (new_x_max - new_x_min) / rasterDimensions[0]
         res_y = (new_y_max - new_y_min) / rasterDimensions[1]
 
@@ -258,113 +305,123 @@ def rasterFeatureToSpeckle(
 
             rb = my_raster.getRasterBands(item)
             print(rb)
-            size = np.shape(rb.read())
-            print(size)
-            rasterDimensions = [size[1], size[0]]
-
-            valMin = rb.minimum
-            valMax = rb.maximum
-            bandVals = np.swapaxes(rb.read(), 1, 2).flatten()  # .tolist() np.flip( , 0)
-
-            bandValsFlat = bandVals.tolist()
-            # print(bandValsFlat)
-
-            const = float(-1 * math.pow(10, 30))
-            defaultNoData = rb.noDataValue
-            print(defaultNoData)
-
-            # check whether NA value is too small or raster has too small values
-            # assign min value of an actual list; re-assign NA val; replace list items to new NA val
-            try:
-                # create "safe" fake NA value; replace extreme values with it
-                fakeNA = max(bandValsFlat) + 1
-                bandValsFlatFake = [
-                    fakeNA if val <= const else val for val in bandValsFlat
-                ]  # replace all values corresponding to NoData value
 
-                # if default NA value is too small
-                if (
-                    isinstance(defaultNoData, float) or isinstance(defaultNoData, int)
-                ) and defaultNoData < const:
-                    # find and rewrite min of actual band values; create new NA value
-                    valMin = min(bandValsFlatFake)
-                    noDataValNew = valMin - 1000  # use new adequate value
-                    rasterBandNoDataVal.append(noDataValNew)
-                    # replace fake NA with new NA
-                    bandValsFlat = [
-                        noDataValNew if val == fakeNA else val
-                        for val in bandValsFlatFake
-                    ]  # replace all values corresponding to NoData value
-
-                # if default val unaccessible and minimum val is too small
-                elif (
-                    isinstance(defaultNoData, str) or defaultNoData is None
-                ) and valMin < const:  # if there are extremely small values but default NA unaccessible
-                    noDataValNew = valMin
-                    rasterBandNoDataVal.append(noDataValNew)
-                    # replace fake NA with new NA
-                    bandValsFlat = [
-                        noDataValNew if val == fakeNA else val
-                        for val in bandValsFlatFake
-                    ]  # replace all values corresponding to NoData value
-                    # last, change minValto actual one
-                    valMin = min(bandValsFlatFake)
-
-                else:
-                    rasterBandNoDataVal.append(rb.noDataValue)
-
-            except:
-                rasterBandNoDataVal.append(rb.noDataValue)
-
-            # if rasterBandNoDataVal[len(rasterBandNoDataVal) - 1] is None:
-            #   rasterBandNoDataVal[len(rasterBandNoDataVal) - 1] = np.nan
-            print(len(bandValsFlat))
-            rasterBandVals.append(bandValsFlat)
-            rasterBandMinVal.append(valMin)
-            rasterBandMaxVal.append(valMax)
-
-            b["@(10000)" + item + "_values"] = (
-                bandValsFlat  # [0:int(max_values/rasterBandCount)]
+            # read in blocks into one typed buffer, NoData fixed along the way
+            bandVals, valMin, noDataVal = readRasterBand(
+                rb, rasterDimensions[0], rasterDimensions[1], rb.noDataValue
             )
+            rasterBandNoDataVal.append(noDataVal)
+            rasterBandVals.append(bandVals)
+            rasterBandMinVal.append(valMin)
+            rasterBandMaxVal.append(rb.maximum)
 
-        b.x_origin, b.y_origin = apply_pt_offsets_rotation_on_send(
-            reprojectedPt.getPart().X, reprojectedPt.getPart().Y, dataStorage
-        )
+        b.x_origin, b.y_origin = new_x_min, new_y_min
         try:
             b.noDataValue = [float(val) for val in rasterBandNoDataVal]
         except:
             pass
-        # creating a mesh
-        vertices = []
-        faces = []
-        colors = []
-        count = 0
-
-        # print(selectedLayer.symbology)  # None
+        # creating a mesh from the typed band buffers, values are serialized once it is built
+        bandArrays = list(rasterBandVals)
+        sentBandArrays = rasterBandVals
+        meshWidth, meshHeight = rasterDimensions
         colorizer = None
 
-        # print(rendererType)
-        # identify symbology type and if Multiband, which band is which color
+        # optional level of detail: downsample the bands by one block factor
+        # to fit the display mesh into the cell budget (full resolution by default)
+        cellBudget = getLayerSetting(dataStorage, selectedLayer, "raster_cell_budget")
+        lodFactor = rasterDownsampleFactor(meshWidth, meshHeight, cellBudget)
+        if lodFactor > 1:
+            lodMethod = getLayerSetting(dataStorage, selectedLayer, "raster_lod_method")
+            if lodMethod not in RASTER_LOD_METHODS:
+                lodMethod = "mean"
+                if (
+                    hasattr(selectedLayer.symbology, "colorizer")
+                    and selectedLayer.symbology.colorizer.type
+                    == "RasterUniqueValueColorizer"
+                ):
+                    lodMethod = "mode"  # don't average the categories
+            for index in range(len(bandArrays)):
+                noDataVal = rasterBandNoDataVal[index]
+                if not isinstance(noDataVal, (int, float)):
+                    noDataVal = None
+                bandArrays[index], lodWidth, lodHeight = rasterDownsample(
+                    bandArrays[index],
+                    meshWidth,
+                    meshHeight,
+                    lodFactor,
+                    lodMethod,
+                    noDataVal,
+                )
+            meshWidth, meshHeight = lodWidth, lodHeight
+            res_x *= lodFactor
+            res_y *= lodFactor
+            logToUser(
+                f"Display mesh of the layer '{selectedLayer.name}' is downsampled {lodFactor}x to fit {cellBudget} cells",
+                level=0,
+                plugin=plugin.dockwidget,
+            )
 
-        #############################################################
+            # optionally send the downsampled values too
+            if getLayerSetting(dataStorage, selectedLayer, "raster_lod_values") is True:
+                sentBandArrays = bandArrays
+                b.x_size = meshWidth
+                b.y_size = meshHeight
+                b.x_resolution *= lodFactor
+                b.y_resolution *= lodFactor
 
-        largeTransform = False
-        if rasterDimensions[0] * rasterDimensions[1] > 10000:
+        cellCount = meshWidth * meshHeight
+        if cellCount > 10000:
             logToUser(
                 f"Transformation of the layer '{selectedLayer.name}' might take a while 🕒",
                 level=0,
                 plugin=plugin.dockwidget,
             )
-            largeTransform = True
 
-        ############################################################
-
-        if hasattr(selectedLayer.symbology, "colorizer"):
+        # identify symbology type and if Multiband, which band is which color
+        # colors are computed for the entire band at once
+        if hasattr(selectedLayer.symbology, "colorizer"):  # only 1 band
             colorizer = selectedLayer.symbology.colorizer
-            # print(
-            #    colorizer
-            # )  # <arcpy._colorizer.RasterStretchColorizer object at 0x000001780497FBC8>
-            # print(colorizer.type)  # RasterStretchColorizer
+            bandIndex = 0
+            try:
+                bandIndex = int(colorizer.band)  # if stretched
+            except:
+                pass
+            bandVals = bandArrays[bandIndex]
+            displayBands = [bandIndex]
+
+            if colorizer.type == "RasterUniqueValueColorizer":
+                try:
+                    classes = []
+                    for br in colorizer.groups:
+                        # go through all values classified
+                        if br.heading != "Value":
+                            raise Exception('br.heading != "Value"')
+                        for itm in br.items:
+                            try:  # if string covering float
+                                classes.append(
+                                    (
+                                        float(itm.values[0]),
+                                        symbol_color_to_speckle(itm.color),
+                                    )
+                                )
+                            except:
+                                pass
+                    # value->color table built once, pixels matched with a binary search
+                    cellColors = rasterUniqueValueColors(bandVals, classes)
+                except Exception as e:  # if no classified values
+                    # REMAP band values to (0,255) range, band min/max computed once
+                    cellColors = rasterGreyscaleColors(bandVals)
+            else:
+                try:
+                    cellColors = rasterStretchColors(
+                        bandVals,
+                        float(colorizer.minLabel),
+                        float(colorizer.maxLabel),
+                        colorizer.invertColorRamp is True,
+                    )
+                except:  # if no Min Max labels:
+                    # REMAP band values to (0,255) range
+                    cellColors = rasterGreyscaleColors(bandVals)
         else:
             redBand = greenBand = blueBand = None
             # RGB colorizer
@@ -376,7 +433,6 @@ def rasterFeatureToSpeckle(
             root_path += "\\Layers_Speckle\\raster_bands\\"
             findOrCreatePath(root_path)
 
-            # if not os.path.exists(root_path + '\\Layers_Speckle\\raster_bands'): os.makedirs(root_path + '\\Layers_Speckle\\raster_bands')
             path_style = root_path + selectedLayer.name + "_temp.lyrx"
             symJson = jsonFromLayerStyle(selectedLayer, path_style)
 
@@ -400,323 +456,90 @@ def rasterFeatureToSpeckle(
                     redBand = 0
                 else:
                     redBand = None
-            print("bands")
-            print(redBand)
-            print(greenBand)
-            print(blueBand)
-            try:
-                rbVals = rasterBandVals[
-                    redBand
-                ]  # my_raster.getRasterBands(rasterBandNames[redBand])
-                rbvalMin = rasterBandMinVal[redBand]
-                rbvalMax = rasterBandMaxVal[redBand]
-                rvalRange = float(rbvalMax) - float(rbvalMin)
-                print(rbvalMin)
-                print(rbvalMax)
-                print(rvalRange)
-            except Exception as e:
-                print(e)
-                rvalRange = None
-            try:
-                gbVals = rasterBandVals[greenBand]
-                gbvalMin = rasterBandMinVal[greenBand]
-                gbvalMax = rasterBandMaxVal[greenBand]
-                gvalRange = float(gbvalMax) - float(gbvalMin)
-                print(gbvalMin)
-                print(gbvalMax)
-                print(gvalRange)
-            except:
-                gvalRange = None
-            try:
-                bbVals = rasterBandVals[blueBand]
-                bbvalMin = rasterBandMinVal[blueBand]
-                bbvalMax = rasterBandMaxVal[blueBand]
-                bvalRange = float(bbvalMax) - float(bbvalMin)
-                print(bbvalMin)
-                print(bbvalMax)
-                print(bvalRange)
-            except:
-                bvalRange = None
 
-        rendererType = ""
-        bandIndex = 0
+            rgbBands = []
+            rgbMins = []
+            rgbMaxs = []
+            for band in [redBand, greenBand, blueBand]:
+                try:
+                    rgbBands.append(bandArrays[band])
+                    rgbMins.append(float(rasterBandMinVal[band]))
+                    rgbMaxs.append(float(rasterBandMaxVal[band]))
+                except:
+                    rgbBands.append(None)
+                    rgbMins.append(None)
+                    rgbMaxs.append(None)
+            # REMAP band values to (0,255) range
+            cellColors = rasterRgbColors(rgbBands, rgbMins, rgbMaxs, cellCount)
+            displayBands = [
+                band
+                for band, bandVals in zip([redBand, greenBand, blueBand], rgbBands)
+                if bandVals is not None
+            ]
+
+        # cells with NoData in all displayed bands are not meshed
+        validCells = rasterNoDataMask(
+            [bandArrays[i] for i in displayBands],
+            [rasterBandNoDataVal[i] for i in displayBands],
+        )
 
-        array_z = []  # size is large by 1 than the raster size, in both dimensions
         time0 = datetime.now()
-
-        print(projectCRS)
-        print(projectCRS.factoryCode)
-        # if isinstance(projectCRS.factoryCode, int) and projectCRS.factoryCode > 1:
-        #    reprojected_raster = arcpy.ia.Reproject(
-        #        my_raster, {"wkid": projectCRS.factoryCode}
-        #    )
-        print(my_raster.spatialReference)
-        print(my_raster.spatialReference.factoryCode)
-        for v in range(rasterDimensions[1]):  # each row, Y
-            print(v)
-            if largeTransform is True:
-                if v == int(rasterDimensions[1] / 20):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 5%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-                elif v == int(rasterDimensions[1] / 10):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 10%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-                elif v == int(rasterDimensions[1] / 5):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 20%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-                elif v == int(rasterDimensions[1] * 2 / 5):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 40%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-                elif v == int(rasterDimensions[1] * 3 / 5):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 60%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-                elif v == int(rasterDimensions[1] * 4 / 5):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 80%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-                elif v == int(rasterDimensions[1] * 9 / 10):
-                    logToUser(
-                        f"Converting layer '{selectedLayer.name}': 90%...",
-                        level=0,
-                        plugin=plugin.dockwidget,
-                    )
-
-            for h in range(rasterDimensions[0]):  # item in a row, X
-                vertices.extend(
-                    [
-                        new_x_min + h * res_x,
-                        new_y_min + v * res_y,
-                        0,
-                        new_x_min + h * res_x,
-                        new_y_min + (v + 1) * res_y,
-                        0,
-                        new_x_min + (h + 1) * res_x,
-                        new_y_min + (v + 1) * res_y,
-                        0,
-                        new_x_min + (h + 1) * res_x,
-                        new_y_min + v * res_y,
-                        0,
-                    ]
-                )  ## add 4 points
-                faces.extend([4, count, count + 1, count + 2, count + 3])
-
-                # color vertices according to QGIS renderer
-                color = (0 << 16) + (0 << 8) + 0
-                noValColor = (
-                    0,
-                    0,
-                    0,
+        if (
+            colorizer is not None
+            and colorizer.type == "RasterUniqueValueColorizer"
+            and getLayerSetting(dataStorage, selectedLayer, "raster_merge_cells")
+            is True
+        ):
+            # opt-in, overrides the mesh mode: one quad per greedily merged run of same-color cells
+            rectangles, rectColors = rasterMergedRectangles(
+                cellColors, meshWidth, meshHeight, validCells
+            )
+            vertices = rasterMergedGridVertices(
+                new_x_min, new_y_min, res_x, res_y, rectangles
+            )
+            faces = rasterGridFaces(len(rectColors))
+            colors = rasterGridColors(rectColors)
+        elif (
+            getLayerSetting(dataStorage, selectedLayer, "raster_mesh_mode")
+            == RASTER_MESH_SHARED
+        ):
+            # one vertex per grid node, colors sampled at the nodes
+            vertices = rasterSharedGridVertices(
+                new_x_min,
+                new_y_min,
+                res_x,
+                res_y,
+                meshWidth,
+                meshHeight,
+            )
+            faces = rasterSharedGridFaces(meshWidth, meshHeight)
+            colors = rasterSharedGridColors(cellColors, meshWidth, meshHeight)
+            if validCells is not None:
+                vertices, faces, colors = rasterSharedGridCull(
+                    vertices, faces, colors, validCells
                 )
-
-                if hasattr(selectedLayer.symbology, "colorizer"):  # only 1 band
-                    try:
-                        bandIndex = int(colorizer.band)  # if stretched
-                    except:
-                        pass
-                    if colorizer.type == "RasterUniqueValueColorizer":
-                        # REDO !!!!!!!!!!!!
-                        colorRVal = colorGVal = colorBVal = 0
-                        try:
-                            for br in colorizer.groups:
-                                print(br.heading)  # "Value"
-                                # go through all values classified
-                                if br.heading != "Value":
-                                    raise Exception('br.heading != "Value"')
-                                for k, itm in enumerate(br.items):
-                                    # print(itm.values)
-                                    if (
-                                        itm.values[0]
-                                        == rasterBandVals[bandIndex][int(count / 4)]
-                                    ):
-                                        print(itm.values[0])
-                                        colorRVal, colorGVal, colorBVal = (
-                                            itm.color["RGB"][0],
-                                            itm.color["RGB"][1],
-                                            itm.color["RGB"][2],
-                                        )
-                                        break
-                                    # if string covering float
-                                    try:
-                                        if float(itm.values[0]) == float(
-                                            rasterBandVals[bandIndex][int(count / 4)]
-                                        ):
-                                            print(itm.values[0])
-                                            colorRVal, colorGVal, colorBVal = (
-                                                itm.color["RGB"][0],
-                                                itm.color["RGB"][1],
-                                                itm.color["RGB"][2],
-                                            )
-                                            break
-                                    except Exception as e:
-                                        print(e)
-                                        pass
-
-                        except Exception as e:  # if no Min Max labels:
-                            # REMAP band values to (0,255) range
-                            print(e)
-                            valRange = max(rasterBandVals[bandIndex]) - min(
-                                rasterBandVals[bandIndex]
-                            )  # (rasterBandMaxVal[bandIndex] - rasterBandMinVal[bandIndex])
-                            if valRange == 0:
-                                if min(rasterBandVals[bandIndex]) == 0:
-                                    colorVal = 0
-                                else:
-                                    colorVal = 255
-                            else:
-                                colorRVal = colorGVal = colorBVal = int(
-                                    (
-                                        rasterBandVals[bandIndex][int(count / 4)]
-                                        - min(rasterBandVals[bandIndex])
-                                    )
-                                    / valRange
-                                    * 255
-                                )
-
-                        color = (colorRVal << 16) + (colorGVal << 8) + colorBVal
-
-                    else:
-                        try:
-                            if rasterBandVals[bandIndex][int(count / 4)] >= float(
-                                colorizer.minLabel
-                            ) and rasterBandVals[bandIndex][int(count / 4)] <= float(
-                                colorizer.maxLabel
-                            ):  # rasterBandMinVal[bandIndex]:
-                                # REMAP band values to (0,255) range
-                                valRange = float(colorizer.maxLabel) - float(
-                                    colorizer.minLabel
-                                )  # (rasterBandMaxVal[bandIndex] - rasterBandMinVal[bandIndex])
-                                colorVal = int(
-                                    (
-                                        rasterBandVals[bandIndex][int(count / 4)]
-                                        - float(colorizer.minLabel)
-                                    )
-                                    / valRange
-                                    * 255
-                                )
-                                if colorizer.invertColorRamp is True:
-                                    if valRange == 0:
-                                        if float(colorizer.maxLabel) == 0:
-                                            colorVal = 0
-                                        else:
-                                            colorVal = 255
-                                    else:
-                                        colorVal = int(
-                                            (
-                                                -rasterBandVals[bandIndex][
-                                                    int(count / 4)
-                                                ]
-                                                + float(colorizer.maxLabel)
-                                            )
-                                            / valRange
-                                            * 255
-                                        )
-                                color = (colorVal << 16) + (colorVal << 8) + colorVal
-                        except:  # if no Min Max labels:
-                            # REMAP band values to (0,255) range
-                            valRange = max(rasterBandVals[bandIndex]) - min(
-                                rasterBandVals[bandIndex]
-                            )  # (rasterBandMaxVal[bandIndex] - rasterBandMinVal[bandIndex])
-
-                            if valRange == 0:
-                                if min(rasterBandVals[bandIndex]) == 0:
-                                    colorVal = 0
-                                else:
-                                    colorVal = 255
-                            else:
-                                colorVal = int(
-                                    (
-                                        rasterBandVals[bandIndex][int(count / 4)]
-                                        - min(rasterBandVals[bandIndex])
-                                    )
-                                    / valRange
-                                    * 255
-                                )
-                            color = (colorVal << 16) + (colorVal << 8) + colorVal
-                else:  # rgb
-                    # REMAP band values to (0,255) range
-                    if rvalRange is not None and redBand is not None:
-                        if rvalRange == 0:
-                            if float(rbvalMin) == 0:
-                                colorVal = 0
-                            else:
-                                colorVal = 255
-                        else:
-                            colorRVal = int(
-                                (
-                                    rasterBandVals[redBand][int(count / 4)]
-                                    - float(rbvalMin)
-                                )
-                                / rvalRange
-                                * 255
-                            )
-                    else:
-                        colorRVal = 0
-                    if gvalRange is not None and greenBand is not None:
-                        if gvalRange == 0:
-                            if float(gbvalMin) == 0:
-                                colorVal = 0
-                            else:
-                                colorVal = 255
-                        else:
-                            colorGVal = int(
-                                (
-                                    rasterBandVals[greenBand][int(count / 4)]
-                                    - float(gbvalMin)
-                                )
-                                / gvalRange
-                                * 255
-                            )
-                    else:
-                        colorGVal = 0
-                    if bvalRange is not None and blueBand is not None:
-                        if bvalRange == 0:
-                            if float(bbvalMin) == 0:
-                                colorVal = 0
-                            else:
-                                colorVal = 255
-                        else:
-                            colorBVal = int(
-                                (
-                                    rasterBandVals[blueBand][int(count / 4)]
-                                    - float(bbvalMin)
-                                )
-                                / bvalRange
-                                * 255
-                            )
-                    else:
-                        colorBVal = 0
-                    # print("__pixel color_")
-                    # print(colorRVal)
-                    # print(colorGVal)
-                    # print(colorBVal)
-
-                    color = (colorRVal << 16) + (colorGVal << 8) + colorBVal
-
-                colors.extend([color, color, color, color])
-                count += 4
+        else:
+            vertices = rasterGridVertices(
+                new_x_min,
+                new_y_min,
+                res_x,
+                res_y,
+                meshWidth,
+                meshHeight,
+                validCells,
+            )
+            if validCells is not None:
+                cellColors = cellColors[validCells]
+            faces = rasterGridFaces(len(cellColors))
+            colors = rasterGridColors(cellColors)
 
         mesh = constructMeshFromRaster(vertices, faces, colors)
 
         time1 = datetime.now()
         # print(f"Time to get Raster: {(time1-time0).total_seconds()} sec")
-        # after the entire loop
+
+        for index, item in enumerate(rasterBandNames):
+            b["@(10000)" + item + "_values"] = sentBandArrays[index].tolist()
 
         if mesh is not None:
             mesh.units = dataStorage.currentUnits
@@ -735,12 +558,42 @@ def rasterFeatureToSpeckle(
         return None
 
 
-def featureToNative(
-    feature: Base, fields: dict, geomType: str, sr: arcpy.SpatialReference, dataStorage
+def featureGeometryToNativeCoords(feature: Base, geomType: str, dataStorage):
+    """Arcpy-free part of featureGeometryToNative, safe to run off the main thread:
+    returns (geometry type, vertices of the parts) to pass to featureGeometryToNative.
+    None if the geometry can only be converted with arcpy."""
+    try:
+        try:
+            speckle_geom = feature[
+                "geometry"
+            ]  # for created in QGIS / ArcGIS Layer type
+        except:
+            speckle_geom = feature  # for created in other software
+
+        if isinstance(speckle_geom, list):
+            if len(speckle_geom) > 1 or geomType == "Multipoint":
+                return convertToNativeMultiCoords(speckle_geom, dataStorage)
+            if len(speckle_geom) > 0:
+                return convertToNativeCoords(speckle_geom[0], dataStorage)
+            return None
+        return convertToNativeCoords(speckle_geom, dataStorage)
+    except Exception:
+        return None  # converted again with arcpy, which reports the error
+
+
+def featureGeometryToNative(
+    feature: Base,
+    geomType: str,
+    sr: arcpy.SpatialReference,
+    dataStorage,
+    coords: Union[Tuple, None] = None,
 ):
-    print("04_____Feature To Native correct____________")
-    feat = {}
+    """Converts the feature geometry to arcpy geometry; None if it is not valid.
+    Uses the output of featureGeometryToNativeCoords, if it is given."""
+    arcGisGeom = None
     try:
+        if coords is not None:
+            return nativeGeometryFromCoords(*coords, sr)
         try:
             speckle_geom = feature[
                 "geometry"
@@ -748,7 +601,6 @@ def featureToNative(
         except:
             speckle_geom = feature  # for created in other software
 
-        print(speckle_geom)
         arcGisGeom = None
         if isinstance(speckle_geom, list):
             if len(speckle_geom) > 1 or geomType == "Multipoint":
@@ -759,15 +611,15 @@ def featureToNative(
         else:
             arcGisGeom = convertToNative(speckle_geom, sr, dataStorage)
 
-        if arcGisGeom is not None:
-            feat.update({"arcGisGeomFromSpeckle": arcGisGeom})
-        else:
-            return None
-        try:
-            [print(p for p in arcGisGeom.getPart())]
-        except:
-            print(arcGisGeom.getPart())
-        # print(feat)
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+    return arcGisGeom
+
+
+def featureAttributesToNative(feature: Base, fields: dict) -> dict:
+    """Converts the feature attributes to field values, without arcpy calls"""
+    feat = {}
+    try:
         for key, variant in fields.items():
             value = None
             try:
@@ -820,12 +672,22 @@ def featureToNative(
                     feat.update({key: None})
                 if variant == "SHORT":
                     feat.update({key: None})
-        # print(feat)
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
     return feat
 
 
+def featureToNative(
+    feature: Base, fields: dict, geomType: str, sr: arcpy.SpatialReference, dataStorage
+):
+    arcGisGeom = featureGeometryToNative(feature, geomType, sr, dataStorage)
+    if arcGisGeom is None:
+        return None
+    feat = {"arcGisGeomFromSpeckle": arcGisGeom}
+    feat.update(featureAttributesToNative(feature, fields))
+    return feat
+
+
 r"""
 def featureToNative(feature: Base, fields: "QgsFields", dataStorage):
     feat = QgsFeature()
@@ -0,0 +1,101 @@
+"""
+Contains feature readers, streaming geometry and attributes of a layer in a single pass.
+"""
+
+import inspect
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import arcpy
+
+from speckle.speckle.converter.geometry.codec import decodeEsriJson, decodeWkb
+from speckle.speckle.utils.panel_logging import logToUser
+
+DEFAULT_FEATURE_READER = "wkb"  # default of the "feature_reader" layer setting
+FEATURE_CHUNK_SIZE = 5000  # features converted (and reprojected) together
+
+
+def cursorFeatureReader(
+    dataSource: str, fieldnames: List[str], **kwargs
+) -> Iterator[Tuple[int, Any, tuple]]:
+    """Reads OID, geometry and attributes of every feature from one SearchCursor"""
+    # arcpy.da.SearchCursor(in_table, field_names, {where_clause}, {spatial_reference}, {explode_to_points}, {sql_clause})
+    with arcpy.da.SearchCursor(
+        dataSource, ["OID@", "SHAPE@"] + list(fieldnames), **kwargs
+    ) as cursor:
+        for row in cursor:
+            yield row[0], row[1], row[2:]
+
+
+def wkbFeatureReader(
+    dataSource: str, fieldnames: List[str], **kwargs
+) -> Iterator[Tuple[int, Any, tuple]]:
+    """Reads geometry as WKB and decodes it into GeometryArrays, without per-vertex arcpy calls"""
+    with arcpy.da.SearchCursor(
+        dataSource, ["OID@", "SHAPE@WKB"] + list(fieldnames), **kwargs
+    ) as cursor:
+        for row in cursor:
+            geom = None
+            if row[1] is not None:
+                geom = decodeWkb(row[1])
+            yield row[0], geom, row[2:]
+
+
+def jsonFeatureReader(
+    dataSource: str, fieldnames: List[str], **kwargs
+) -> Iterator[Tuple[int, Any, tuple]]:
+    """Reads geometry as EsriJSON and decodes it into GeometryArrays.
+    Features with true curves are returned as arcpy geometry.
+    """
+    with arcpy.da.SearchCursor(
+        dataSource, ["OID@", "SHAPE@JSON"] + list(fieldnames), **kwargs
+    ) as cursor:
+        for row in cursor:
+            geom = None
+            if row[1] is not None:
+                geom = decodeEsriJson(row[1])
+                if geom is None:
+                    geom = arcpy.AsShape(row[1], True)
+            yield row[0], geom, row[2:]
+
+
+FEATURE_READERS: Dict[str, Callable[..., Iterator[Tuple[int, Any, tuple]]]] = {
+    "cursor": cursorFeatureReader,
+    "wkb": wkbFeatureReader,
+    "json": jsonFeatureReader,
+}
+
+
+def readFeatures(
+    dataSource: str,
+    fieldnames: List[str],
+    backend: str = DEFAULT_FEATURE_READER,
+    **kwargs,
+) -> Iterator[Tuple[int, Any, tuple]]:
+    """Yields (oid, geometry, attributes) of each feature, reading the data source once"""
+    reader = FEATURE_READERS.get(backend)
+    if reader is None:
+        logToUser(
+            f"Unknown feature reader '{backend}', using '{DEFAULT_FEATURE_READER}'",
+            level=1,
+            func=inspect.stack()[0][3],
+        )
+        reader = FEATURE_READERS[DEFAULT_FEATURE_READER]
+    return reader(dataSource, fieldnames, **kwargs)
+
+
+def readFeatureChunks(
+    dataSource: str,
+    fieldnames: List[str],
+    chunkSize: int = FEATURE_CHUNK_SIZE,
+    backend: str = DEFAULT_FEATURE_READER,
+    **kwargs,
+) -> Iterator[List[Tuple[int, Any, tuple]]]:
+    """Yields lists of up to chunkSize (oid, geometry, attributes) tuples"""
+    chunk = []
+    for row in readFeatures(dataSource, fieldnames, backend, **kwargs):
+        chunk.append(row)
+        if len(chunk) >= chunkSize:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
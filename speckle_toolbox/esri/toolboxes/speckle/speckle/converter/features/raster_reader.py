@@ -0,0 +1,105 @@
+"""
+Contains the block-wise raster band reader, keeping memory proportional to the block size.
+"""
+
+import math
+from typing import Any, List, Tuple, Union
+
+import numpy as np
+
+RASTER_BLOCK_SIZE = 1024  # rows and columns read at once
+RASTER_EXTREME_VALUE = float(-1 * math.pow(10, 30))
+
+
+def rasterBandDimensions(rasterBand) -> List[int]:
+    """Returns [width, height] of the band in cells, without reading the pixels"""
+    extent = rasterBand.extent
+    width = int(round((extent.XMax - extent.XMin) / rasterBand.meanCellWidth))
+    height = int(round((extent.YMax - extent.YMin) / rasterBand.meanCellHeight))
+    return [width, height]
+
+
+def readRasterBlock(rasterBand, row: int, col: int, nrows: int, ncols: int):
+    """Reads one pixel block of a single band as a (nrows, ncols) array"""
+    block = np.asarray(
+        rasterBand.read(upper_left_corner=(row, col), ncols=ncols, nrows=nrows)
+    )
+    return block.reshape(nrows, ncols)
+
+
+def readRasterBand(
+    rasterBand,
+    width: int,
+    height: int,
+    defaultNoData: Any,
+    blockSize: int = RASTER_BLOCK_SIZE,
+) -> Tuple[np.ndarray, Union[float, None], Any]:
+    """Reads the band into a preallocated buffer block by block, fixing unusable NoData values.
+    Returns the flat band values, corrected min value (or None) and the NoData value.
+    """
+    buffer = None
+    grid = None
+    valMin = rasterBand.minimum
+    valMaxAll = None
+    valMinActual = None  # min of the values above the extreme threshold
+    hasExtremeValues = False
+
+    for row in range(0, height, blockSize):
+        nrows = min(blockSize, height - row)
+        for col in range(0, width, blockSize):
+            ncols = min(blockSize, width - col)
+            block = readRasterBlock(rasterBand, row, col, nrows, ncols)
+            if buffer is None:
+                buffer = np.empty(width * height, dtype=block.dtype)
+                grid = buffer.reshape(height, width)
+            grid[row : row + nrows, col : col + ncols] = block
+
+            # statistics, updated per block
+            if not np.issubdtype(block.dtype, np.floating):
+                continue
+            extreme = block <= RASTER_EXTREME_VALUE
+            if extreme.any():
+                hasExtremeValues = True
+            actual = block[~extreme & ~np.isnan(block)]
+            if actual.size > 0:
+                blockMin = float(actual.min())
+                blockMax = float(actual.max())
+                valMinActual = (
+                    blockMin if valMinActual is None else min(valMinActual, blockMin)
+                )
+                valMaxAll = blockMax if valMaxAll is None else max(valMaxAll, blockMax)
+
+    if buffer is None:
+        return np.empty(0), valMin, defaultNoData
+
+    # check whether NA value is too small or raster has too small values
+    # assign min value of an actual list; re-assign NA val; replace extreme values with new NA val
+    noDataValNew = None
+    if valMinActual is None:  # only extreme values: use "safe" fake NA value
+        valMinActual = (
+            valMaxAll + 1 if valMaxAll is not None else RASTER_EXTREME_VALUE + 1
+        )
+    if (
+        isinstance(defaultNoData, float) or isinstance(defaultNoData, int)
+    ) and defaultNoData < RASTER_EXTREME_VALUE:
+        # if default NA value is too small
+        valMin = valMinActual
+        noDataValNew = valMin - 1000  # use new adequate value
+    elif (
+        (isinstance(defaultNoData, str) or defaultNoData is None)
+        and valMin is not None
+        and valMin < RASTER_EXTREME_VALUE
+    ):
+        # if default val unaccessible and minimum val is too small
+        noDataValNew = valMin
+        valMin = valMinActual
+
+    if noDataValNew is None:
+        return buffer, valMin, defaultNoData
+
+    if hasExtremeValues:
+        # replace in place, one block of rows at a time
+        for row in range(0, height, blockSize):
+            rows = grid[row : row + blockSize]
+            rows[rows <= RASTER_EXTREME_VALUE] = noDataValNew
+    return buffer, valMin, noDataValNew
@@ -0,0 +1,198 @@
+"""
+Contains decoders of OGC WKB and EsriJSON geometries into NumPy coordinate arrays.
+Pure Python/NumPy, no arcpy calls.
+"""
+
+import json
+import struct
+from typing import List, NamedTuple, Union
+
+import numpy as np
+
+WKB_POINT = 1
+WKB_LINESTRING = 2
+WKB_POLYGON = 3
+WKB_MULTIPOINT = 4
+WKB_MULTILINESTRING = 5
+WKB_MULTIPOLYGON = 6
+WKB_GEOMETRYCOLLECTION = 7
+
+WKB_GEOMETRY_TYPES = {
+    WKB_POINT: "Point",
+    WKB_LINESTRING: "Polyline",
+    WKB_POLYGON: "Polygon",
+    WKB_MULTIPOINT: "Multipoint",
+    WKB_MULTILINESTRING: "Polyline",
+    WKB_MULTIPOLYGON: "Polygon",
+}
+ARRAY_GEOMETRY_TYPES = ["Point", "Multipoint", "Polyline", "Polygon"]
+
+
+class GeometryArrays(NamedTuple):
+    """Vertices of a decoded geometry.
+    coords: Nx3 array (Z is 0 if the geometry has no Z values)
+    partOffsets: start of each part (point, path or ring) in coords, plus the total count
+    polygonOffsets: start of each polygon in parts (exterior ring first), plus the part count
+    """
+
+    geomType: str
+    coords: np.ndarray
+    partOffsets: np.ndarray
+    polygonOffsets: np.ndarray
+    hasZ: bool
+
+
+def _wkbHeader(buffer, offset: int):
+    endian = "<" if buffer[offset] == 1 else ">"
+    wkbType = struct.unpack_from(endian + "I", buffer, offset + 1)[0]
+    hasZ = bool(wkbType & 0x80000000)  # EWKB flags
+    hasM = bool(wkbType & 0x40000000)
+    wkbType &= 0x0FFFFFFF
+    if wkbType >= 3000:  # ISO WKB
+        hasZ = hasM = True
+    elif wkbType >= 2000:
+        hasM = True
+    elif wkbType >= 1000:
+        hasZ = True
+    wkbType %= 1000
+    return endian, wkbType, hasZ, hasM, offset + 5
+
+
+def _wkbCoords(buffer, offset: int, endian: str, count: int, dims: int):
+    coords = np.frombuffer(
+        buffer, dtype=endian + "f8", count=count * dims, offset=offset
+    ).reshape(count, dims)
+    return coords, offset + 8 * count * dims
+
+
+def _wkbCount(buffer, offset: int, endian: str):
+    return struct.unpack_from(endian + "I", buffer, offset)[0], offset + 4
+
+
+def _decodeWkbPart(buffer, offset: int, parts: List, polygons: List):
+    """Reads one WKB geometry, appending its coordinate arrays to parts"""
+    endian, wkbType, hasZ, hasM, offset = _wkbHeader(buffer, offset)
+    dims = 2 + int(hasZ) + int(hasM)
+
+    if wkbType == WKB_POINT:
+        coords, offset = _wkbCoords(buffer, offset, endian, 1, dims)
+        if not np.isnan(coords[0, 0]):  # empty point is NaN, NaN
+            parts.append(coords)
+    elif wkbType == WKB_LINESTRING:
+        count, offset = _wkbCount(buffer, offset, endian)
+        coords, offset = _wkbCoords(buffer, offset, endian, count, dims)
+        parts.append(coords)
+    elif wkbType == WKB_POLYGON:
+        rings, offset = _wkbCount(buffer, offset, endian)
+        polygons.append(len(parts))
+        for _ in range(rings):
+            count, offset = _wkbCount(buffer, offset, endian)
+            coords, offset = _wkbCoords(buffer, offset, endian, count, dims)
+            parts.append(coords)
+    elif wkbType in [
+        WKB_MULTIPOINT,
+        WKB_MULTILINESTRING,
+        WKB_MULTIPOLYGON,
+        WKB_GEOMETRYCOLLECTION,
+    ]:
+        count, offset = _wkbCount(buffer, offset, endian)
+        for _ in range(count):
+            _, offset, hasZ = _decodeWkbPart(buffer, offset, parts, polygons)
+    else:
+        raise ValueError(f"Unsupported WKB geometry type {wkbType}")
+    return wkbType, offset, hasZ
+
+
+def _geometryArrays(
+    geomType: str, parts: List[np.ndarray], polygons: List[int], hasZ: bool
+) -> GeometryArrays:
+    """Packs coordinate arrays of the parts (2, 3 or 4 columns) into GeometryArrays"""
+    partOffsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    if len(parts) > 0:
+        partOffsets[1:] = np.cumsum([len(p) for p in parts])
+    coords = np.zeros((int(partOffsets[-1]), 3))
+    for k, part in enumerate(parts):
+        start, end = partOffsets[k], partOffsets[k + 1]
+        coords[start:end, :2] = part[:, :2]
+        if hasZ:
+            coords[start:end, 2] = part[:, 2]
+    if geomType != "Polygon":
+        polygons = list(range(len(parts)))
+    polygonOffsets = np.array(list(polygons) + [len(parts)], dtype=np.int64)
+    return GeometryArrays(geomType, coords, partOffsets, polygonOffsets, hasZ)
+
+
+def decodeWkb(wkb: Union[bytes, bytearray]) -> GeometryArrays:
+    """Decodes OGC WKB (2D, Z, M, ZM; ISO or EWKB type codes) into GeometryArrays"""
+    buffer = bytes(wkb)
+    parts = []
+    polygons = []
+    wkbType, _, hasZ = _decodeWkbPart(buffer, 0, parts, polygons)
+    geomType = WKB_GEOMETRY_TYPES.get(wkbType)
+    if geomType is None:  # collection: use the type of its members
+        geomType = "Polygon" if len(polygons) > 0 else "Polyline"
+    return _geometryArrays(geomType, parts, polygons, hasZ)
+
+
+def ringSignedArea(ring: np.ndarray) -> float:
+    """Shoelace area of the ring: negative if clockwise"""
+    x = ring[:, 0]
+    y = ring[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def decodeEsriJson(geomJson: Union[str, dict]) -> Union[GeometryArrays, None]:
+    """Decodes EsriJSON geometry into GeometryArrays; returns None for true curves"""
+    if isinstance(geomJson, str):
+        geomJson = json.loads(geomJson)
+    if "curvePaths" in geomJson or "curveRings" in geomJson:
+        return None
+    hasZ = bool(geomJson.get("hasZ", False))
+
+    def toArray(vertices):
+        # None (NaN) values are read as NaN
+        return np.array(vertices, dtype=float).reshape(len(vertices), -1)
+
+    polygons = []
+    if "x" in geomJson:
+        geomType = "Point"
+        parts = []
+        if geomJson["x"] is not None and geomJson["x"] != "NaN":
+            hasZ = "z" in geomJson
+            parts = [toArray([[geomJson["x"], geomJson["y"], geomJson.get("z")]])]
+    elif "points" in geomJson:
+        geomType = "Multipoint"
+        parts = [toArray([pt]) for pt in geomJson["points"]]
+    elif "paths" in geomJson:
+        geomType = "Polyline"
+        parts = [toArray(path) for path in geomJson["paths"] if len(path) > 0]
+    elif "rings" in geomJson:
+        geomType = "Polygon"
+        parts = [toArray(ring) for ring in geomJson["rings"] if len(ring) > 0]
+        # EsriJSON lists rings without grouping: clockwise ring starts a new polygon
+        for k, ring in enumerate(parts):
+            if k == 0 or ringSignedArea(ring) < 0:
+                polygons.append(k)
+    else:
+        return None
+    return _geometryArrays(geomType, parts, polygons, hasZ)
+
+
+def geometryParts(geometry: GeometryArrays) -> List[np.ndarray]:
+    """Returns Nx3 arrays (views) of every point, path or ring"""
+    offsets = geometry.partOffsets
+    return [
+        geometry.coords[offsets[k] : offsets[k + 1]] for k in range(len(offsets) - 1)
+    ]
+
+
+def polygonRings(geometry: GeometryArrays) -> List[List[np.ndarray]]:
+    """Returns rings of each polygon, exterior ring first"""
+    parts = geometryParts(geometry)
+    offsets = geometry.polygonOffsets
+    return [parts[offsets[k] : offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+
+def withCoords(geometry: GeometryArrays, coords: np.ndarray) -> GeometryArrays:
+    """Returns the same geometry structure with new (e.g. reprojected) coordinates"""
+    return geometry._replace(coords=coords)
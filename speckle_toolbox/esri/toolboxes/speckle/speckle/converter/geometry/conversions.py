@@ -23,11 +23,18 @@ from specklepy.objects.GIS.geometry import (
 )
 from specklepy.objects.GIS.geometry import GisPolygonGeometry
 
+from speckle.speckle.converter.geometry.codec import (
+    GeometryArrays,
+    geometryParts,
+    polygonRings,
+)
 from speckle.speckle.converter.geometry.mesh import meshToNative
 from speckle.speckle.converter.geometry.polygon import (
     polygonToNative,
     multiPolygonToNative,
+    multiPolygonToNativeCoords,
     polygonToSpeckle,
+    polygonFromRingsToSpeckle,
     multiPolygonToSpeckle,
     polygonToSpeckleMesh,
 )
@@ -42,8 +49,11 @@ from speckle.speckle.converter.geometry.polyline import (
     circleToNative,
     curveToNative,
     lineToNative,
+    lineToNativeCoords,
     polycurveToNative,
     polylineToNative,
+    polylineToNativeCoords,
+    polylineFromCoordsToSpeckle,
     polylineToSpeckle,
     speckleArcCircleToPoints,
     multiPolylineToSpeckle,
@@ -51,29 +61,54 @@ from speckle.speckle.converter.geometry.polyline import (
 from speckle.speckle.converter.geometry.point import (
     pointToCoord,
     pointToNative,
+    pointToNativeCoords,
+    pointsToNativeCoords,
     pointToSpeckle,
+    pointsFromCoordsToSpeckle,
     multiPointToSpeckle,
 )
 
-from speckle.speckle.converter.layers.utils import apply_reproject, findTransformation
+from speckle.speckle.converter.layers.utils import (
+    apply_reproject,
+    findTransformationCached,
+    getConversionContext,
+)
 from speckle.speckle.utils.panel_logging import logToUser
 
 import numpy as np
 
 
 def convertToSpeckle(
-    feature, index, layer, data, dataStorage
+    feature,
+    index,
+    layer,
+    data,
+    dataStorage,
+    x_form=None,
+    color: int = None,
+    meshes: List = None,
 ) -> Tuple[Union[Base, Sequence[Base], None], int]:
-    """Converts the provided layer feature to Speckle objects"""
+    """Converts the provided layer feature to Speckle objects.
+    x_form overrides the layer transformation, e.g. for features already reprojected in bulk.
+    color is the display mesh color; looked up from the layer renderer if None.
+    meshes are the polygon display meshes from featureDisplayMeshes, computed if None.
+    """
     print("___convertToSpeckle____________")
+    if isinstance(feature, GeometryArrays):
+        return convertArraysToSpeckle(
+            feature, index, layer, data, dataStorage, color, meshes
+        )
     try:
         iterations = 0
         layer_sr = data.spatialReference  # if sr.type == "Projected":
         geomType = data.shapeType  # Polygon, Point, Polyline, Multipoint, MultiPatch
         featureType = data.featureType
-        projectCRS = dataStorage.project.activeMap.spatialReference
+        projectCRS = getConversionContext(dataStorage)["projectCRS"]
         units = dataStorage.currentUnits
-        x_form: tuple = findTransformation(geomType, layer_sr, projectCRS, layer)
+        if x_form is None:
+            x_form: tuple = findTransformationCached(
+                geomType, layer_sr, projectCRS, layer, dataStorage
+            )
         try:
             [print(p for p in feature.getPart())]
         except:
@@ -125,7 +160,7 @@ def convertToSpeckle(
                 all_parts.append(
                     arcpy.Polyline(
                         part,
-                        arcpy.Describe(layer.dataSource).SpatialReference,
+                        x_form[0],
                         has_z=True,
                     )
                 )
@@ -152,7 +187,9 @@ def convertToSpeckle(
             """
             f_shape = apply_reproject(feature, x_form, dataStorage).getPart()
             result = [
-                polygonToSpeckle(geom, feature, index, layer, dataStorage, x_form)
+                polygonToSpeckle(
+                    geom, feature, index, layer, dataStorage, x_form, color
+                )
                 for geom in f_shape
             ]
 
@@ -175,7 +212,9 @@ def convertToSpeckle(
             f_shape = apply_reproject(feature, x_form, dataStorage).getPart()
             if f_shape is None:
                 return None
-            result = [polygonToSpeckleMesh(f_shape, index, layer, False, dataStorage)]
+            result = [
+                polygonToSpeckleMesh(f_shape, index, layer, False, dataStorage, color)
+            ]
             for r in result:
                 if r is None:
                     continue
@@ -207,6 +246,80 @@ def convertToSpeckle(
         return None, None
 
 
+def convertArraysToSpeckle(
+    geometry: GeometryArrays,
+    index,
+    layer,
+    data,
+    dataStorage,
+    color: int = None,
+    meshes: List = None,
+) -> Tuple[Union[Base, Sequence[Base], None], int]:
+    """Converts feature decoded into coordinate arrays (already in the project CRS) to Speckle objects"""
+    try:
+        iterations = 0
+        units = dataStorage.currentUnits
+        geomType = geometry.geomType
+        element = None
+
+        if geomType == "Point" or geomType == "Multipoint":
+            result = pointsFromCoordsToSpeckle(geometry.coords, dataStorage)
+            if len(result) == 0:
+                return None, iterations
+            for r in result:
+                r.units = units
+            element = GisPointElement(units=units, geometry=result)
+
+        elif geomType == "Polyline":
+            result = []
+            for part in geometryParts(geometry):
+                closed = False
+                if len(part) > 1 and np.array_equal(part[0], part[-1], equal_nan=True):
+                    closed = True
+                    part = part[:-1]
+                result.append(
+                    addCorrectUnits(
+                        polylineFromCoordsToSpeckle(part, closed, dataStorage),
+                        dataStorage,
+                    )
+                )
+            element = GisLineElement(units=units, geometry=result)
+
+        elif geomType == "Polygon":
+            polygons = polygonRings(geometry)
+            if meshes is None or len(meshes) != len(polygons):
+                meshes = [None for _ in polygons]
+            result = [
+                polygonFromRingsToSpeckle(rings, index, layer, dataStorage, color, mesh)
+                for rings, mesh in zip(polygons, meshes)
+            ]
+            for r in result:
+                if r is None:
+                    continue
+                r.units = units
+                if r.boundary is not None:
+                    r.boundary.units = units
+                if r.voids is not None:
+                    for v in r.voids:
+                        if v is not None:
+                            v.units = units
+                    for v in r.displayValue:
+                        if v is not None:
+                            v.units = units
+            element = GisPolygonElement(units=units, geometry=result)
+
+        else:
+            logToUser(
+                "Unsupported or invalid geometry in layer " + layer.name,
+                level=1,
+                func=inspect.stack()[0][3],
+            )
+        return element, iterations
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return None, None
+
+
 def convertToNative(
     base: Base, sr: arcpy.SpatialReference, dataStorage
 ) -> Union[Any, None]:
@@ -296,8 +409,7 @@ def multiPointToNative(items: List[Point], sr: arcpy.SpatialReference, dataStora
     try:
         all_pts = []
         # example https://pro.arcgis.com/en/pro-app/2.8/arcpy/classes/multipoint.htm
-        for item in items:
-            pt = pointToCoord(item)  # [x, y, z]
+        for pt in pointsToNativeCoords(items, dataStorage):  # [x, y, z]
             all_pts.append(arcpy.Point(pt[0], pt[1], pt[2]))
         # print(all_pts)
         features = arcpy.Multipoint(arcpy.Array(all_pts))
@@ -307,6 +419,23 @@ def multiPointToNative(items: List[Point], sr: arcpy.SpatialReference, dataStora
     return features
 
 
+def multiPolylineToNativeCoords(
+    items: List[Polyline], dataStorage
+) -> List[List[List[float]]]:
+    """Transformed vertices of each Speckle Polyline, without arcpy calls"""
+    parts = []
+    for item in items:  # will be 1 item
+        pointsSpeckle = []
+        try:
+            pointsSpeckle = item.as_points()
+        except:
+            continue
+        if item.closed is True:
+            pointsSpeckle = pointsSpeckle + pointsSpeckle[:1]
+        parts.append(pointsToNativeCoords(pointsSpeckle, dataStorage))
+    return parts
+
+
 def multiPolylineToNative(
     items: List[Polyline], sr: arcpy.SpatialReference, dataStorage
 ):
@@ -316,17 +445,7 @@ def multiPolylineToNative(
         # print(items)
         poly = None
         full_array_list = []
-        for item in items:  # will be 1 item
-            pointsSpeckle = []
-            try:
-                pointsSpeckle = item.as_points()
-            except:
-                continue
-            pts = [pointToCoord(pt) for pt in pointsSpeckle]
-
-            if item.closed is True:
-                pts.append(pointToCoord(item.as_points()[0]))
-
+        for pts in multiPolylineToNativeCoords(items, dataStorage):
             arr = [arcpy.Point(*coords) for coords in pts]
             full_array_list.append(arr)
 
@@ -355,3 +474,52 @@ def convertToNativeMulti(items: List[Base], sr: arcpy.SpatialReference, dataStor
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
         return None
+
+
+def convertToNativeCoords(
+    base: Base, dataStorage
+) -> Union[Tuple[str, List[List[List[float]]]], None]:
+    """Arcpy-free part of convertToNative for points, polylines and polygons:
+    returns the geometry type and vertices of its parts.
+    None if the geometry is only converted with arcpy (curves, meshes)."""
+    if isinstance(base, Point):
+        return "Point", [[pointToNativeCoords(base, dataStorage)]]
+    if isinstance(base, Line):
+        return "Polyline", [lineToNativeCoords(base, dataStorage)]
+    if isinstance(base, Polyline):
+        return "Polyline", [polylineToNativeCoords(base, dataStorage)]
+    if isinstance(base, GisPolygonGeometry) and base.boundary is not None:
+        return "Polygon", multiPolygonToNativeCoords(base, dataStorage)
+    return None
+
+
+def convertToNativeMultiCoords(
+    items: List[Base], dataStorage
+) -> Union[Tuple[str, List[List[List[float]]]], None]:
+    """Arcpy-free part of convertToNativeMulti, see convertToNativeCoords"""
+    first = items[0]
+    if isinstance(first, Point):
+        return "Multipoint", [pointsToNativeCoords(items, dataStorage)]
+    if isinstance(first, Line) or isinstance(first, Polyline):
+        return "Polyline", multiPolylineToNativeCoords(items, dataStorage)
+    if isinstance(first, Base):
+        try:
+            if first["boundary"] is not None and first["voids"] is not None:
+                return "Polygon", multiPolygonToNativeCoords(items, dataStorage)
+        except:
+            pass
+    return None
+
+
+def nativeGeometryFromCoords(
+    geomType: str, parts: List[List[List[float]]], sr: arcpy.SpatialReference
+):
+    """Builds arcpy geometry from the output of convertToNativeCoords"""
+    if geomType == "Point":
+        return arcpy.PointGeometry(arcpy.Point(*parts[0][0]), sr, has_z=True)
+    if geomType == "Multipoint":
+        return arcpy.Multipoint(arcpy.Array([arcpy.Point(*c) for c in parts[0]]))
+    array = arcpy.Array([arcpy.Array([arcpy.Point(*c) for c in pts]) for pts in parts])
+    if geomType == "Polyline":
+        return arcpy.Polyline(array, sr, has_z=True)
+    return arcpy.Polygon(array, sr, has_z=True)
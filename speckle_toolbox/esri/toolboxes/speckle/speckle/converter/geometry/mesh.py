@@ -1,9 +1,9 @@
 from datetime import datetime
 import os
 import time
-from typing import List
+from typing import List, Tuple, Union
 import arcpy
-import math
+import numpy as np
 
 from specklepy.objects.geometry import Mesh, Point, Polyline
 from specklepy.objects.other import RenderMaterial
@@ -16,16 +16,35 @@ import shapefile
 from shapefile import TRIANGLE_STRIP, TRIANGLE_FAN, OUTER_RING
 
 
-from speckle.speckle.converter.layers.utils import get_scale_factor, getDisplayValueList
-from speckle.speckle.converter.geometry.point import pointToNative
-from speckle.speckle.converter.layers.symbology import featureColorfromNativeRenderer
+from speckle.speckle.converter.layers.utils import (
+    get_scale_factor,
+    getDisplayValueList,
+    getLayerDescribe,
+    getLayerSetting,
+)
+from speckle.speckle.converter.layers.symbology import DEFAULT_FEATURE_COLOR
 from speckle.speckle.converter.layers.utils import get_scale_factor
 from speckle.speckle.utils.panel_logging import logToUser
 from speckle.speckle.plugin_utils.helpers import findOrCreatePath, validateNewFclassName
 
-from panda3d.core import Triangulator
-
-from speckle.speckle.converter.geometry.utils import apply_pt_transform_matrix
+from speckle.speckle.converter.geometry.mesh_cache import (
+    getMeshCache,
+    meshCacheKey,
+    offsetFaces,
+)
+from speckle.speckle.converter.geometry.simplify import simplifyPolygonRings
+from speckle.speckle.converter.geometry.triangulation import triangulatePolygonsParts
+from speckle.speckle.converter.geometry.codec import (
+    GeometryArrays,
+    polygonRings,
+    withCoords,
+)
+from speckle.speckle.converter.geometry.utils import (
+    apply_coords_offsets_rotation_on_send,
+    apply_transform_matrix,
+    transform_speckle_coords_on_receive,
+    specklePointsToCoords,
+)
 from arcpy.management import CreateFeatureclass
 
 
@@ -132,38 +151,84 @@ def fill_mesh_parts(w: shapefile.Writer, mesh: Mesh, geom_id: str, dataStorage):
     return w
 
 
+def decodeMeshFaces(faces, vertexCount: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Parses Speckle faces ([count, i1, i2, ...], count 0 or 1 for legacy triangles or quads)
+    into vertex indices of all faces and offsets of each face in them. Stops at the first
+    face out of range, like the loop over faces did.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    empty = np.zeros(0, dtype=np.int64)
+    if len(faces) == 0:
+        return empty, np.zeros(1, dtype=np.int64)
+
+    for size, markers in ((4, (0, 3)), (5, (1, 4))):  # triangles or quads only
+        if len(faces) % size == 0 and np.all(np.isin(faces[::size], markers)):
+            indices = faces.reshape(-1, size)[:, 1:]
+            valid = np.all((indices >= 0) & (indices < vertexCount), axis=1)
+            count = len(indices) if np.all(valid) else int(np.argmin(valid))
+            offsets = np.arange(count + 1, dtype=np.int64) * (size - 1)
+            return indices[:count].ravel(), offsets
+
+    # n-gons: only the face headers are read one by one
+    starts = []
+    sizes = []
+    k = 0
+    total = len(faces)
+    while k < total:
+        size = int(faces[k])
+        if size == 0:
+            size = 3
+        elif size == 1:
+            size = 4
+        if k + 1 + size > total:
+            break
+        starts.append(k + 1)
+        sizes.append(size)
+        k += size + 1
+    if len(sizes) == 0:
+        return empty, np.zeros(1, dtype=np.int64)
+
+    sizes = np.array(sizes, dtype=np.int64)
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    position = np.arange(offsets[-1]) - np.repeat(offsets[:-1], sizes)
+    indices = faces[np.repeat(starts, sizes) + position]
+
+    invalid = np.flatnonzero((indices < 0) | (indices >= vertexCount))
+    if len(invalid) > 0:
+        count = int(np.searchsorted(offsets, invalid[0], side="right")) - 1
+        offsets = offsets[: count + 1]
+        indices = indices[: offsets[-1]]
+    return indices, offsets
+
+
 def deconstructSpeckleMesh(mesh: Mesh, dataStorage):
     parts_list = []
     types_list = []
     try:
         scale = get_scale_factor(mesh.units)
 
-        count = 0  # sequence of vertex (not of flat coord list)
-        for f in mesh.faces:  # real number of loops will be at least 3 times less
-            try:
-                vertices = mesh.faces[count]
-                if mesh.faces[count] == 0:
-                    vertices = 3
-                if mesh.faces[count] == 1:
-                    vertices = 4
-
-                face = []
-                for i in range(vertices):
-                    index_faces = count + 1 + i
-                    index_vertices = mesh.faces[index_faces] * 3
-                    pt_coords = [
-                        mesh.vertices[index_vertices],
-                        mesh.vertices[index_vertices + 1],
-                        mesh.vertices[index_vertices + 2],
-                    ]
-                    pt_coords_new = apply_pt_transform_matrix(pt_coords, dataStorage)
-                    face.append([scale * coord for coord in pt_coords_new])
-
-                parts_list.append(face)
-                types_list.append(OUTER_RING)
-                count += vertices + 1
-            except:
-                break  # when out of range
+        vertices = np.array(mesh.vertices, dtype=float)  # copy, scaled in place
+        vertices = vertices[: len(vertices) // 3 * 3].reshape(-1, 3)
+        indices, offsets = decodeMeshFaces(mesh.faces, len(vertices))
+        if len(offsets) < 2:
+            return parts_list, types_list
+
+        # transform and scale each vertex once, then pick them for the faces
+        vertices = apply_transform_matrix(vertices, dataStorage)
+        vertices *= scale
+        vertices = transform_speckle_coords_on_receive(vertices, dataStorage)
+        points = vertices[indices]
+
+        sizes = np.diff(offsets)
+        if np.all(sizes == sizes[0]):
+            parts_list = points.reshape(len(sizes), int(sizes[0]), 3).tolist()
+        else:
+            points = points.tolist()
+            parts_list = [
+                points[start:end] for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+        types_list = [OUTER_RING] * len(parts_list)
 
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
@@ -173,6 +238,13 @@ def deconstructSpeckleMesh(mesh: Mesh, dataStorage):
 def constructMeshFromRaster(vertices, faces, colors):
     mesh = None
     try:
+        # flat NumPy arrays from the raster mesh builder
+        if isinstance(vertices, np.ndarray):
+            vertices = vertices.tolist()
+        if isinstance(faces, np.ndarray):
+            faces = faces.tolist()
+        if isinstance(colors, np.ndarray):
+            colors = colors.tolist()
         mesh = Mesh.create(vertices, faces, colors)
         mesh.units = "m"
     except Exception as e:
@@ -193,6 +265,96 @@ def constructMesh(vertices, faces, colors):
     return mesh
 
 
+def polygonDisplayMeshes(
+    polygons: List[List[np.ndarray]], layer, dataStorage
+) -> List[Union[Tuple[np.ndarray, np.ndarray], None]]:
+    """Display meshes of many polygons (lists of Nx3 rings, exterior first, not closed, with offsets
+    and rotation applied), as flat vertices and faces with indices starting at 0.
+    Cached meshes are reused; polygons with voids are triangulated together in one call.
+    """
+    tolerance = getLayerSetting(dataStorage, layer, "mesh_simplify_tolerance")
+    vertexBudget = getLayerSetting(dataStorage, layer, "mesh_vertex_budget")
+    cache = None
+    if getLayerSetting(dataStorage, layer, "mesh_cache"):
+        cache = getMeshCache(dataStorage)
+
+    meshes = [None for _ in polygons]
+    keys = {}  # cache keys of the meshes computed here
+    toTriangulate = []
+    for k, rings in enumerate(polygons):
+        if cache is not None:
+            key = meshCacheKey(rings, tolerance, vertexBudget, dataStorage)
+            meshes[k] = cache.get(key)
+            if meshes[k] is not None:
+                continue
+            keys[k] = key
+        # simplified for display only; boundary and voids keep all the vertices
+        rings = simplifyPolygonRings(rings, tolerance, vertexBudget)
+        if len(rings) == 1:  # no voids: one n-gon face
+            coords = rings[0][:, :3].copy()
+            coords[np.isnan(coords[:, 2]), 2] = 0
+            faces = np.arange(-1, len(coords))
+            faces[0] = len(coords)
+            meshes[k] = (coords.ravel(), faces)
+        elif len(rings) > 1:  # if there are voids
+            toTriangulate.append((k, rings))
+
+    if len(toTriangulate) > 0:
+        vertices, faces, vertexOffsets, faceOffsets = triangulatePolygonsParts(
+            [rings for _, rings in toTriangulate]
+        )
+        for n, (k, _) in enumerate(toTriangulate):
+            polygonFaces = faces[4 * faceOffsets[n] : 4 * faceOffsets[n + 1]].copy()
+            polygonFaces.reshape(-1, 4)[:, 1:] -= vertexOffsets[n]
+            meshes[k] = (
+                vertices[3 * vertexOffsets[n] : 3 * vertexOffsets[n + 1]],
+                polygonFaces,
+            )
+
+    for k, key in keys.items():
+        if meshes[k] is not None:
+            cache.put(key, *meshes[k])
+    return meshes
+
+
+def featureDisplayMeshes(
+    geometries: List, layer, dataStorage
+) -> List[Union[List[Union[Tuple[np.ndarray, np.ndarray], None]], None]]:
+    """Display meshes of every polygon of the polygon GeometryArrays (in the project CRS),
+    computed for the whole chunk at once. None for other geometries.
+    """
+    result = [None for _ in geometries]
+    try:
+        polygons = []
+        owners = []
+        for n, geometry in enumerate(geometries):
+            if not isinstance(geometry, GeometryArrays) or geometry.geomType != "Polygon":
+                continue
+            coords = apply_coords_offsets_rotation_on_send(geometry.coords, dataStorage)
+            result[n] = []
+            for rings in polygonRings(withCoords(geometry, coords)):
+                # same rings as polygonFromRingsToSpeckle: closing vertex removed
+                rings = [
+                    ring[:-1]
+                    if len(ring) > 1 and np.array_equal(ring[0], ring[-1], equal_nan=True)
+                    else ring
+                    for ring in rings
+                ]
+                result[n].append(None)
+                if len(rings) == 0 or len(rings[0]) < 3:
+                    continue
+                polygons.append(rings)
+                owners.append((n, len(result[n]) - 1))
+
+        meshes = polygonDisplayMeshes(polygons, layer, dataStorage)
+        for (n, k), mesh in zip(owners, meshes):
+            result[n][k] = mesh
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return [None for _ in geometries]
+    return result
+
+
 def meshPartsFromPolygon(
     polyBorder: List[Point],
     voidsAsPts: List[List[Point]],
@@ -200,123 +362,31 @@ def meshPartsFromPolygon(
     index: int,
     layer,
     dataStorage,
+    color: int = None,
+    mesh: Tuple[np.ndarray, np.ndarray] = None,
 ):
-
+    """Display mesh parts of the polygon, offset by existing_vert.
+    mesh is the polygon display mesh if computed already, e.g. for the whole chunk of features.
+    """
     try:
         # print("__meshPartsFromPolygon__")
-        vertices = []
-        total_vertices = 0
-        # print(layer)
-        try:
-            sr = arcpy.Describe(layer.dataSource).spatialReference
-        except Exception as e:
-            print(e)
-            sr = None
-        # print(sr)
-        coef = 1
-        maxPoints = 5000
-        if len(polyBorder) >= maxPoints:
-            coef = int(len(polyBorder) / maxPoints)
-
-        if (
-            len(voidsAsPts) == 0
-        ):  # only if there is a mesh with no voids and large amount of points
-            # print("mesh with no voids")
-            for k, ptt in enumerate(polyBorder):  # pointList:
-                pt = polyBorder[k * coef]
-                if k < maxPoints:
-                    # if isinstance(pt, QgsPointXY):
-                    #    pt = QgsPoint(pt)
-                    # print(pt)
-                    if isinstance(pt, Point):
-                        x = pt.x
-                        y = pt.y
-                        z = pt.z
-                        # pt = pointToNative(pt, sr, dataStorage).getPart()
-                    else:
-                        x = pt.X
-                        y = pt.Y
-                        z = 0 if math.isnan(pt.Z) else pt.Z
-                    vertices.extend([x, y, z])
-                    total_vertices += 1
-                else:
-                    break
-
-            ran = range(0, total_vertices)
-            faces = [total_vertices]
-            faces.extend([i + existing_vert for i in ran])
-            # else: https://docs.panda3d.org/1.10/python/reference/panda3d.core.Triangulator
-        else:  # if there are voids
-            print("mesh with voids")
-            # if its a large polygon with voids to be triangualted, lower the coef even more:
-            maxPoints = 100
-            if len(polyBorder) >= maxPoints:
-                coef = int(len(polyBorder) / maxPoints)
-
-            trianglator = Triangulator()
-            faces = []
-
-            pt_count = 0
-            # add extra middle point for border
-            for k, ptt in enumerate(polyBorder):  # pointList:
-                pt = polyBorder[k * coef]
-                if k < maxPoints:
-                    if pt_count < len(polyBorder) - 1 and k < (maxPoints - 1):
-                        pt2 = polyBorder[(k + 1) * coef]
-                    else:
-                        pt2 = polyBorder[0]
-
-                    trianglator.addPolygonVertex(trianglator.addVertex(pt.x, pt.y))
-                    vertices.extend([pt.x, pt.y, pt.z])
-                    trianglator.addPolygonVertex(
-                        trianglator.addVertex((pt.x + pt2.x) / 2, (pt.y + pt2.y) / 2)
-                    )
-                    vertices.extend(
-                        [(pt.x + pt2.x) / 2, (pt.y + pt2.y) / 2, (pt.z + pt2.z) / 2]
-                    )
-                    total_vertices += 2
-                    pt_count += 1
-                else:
-                    break
-
-            # add void points
-            for pts in voidsAsPts:
-                trianglator.beginHole()
-
-                coefVoid = 1
-                if len(pts) >= maxPoints:
-                    coefVoid = int(len(pts) / maxPoints)
-                for k, ptt in enumerate(pts):
-                    pt = pts[k * coefVoid]
-                    if k < maxPoints:
-                        trianglator.addHoleVertex(trianglator.addVertex(pt.x, pt.y))
-                        vertices.extend([pt.x, pt.y, pt.z])
-                        total_vertices += 1
-                    else:
-                        break
-
-            trianglator.triangulate()
-            i = 0
-            # print(trianglator.getNumTriangles())
-            while i < trianglator.getNumTriangles():
-                tr = [
-                    trianglator.getTriangleV0(i),
-                    trianglator.getTriangleV1(i),
-                    trianglator.getTriangleV2(i),
-                ]
-                faces.extend(
-                    [
-                        3,
-                        tr[0] + existing_vert,
-                        tr[1] + existing_vert,
-                        tr[2] + existing_vert,
-                    ]
-                )
-                i += 1
-            ran = range(0, total_vertices)
+        if mesh is None:
+            rings = [specklePointsToCoords(polyBorder)] + [
+                specklePointsToCoords(pts) for pts in voidsAsPts
+            ]
+            mesh = polygonDisplayMeshes([rings], layer, dataStorage)[0]
+        if mesh is None:
+            return 0, [], [], []
+        vertices, faces = mesh
+
+        faces = offsetFaces(faces, existing_vert).tolist()
+        vertices = np.asarray(vertices).tolist()
+        total_vertices = len(vertices) // 3
+        ran = range(0, total_vertices)
 
         # print("color")
-        col = featureColorfromNativeRenderer(index, layer)  # (100<<16) + (100<<8) + 100
+        # no renderer color table: constant color, not a renderer lookup per feature
+        col = DEFAULT_FEATURE_COLOR if color is None else color
         colors = [col for i in ran]  # apply same color for all vertices
 
         return total_vertices, vertices, faces, colors
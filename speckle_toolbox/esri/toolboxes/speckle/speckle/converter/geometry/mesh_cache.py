@@ -0,0 +1,194 @@
+"""
+Contains the persistent cache of polygon display meshes (simplified and triangulated rings),
+stored in SQLite in the Speckle temp folder and reused between sends.
+"""
+
+import hashlib
+import inspect
+import os
+import sqlite3
+import time
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from speckle.speckle.converter.layers.utils import getConversionContext
+from speckle.speckle.plugin_utils.helpers import findOrCreatePath
+from speckle.speckle.utils.panel_logging import logToUser
+
+MESH_CACHE_FOLDER = os.path.expandvars(r"%LOCALAPPDATA%") + "\\Temp\\Speckle_ArcGIS_temp\\"
+MESH_CACHE_FILE = "mesh_cache.sqlite"
+MESH_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MESH_CACHE_FLUSH_COUNT = 10000  # pending entries written in one transaction
+
+
+class MeshCache:
+    """SQLite table of mesh vertices/faces by ring geometry hash, with size-bounded LRU eviction.
+    Faces are stored with vertex indices starting at 0.
+    """
+
+    def __init__(self, path: str = None, maxBytes: int = MESH_CACHE_MAX_BYTES):
+        if path is None:
+            findOrCreatePath(MESH_CACHE_FOLDER)
+            path = MESH_CACHE_FOLDER + MESH_CACHE_FILE
+        self.path = path
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.pending = {}
+        self.used = {}
+        self.connection = sqlite3.connect(path, timeout=30)  # shared with worker processes
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meshes (key TEXT PRIMARY KEY, vertices BLOB, faces BLOB, size INTEGER, last_used REAL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS meshes_last_used ON meshes (last_used)"
+        )
+        self.connection.commit()
+
+    def get(self, key: str) -> Union[Tuple[np.ndarray, np.ndarray], None]:
+        """Returns flat vertices and faces of the cached mesh, or None"""
+        if key in self.pending:
+            self.hits += 1
+            return self.pending[key]
+        row = self.connection.execute(
+            "SELECT vertices, faces FROM meshes WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used[key] = time.time()
+        return np.frombuffer(row[0], dtype=np.float64), np.frombuffer(
+            row[1], dtype=np.int64
+        )
+
+    def put(self, key: str, vertices: np.ndarray, faces: np.ndarray):
+        """Adds the mesh; written to the database in batches"""
+        self.pending[key] = (
+            np.asarray(vertices, dtype=np.float64),
+            np.asarray(faces, dtype=np.int64),
+        )
+        if len(self.pending) >= MESH_CACHE_FLUSH_COUNT:
+            self.flush()
+
+    def flush(self):
+        """Writes pending meshes and access times, then evicts least recently used meshes over the size limit"""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meshes VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        key,
+                        vertices.tobytes(),
+                        faces.tobytes(),
+                        vertices.nbytes + faces.nbytes,
+                        now,
+                    )
+                    for key, (vertices, faces) in self.pending.items()
+                ],
+            )
+            self.connection.executemany(
+                "UPDATE meshes SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self.used.items()],
+            )
+        self.pending = {}
+        self.used = {}
+        self.evict()
+
+    def evict(self):
+        """Deletes least recently used meshes until the cache is within 90% of its size limit"""
+        total = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM meshes"
+        ).fetchone()[0]
+        if total <= self.maxBytes:
+            return
+        target = 0.9 * self.maxBytes
+        keys = []
+        for key, size in self.connection.execute(
+            "SELECT key, size FROM meshes ORDER BY last_used"
+        ):
+            if total <= target:
+                break
+            keys.append((key,))
+            total -= size
+        with self.connection:
+            self.connection.executemany("DELETE FROM meshes WHERE key = ?", keys)
+
+    def close(self):
+        """Writes pending meshes and closes the database"""
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+
+def meshCacheKey(
+    rings: List[np.ndarray], tolerance: float, vertexBudget: int, dataStorage
+) -> str:
+    """Hash of the ring coordinates, simplification settings and CRS offsets/rotation"""
+    digest = hashlib.sha1()
+    for ring in rings:
+        ring = np.ascontiguousarray(ring, dtype=np.float64)
+        digest.update(len(ring).to_bytes(8, "little"))
+        digest.update(ring.tobytes())
+    digest.update(
+        repr(
+            (
+                tolerance,
+                vertexBudget,
+                getattr(dataStorage, "crs_offset_x", None),
+                getattr(dataStorage, "crs_offset_y", None),
+                getattr(dataStorage, "crs_rotation", None),
+            )
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def offsetFaces(faces: np.ndarray, offset: int) -> np.ndarray:
+    """Adds the offset to vertex indices of Speckle faces ([count, i1, i2, ...])"""
+    faces = np.array(faces, dtype=np.int64)
+    if offset == 0 or len(faces) == 0:
+        return faces
+    if len(faces) % 4 == 0 and np.all(faces[::4] == 3):  # triangles only
+        faces.reshape(-1, 4)[:, 1:] += offset
+        return faces
+    k = 0
+    while k < len(faces):
+        count = int(faces[k])
+        faces[k + 1 : k + 1 + count] += offset
+        k += count + 1
+    return faces
+
+
+def getMeshCache(dataStorage) -> Union[MeshCache, None]:
+    """Returns the mesh cache of the current send, opening it if needed; None if unavailable"""
+    context = getConversionContext(dataStorage)
+    if context is None:
+        return None
+    if "meshCache" not in context:
+        try:
+            context["meshCache"] = MeshCache()
+        except Exception as e:
+            logToUser(
+                f"Mesh cache unavailable: {e}", level=1, func=inspect.stack()[0][3]
+            )
+            context["meshCache"] = None
+    return context["meshCache"]
+
+
+def closeMeshCache(dataStorage) -> Union[MeshCache, None]:
+    """Writes and closes the mesh cache of the current send; returns it for the hit/miss counts"""
+    context = getattr(dataStorage, "conversionContext", None)
+    if context is None:
+        return None
+    cache = context.pop("meshCache", None)
+    if cache is None:
+        return None
+    try:
+        cache.close()
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+    return cache
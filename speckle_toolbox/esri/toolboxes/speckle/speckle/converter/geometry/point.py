@@ -5,8 +5,9 @@ import arcpy
 
 import inspect
 from speckle.speckle.converter.geometry.utils import (
+    apply_coords_offsets_rotation_on_send,
     apply_pt_offsets_rotation_on_send,
-    transform_speckle_pt_on_receive,
+    transform_speckle_coords_on_receive,
     apply_pt_transform_matrix,
 )
 
@@ -74,16 +75,33 @@ def pointToSpeckle(pt, feature, layer, dataStorage):
         return None
 
 
+def pointsFromCoordsToSpeckle(coords, dataStorage) -> List[Point]:
+    """Converts Nx3 array of vertices to Speckle Points, applying offsets and rotation in bulk"""
+    points = []
+    try:
+        coords = apply_coords_offsets_rotation_on_send(coords, dataStorage)
+        for x, y, z in coords.tolist():
+            points.append(Point(x=x, y=y, z=z, units="m"))
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+    return points
+
+
+def pointToNativeCoords(pt: Point, dataStorage) -> List[float]:
+    """Scaled and transformed coordinates of a Speckle Point, without arcpy calls"""
+    new_pt = scalePointToNative(pt, pt.units, dataStorage)
+    coords = apply_pt_transform_matrix([new_pt.x, new_pt.y, new_pt.z], dataStorage)
+    return transform_speckle_coords_on_receive([coords], dataStorage)[0].tolist()
+
+
 def pointToNative(
     pt: Point, sr: arcpy.SpatialReference, dataStorage
 ) -> arcpy.PointGeometry:
     """Converts a Speckle Point to QgsPoint"""
     try:
-        new_pt = scalePointToNative(pt, pt.units, dataStorage)
-        new_pt = apply_pt_transform_matrix(new_pt, dataStorage)
-        newPt = transform_speckle_pt_on_receive(new_pt, dataStorage)
+        x, y, z = pointToNativeCoords(pt, dataStorage)
 
-        geom = arcpy.PointGeometry(arcpy.Point(pt.x, pt.y, pt.z), sr, has_z=True)
+        geom = arcpy.PointGeometry(arcpy.Point(x, y, z), sr, has_z=True)
         # print(geom)
         return geom
 
@@ -107,6 +125,14 @@ def pointToNativeWithoutTransforms(pt: Point, sr: arcpy.SpatialReference, dataSt
         return None
 
 
+def pointsToNativeCoords(points: List[Point], dataStorage) -> List[List[float]]:
+    """Returns coordinates of Speckle Points, applying offsets and rotation in bulk"""
+    coords = [pointToCoord(pt) for pt in points]
+    if len(coords) == 0:
+        return coords
+    return transform_speckle_coords_on_receive(coords, dataStorage).tolist()
+
+
 def pointToCoord(point: Point) -> List[float]:
     """Converts a Speckle Point to QgsPoint"""
     try:
@@ -1,4 +1,4 @@
-from typing import List, Sequence, Union
+from typing import List, Sequence, Tuple, Union
 import arcpy
 import json
 from arcpy.arcobjects.arcobjects import SpatialReference
@@ -14,10 +14,10 @@ from speckle.speckle.converter.geometry.mesh import (
     constructMeshFromRaster,
     meshPartsFromPolygon,
 )
-from speckle.speckle.converter.geometry.point import pointToCoord, pointToNative
-from speckle.speckle.converter.layers.symbology import featureColorfromNativeRenderer
+from speckle.speckle.converter.geometry.point import pointToCoord, pointsToNativeCoords
 from speckle.speckle.converter.geometry.polyline import (
     anyLineToSpeckle,
+    polylineFromCoordsToSpeckle,
     polylineFromVerticesToSpeckle,
     speckleArcCircleToPoints,
     curveToSpeckle,
@@ -26,13 +26,15 @@ from speckle.speckle.converter.geometry.utils import (
     speckleBoundaryToSpecklePts,
     specklePolycurveToPoints,
 )
+from speckle.speckle.converter.layers.utils import getLayerDescribe
 from speckle.speckle.utils.panel_logging import logToUser
 
-import math
-from panda3d.core import Triangulator
+import numpy as np
 
 
-def polygonToSpeckleMesh(geom, index: int, layer, multitype: bool, dataStorage):
+def polygonToSpeckleMesh(
+    geom, index: int, layer, multitype: bool, dataStorage, color: int = None
+):
     print("________polygonToSpeckleMesh_____")
     # print(geom)
     polygon = GisPolygonGeometry(units="m")
@@ -65,7 +67,13 @@ def polygonToSpeckleMesh(geom, index: int, layer, multitype: bool, dataStorage):
                     voidsAsPts.append(pts)
                 # print(voidsAsPts)
                 total_vert, vertices_x, faces_x, colors_x = meshPartsFromPolygon(
-                    polyBorder, voidsAsPts, existing_vert, index, layer, dataStorage
+                    polyBorder,
+                    voidsAsPts,
+                    existing_vert,
+                    index,
+                    layer,
+                    dataStorage,
+                    color,
                 )
 
                 existing_vert += total_vert
@@ -176,7 +184,7 @@ def multiPolygonToSpeckle(geom, index: str, layer, multiType: bool, dataStorage)
             # print(full_arr)
             poly = arcpy.Polygon(
                 arcpy.Array(full_arr),
-                arcpy.Describe(layer.dataSource).SpatialReference,
+                getLayerDescribe(layer, dataStorage).SpatialReference,
                 has_z=True,
             )
             # print(poly) #<geoprocessing describe geometry object object at 0x000002B2D3E338D0>
@@ -189,22 +197,63 @@ def multiPolygonToSpeckle(geom, index: str, layer, multiType: bool, dataStorage)
     return polygon
 
 
-def polygonToSpeckle(geom, feature, index: int, layer, dataStorage, x_form):
+def polygonToSpeckle(
+    geom, feature, index: int, layer, dataStorage, x_form, color: int = None
+):
     """Converts a Polygon to Speckle"""
-    # polygon = Base(units="m")
-    polygon = GisPolygonGeometry(units="m")
     try:
         print("___Polygon to Speckle____")
         # print(geom)  # array
 
         boundaries, voids = getPolyBoundaryVoids(geom, layer, dataStorage, x_form)
-        boundary = boundaries[0]
-        # print(boundary)
-        # print(voids)
+        return polygonFromBoundaryToSpeckle(
+            boundaries[0], voids, index, layer, dataStorage, color
+        )
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return None
+
+
+def polygonFromRingsToSpeckle(
+    rings: List[np.ndarray],
+    index: int,
+    layer,
+    dataStorage,
+    color: int = None,
+    mesh: Tuple[np.ndarray, np.ndarray] = None,
+):
+    """Converts Polygon rings (Nx3 arrays, exterior ring first) to Speckle.
+    mesh is the display mesh from featureDisplayMeshes, computed if None.
+    """
+    try:
+        boundaryVoids = []
+        for ring in rings:
+            if len(ring) > 1 and np.array_equal(ring[0], ring[-1], equal_nan=True):
+                ring = ring[:-1]  # closing vertex
+            boundaryVoids.append(polylineFromCoordsToSpeckle(ring, True, dataStorage))
+        if len(boundaryVoids) == 0:
+            return None
+        return polygonFromBoundaryToSpeckle(
+            boundaryVoids[0], boundaryVoids[1:], index, layer, dataStorage, color, mesh
+        )
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return None
 
-        data = arcpy.Describe(layer.dataSource)
-        sr = data.spatialReference
 
+def polygonFromBoundaryToSpeckle(
+    boundary,
+    voids,
+    index: int,
+    layer,
+    dataStorage,
+    color: int = None,
+    mesh: Tuple[np.ndarray, np.ndarray] = None,
+):
+    """Creates Speckle Polygon with a display mesh from converted boundary and voids"""
+    # polygon = Base(units="m")
+    polygon = GisPolygonGeometry(units="m")
+    try:
         if boundary is None:
             return None
         polygon.boundary = boundary
@@ -213,99 +262,14 @@ def polygonToSpeckle(geom, feature, index: int, layer, dataStorage, x_form):
         # print(boundary)
 
         ############# mesh
-        vertices = []
-        polyBorder = boundary.as_points()
-        total_vertices = 0
+        polyBorder = speckleBoundaryToSpecklePts(boundary)
 
         if len(polyBorder) > 2:  # at least 3 points
             # print("make meshes from polygons")
-            if len(voids) == 0:  # if there is a mesh with no voids
-                # print("no voids")
-                # print(polyBorder)
-                for pt in polyBorder:
-                    if isinstance(pt, Point):
-                        pt = pointToNative(pt, sr, dataStorage).getPart()  # SR unknown
-                    x = pt.X
-                    y = pt.Y
-                    z = 0 if math.isnan(pt.Z) else pt.Z
-                    vertices.extend([x, y, z])
-                    total_vertices += 1
-                # print(vertices)
-                ran = range(0, total_vertices)
-                faces = [total_vertices]
-                faces.extend([i for i in ran])
-                # print(faces)
-                # else: https://docs.panda3d.org/1.10/python/reference/panda3d.core.Triangulator
-            else:
-                # print("voids")
-                # print(polyBorder)
-                trianglator = Triangulator()
-                faces = []
-
-                pt_count = 0
-                # add extra middle point for border
-                for pt in polyBorder:
-                    if pt_count < len(polyBorder) - 1:
-                        pt2 = polyBorder[pt_count + 1]
-                    else:
-                        pt2 = polyBorder[0]
-
-                    trianglator.addPolygonVertex(trianglator.addVertex(pt.x, pt.y))
-                    vertices.extend([pt.x, pt.y, pt.z])
-
-                    # trianglator.addPolygonVertex(trianglator.addVertex((pt.x+pt2.x)/4*3, (pt.y+pt2.y)/4*3))
-                    # vertices.extend([(pt.x+pt2.x)/4*3, (pt.y+pt2.y)/4*3, (pt.z+pt2.z)/4*3])
-
-                    trianglator.addPolygonVertex(
-                        trianglator.addVertex((pt.x + pt2.x) / 2, (pt.y + pt2.y) / 2)
-                    )
-                    vertices.extend(
-                        [(pt.x + pt2.x) / 2, (pt.y + pt2.y) / 2, (pt.z + pt2.z) / 2]
-                    )
-
-                    # trianglator.addPolygonVertex(trianglator.addVertex((pt.x+pt2.x)/4, (pt.y+pt2.y)/4))
-                    # vertices.extend([(pt.x+pt2.x)/4, (pt.y+pt2.y)/4, (pt.z+pt2.z)/4])
-
-                    total_vertices += 2
-                    pt_count += 1
-
-                # add void points
-                for i in range(len(voids)):
-                    trianglator.beginHole()
-
-                    pts = []
-                    if isinstance(voids[i], Circle) or isinstance(voids[i], Arc):
-                        pts = speckleArcCircleToPoints(voids[i])
-                    elif isinstance(voids[i], Polycurve):
-                        pts = specklePolycurveToPoints(voids[i])
-                    elif isinstance(voids[i], Line):
-                        pass
-                    else:
-                        try:
-                            pts = voids[i].as_points()
-                        except:
-                            pass  # if Line
-                    # pts = voids[i].as_points()
-                    for pt in pts:
-                        trianglator.addHoleVertex(trianglator.addVertex(pt.x, pt.y))
-                        vertices.extend([pt.x, pt.y, pt.z])
-                        total_vertices += 1
-
-                trianglator.triangulate()
-                i = 0
-                while i < trianglator.getNumTriangles():
-                    tr = [
-                        trianglator.getTriangleV0(i),
-                        trianglator.getTriangleV1(i),
-                        trianglator.getTriangleV2(i),
-                    ]
-                    faces.extend([3, tr[0], tr[1], tr[2]])
-                    i += 1
-                ran = range(0, total_vertices)
-
-            # print(polygon)
-            col = featureColorfromNativeRenderer(index, layer)
-            colors = [col for i in ran]  # apply same color for all vertices
+            voidsAsPts = [speckleBoundaryToSpecklePts(v) for v in voids]
+            total_vertices, vertices, faces, colors = meshPartsFromPolygon(
+                polyBorder, voidsAsPts, 0, index, layer, dataStorage, color, mesh
+            )
             mesh = constructMesh(vertices, faces, colors)
 
             # print(mesh)
@@ -359,7 +323,7 @@ def polygonToNative(
             except:
                 pass  # if Line
 
-        pts = [pointToCoord(pt) for pt in pointsSpeckle]
+        pts = pointsToNativeCoords(pointsSpeckle, dataStorage)
         # print(pts)
 
         outer_arr = [arcpy.Point(*coords) for coords in pts]
@@ -381,7 +345,7 @@ def polygonToNative(
                         pointsSpeckle = void.as_points()
                     except:
                         pass  # if Line
-                pts = [pointToCoord(pt) for pt in pointsSpeckle]
+                pts = pointsToNativeCoords(pointsSpeckle, dataStorage)
 
                 inner_arr = [arcpy.Point(*coords) for coords in pts]
                 inner_arr.append(inner_arr[0])
@@ -397,84 +361,77 @@ def polygonToNative(
     return polygon
 
 
+def multiPolygonToNativeCoords(
+    items: List[Base], dataStorage
+) -> List[List[List[float]]]:
+    """Transformed vertices of the closed boundary and voids of each polygon,
+    without arcpy calls"""
+    if not isinstance(items, List):
+        items = [items]
+    rings = []
+    for item_geom in items:  # will be 1 item
+        try:
+            item_geom = item_geom["geometry"]
+        except:
+            item_geom = [item_geom]
+        for item in item_geom:
+            # print(item)
+            # pts = [pointToCoord(pt) for pt in item["boundary"].as_points()]
+            pointsSpeckle = []
+            if isinstance(item["boundary"], Circle) or isinstance(
+                item["boundary"], Arc
+            ):
+                pointsSpeckle = speckleArcCircleToPoints(item["boundary"])
+            elif isinstance(item["boundary"], Polycurve):
+                pointsSpeckle = specklePolycurveToPoints(item["boundary"])
+            elif isinstance(item["boundary"], Line):
+                pass
+            else:
+                try:
+                    pointsSpeckle = item["boundary"].as_points()
+                except Exception as e:
+                    print(e)  # if Line
+            # print(pointsSpeckle)
+            pts = pointsToNativeCoords(pointsSpeckle, dataStorage)
+            if pts[0] != pts[-1]:
+                pts.append(pts[0])
+            rings.append(pts)
+            try:
+                for void in item["voids"]:
+                    # pts = [pointToCoord(pt) for pt in void.as_points()]
+                    pointsSpeckle = []
+                    if isinstance(void, Circle) or isinstance(void, Arc):
+                        pointsSpeckle = speckleArcCircleToPoints(void)
+                    elif isinstance(void, Polycurve):
+                        pointsSpeckle = specklePolycurveToPoints(void)
+                    elif isinstance(void, Line):
+                        pass
+                    else:
+                        try:
+                            pointsSpeckle = void.as_points()
+                        except:
+                            pass  # if Line
+                    pts = pointsToNativeCoords(pointsSpeckle, dataStorage)
+                    if pts[0] != pts[-1]:
+                        pts.append(pts[0])
+                    rings.append(pts)
+            except Exception as e:
+                print(e)
+    # outlines are written one by one, with no separation to "parts"
+    return rings
+
+
 def multiPolygonToNative(
     items: List[Base], sr: arcpy.SpatialReference, dataStorage
 ):  # TODO fix multi features
 
     print("_______Drawing Multipolygons____")
     polygon = None
-    if not isinstance(items, List):
-        items = [items]
     try:
-        # print(items)
-        full_array_list = []
-        for item_geom in items:  # will be 1 item
-            try:
-                item_geom = item_geom["geometry"]
-            except:
-                item_geom = [item_geom]
-            for item in item_geom:
-                # print(item)
-                # pts = [pointToCoord(pt) for pt in item["boundary"].as_points()]
-                pointsSpeckle = []
-                if isinstance(item["boundary"], Circle) or isinstance(
-                    item["boundary"], Arc
-                ):
-                    pointsSpeckle = speckleArcCircleToPoints(item["boundary"])
-                elif isinstance(item["boundary"], Polycurve):
-                    pointsSpeckle = specklePolycurveToPoints(item["boundary"])
-                elif isinstance(item["boundary"], Line):
-                    pass
-                else:
-                    try:
-                        pointsSpeckle = item["boundary"].as_points()
-                    except Exception as e:
-                        print(e)  # if Line
-                # print(pointsSpeckle)
-                pts = [pointToCoord(pt) for pt in pointsSpeckle]
-                # print(pts)
-
-                outer_arr = [arcpy.Point(*coords) for coords in pts]
-                if pts[0] != pts[-1]:
-                    outer_arr.append(outer_arr[0])
-                # print("outer border")
-                # print(outer_arr)
-                geomPart = []
-                try:
-                    for void in item["voids"]:
-                        # print("void")
-                        # print(void)
-                        # pts = [pointToCoord(pt) for pt in void.as_points()]
-                        pointsSpeckle = []
-                        if isinstance(void, Circle) or isinstance(void, Arc):
-                            pointsSpeckle = speckleArcCircleToPoints(void)
-                        elif isinstance(void, Polycurve):
-                            pointsSpeckle = specklePolycurveToPoints(void)
-                        elif isinstance(void, Line):
-                            pass
-                        else:
-                            try:
-                                pointsSpeckle = void.as_points()
-                            except:
-                                pass  # if Line
-                        pts = [pointToCoord(pt) for pt in pointsSpeckle]
-
-                        inner_arr = [arcpy.Point(*coords) for coords in pts]
-                        if pts[0] != pts[-1]:
-                            inner_arr.append(inner_arr[0])
-                        geomPart.append(arcpy.Array(inner_arr))
-                except Exception as e:
-                    print(e)
-
-                geomPart.insert(0, arcpy.Array(outer_arr))
-                full_array_list.extend(
-                    geomPart
-                )  # outlines are written one by one, with no separation to "parts"
-                # print(full_array_list)  # array of points
-
-            # print("end of loop1")
-        # print("end of loop2")
-        geomPartArray = arcpy.Array(full_array_list)
+        rings = multiPolygonToNativeCoords(items, dataStorage)
+        geomPartArray = arcpy.Array(
+            [arcpy.Array([arcpy.Point(*coords) for coords in pts]) for pts in rings]
+        )
         polygon = arcpy.Polygon(geomPartArray, sr, has_z=True)
 
         print(polygon)
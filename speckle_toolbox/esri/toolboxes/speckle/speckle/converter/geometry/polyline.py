@@ -28,10 +28,17 @@ from speckle.speckle.converter.geometry.point import (
     addZtoPoint,
 )
 from speckle.speckle.converter.geometry.utils import (
+    apply_coords_offsets_rotation_on_send,
+    geometryPartsToArrays,
     speckleArcCircleToPoints,
     specklePolycurveToPoints,
+    transform_speckle_coords_on_receive,
+)
+from speckle.speckle.converter.layers.utils import (
+    apply_reproject,
+    get_scale_factor,
+    getLayerDescribe,
 )
-from speckle.speckle.converter.layers.utils import apply_reproject, get_scale_factor
 from speckle.speckle.utils.panel_logging import logToUser
 
 
@@ -73,7 +80,7 @@ def multiPolylineToSpeckle(
         print(enumerate(geom.getPart()))
         for i, x in enumerate(geom.getPart()):
             poly = arcpy.Polyline(
-                x, arcpy.Describe(layer.dataSource).SpatialReference, has_z=True
+                x, getLayerDescribe(layer, dataStorage).SpatialReference, has_z=True
             )
             print(poly)
             polyline.append(
@@ -89,7 +96,6 @@ def anyLineToSpeckle(geom, feature, layer, dataStorage, x_form=None):
     print("___Any line to Speckle____")
     polyline = None
     try:
-        pointList = []
         print(geom.hasCurves)
         # multiType = feature.isMultipart
 
@@ -106,24 +112,17 @@ def anyLineToSpeckle(geom, feature, layer, dataStorage, x_form=None):
             new_geom = geom
 
         if x_form is not None:
-            new_geom = apply_reproject(new_geom, x_form, dataStorage).getPart()
+            new_geom = apply_reproject(new_geom, x_form, dataStorage)
             if new_geom is None:
                 return None
 
-        # print(new_geom)  # describe geometry object
-        for p in new_geom:
-            # print(p)  # array
-            for pt in p:
-                # print(pt)
-                if pt != None:
-                    pointList.append(pt)  # ; print(pt.Z)
+        # all parts as one contiguous array, without per-vertex ArcObjects calls
+        coords = np.concatenate(geometryPartsToArrays(new_geom))
         closed = False
-        if pointList[0] == pointList[len(pointList) - 1]:
+        if np.array_equal(coords[0], coords[-1], equal_nan=True):
             closed = True
-            pointList = pointList[:-1]
-        polyline = polylineFromVerticesToSpeckle(
-            pointList, closed, feature, layer, dataStorage
-        )
+            coords = coords[:-1]
+        polyline = polylineFromCoordsToSpeckle(coords, closed, dataStorage)
 
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
@@ -136,7 +135,6 @@ def polylineToSpeckle(
     print("___Polyline to Speckle____")
     polyline = None
     try:
-        pointList = []
         print(geom.hasCurves)
 
         if multiType is False:
@@ -146,17 +144,12 @@ def polylineToSpeckle(
                 print(geom.JSON)
                 polyline = curveToSpeckle(geom, "Polyline", feature, layer, dataStorage)
             else:
-                for p in geom:
-                    for pt in p:
-                        if pt != None:
-                            pointList.append(pt)  # ; print(pt.Z)
+                coords = np.concatenate(geometryPartsToArrays(geom))
                 closed = False
-                if pointList[0] == pointList[len(pointList) - 1]:
+                if np.array_equal(coords[0], coords[-1], equal_nan=True):
                     closed = True
-                    pointList = pointList[:-1]
-                polyline = polylineFromVerticesToSpeckle(
-                    pointList, closed, feature, layer, dataStorage
-                )
+                    coords = coords[:-1]
+                polyline = polylineFromCoordsToSpeckle(coords, closed, dataStorage)
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
     return polyline
@@ -169,33 +162,35 @@ def polylineFromVerticesToSpeckle(
     polyline = Polyline(units="m")
     try:
         # print("__polylineFromVerticesToSpeckle")
-        # print(vertices)
-        if isinstance(vertices, list):
-            if len(vertices) > 0 and isinstance(vertices[0], Point):
-                specklePts = vertices
-            else:
-                specklePts = [
-                    pointToSpeckle(pt, feature, layer, dataStorage) for pt in vertices
-                ]  # breaks unexplainably
-        # elif isinstance(vertices, QgsVertexIterator):
-        #    specklePts = [pointToSpeckle(pt, feature, layer) for pt in vertices]
-        else:
+        if not isinstance(vertices, list):
             return None
+        if len(vertices) > 0 and isinstance(vertices[0], Point):
+            # already converted to Speckle: no transforms applied
+            coords = np.array([[pt.x, pt.y, pt.z] for pt in vertices], dtype=float)
+            return polylineFromCoordsToSpeckle(coords, closed, None)
 
-        specklePts = []
-        for pt in vertices:
-            newPt = pointToSpeckle(pt, feature, layer, dataStorage)
-            specklePts.append(newPt)
+        coords = np.array(
+            [[pt.X, pt.Y, pt.Z if pt.Z else 0] for pt in vertices], dtype=float
+        )
+        polyline = polylineFromCoordsToSpeckle(coords, closed, dataStorage)
+
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+    return polyline
 
-        # TODO: Replace with `from_points` function when fix is pushed.
-        polyline.value = []
-        polyline.closed = closed
-        polyline.units = specklePts[0].units
-        for i, point in enumerate(specklePts):
-            if closed and i == len(specklePts) - 1 and specklePts[0] == point:
-                continue  # if we consider the last pt, do not add is coincides with the first (and type is Closed)
-            polyline.value.extend([point.x, point.y, point.z])
 
+def polylineFromCoordsToSpeckle(coords: np.ndarray, closed: bool, dataStorage) -> Polyline:
+    """Converts Nx3 array of vertices to Speckle Polyline, applying offsets and rotation in bulk.
+    If dataStorage is None, the coordinates are used as they are.
+    """
+    polyline = Polyline(units="m")
+    try:
+        coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+        if dataStorage is not None:
+            coords = apply_coords_offsets_rotation_on_send(coords, dataStorage)
+        polyline.closed = closed
+        polyline.units = "m"
+        polyline.value = coords.ravel().tolist()
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
     return polyline
@@ -506,6 +501,29 @@ def lineFrom2pt(pt1: List[float], pt2: List[float]):
     return line
 
 
+def polylineToNativeCoords(poly: Polyline, dataStorage) -> List[List[float]]:
+    """Scaled and transformed vertices of a Speckle Polyline, without arcpy calls"""
+    if isinstance(poly, Polycurve):
+        poly = specklePolycurveToPoints(poly)
+    if isinstance(poly, Arc) or isinstance(poly, Circle):
+        try:
+            poly = poly["displayValue"]
+        except:
+            poly = speckleArcCircleToPoints(poly)
+
+    if isinstance(poly, list):
+        pts = [pointToCoord(pt) for pt in poly]
+    else:
+        pts = [pointToCoord(pt) for pt in poly.as_points()]
+
+    if poly.closed is True:
+        pts.append(pointToCoord(poly.as_points()[0]))
+
+    scale = get_scale_factor(poly.units)
+    pts = [[pt[0] * scale, pt[1] * scale, pt[2] * scale] for pt in pts]
+    return transform_speckle_coords_on_receive(pts, dataStorage).tolist()
+
+
 def polylineToNative(
     poly: Polyline, sr: arcpy.SpatialReference, dataStorage
 ) -> arcpy.Polyline:
@@ -513,25 +531,7 @@ def polylineToNative(
     print("__ convert polyline to native __")
     polyline = None
     try:
-
-        if isinstance(poly, Polycurve):
-            poly = specklePolycurveToPoints(poly)
-        if isinstance(poly, Arc) or isinstance(poly, Circle):
-            try:
-                poly = poly["displayValue"]
-            except:
-                poly = speckleArcCircleToPoints(poly)
-
-        if isinstance(poly, list):
-            pts = [pointToCoord(pt) for pt in poly]
-        else:
-            pts = [pointToCoord(pt) for pt in poly.as_points()]
-
-        if poly.closed is True:
-            pts.append(pointToCoord(poly.as_points()[0]))
-
-        scale = get_scale_factor(poly.units)
-        pts = [[pt[0] * scale, pt[1] * scale, pt[2] * scale] for pt in pts]
+        pts = polylineToNativeCoords(poly, dataStorage)
 
         pts_coord_list = [arcpy.Point(*coords) for coords in pts]
         polyline = arcpy.Polyline(arcpy.Array(pts_coord_list), sr, has_z=True)
@@ -541,13 +541,19 @@ def polylineToNative(
     return polyline
 
 
+def lineToNativeCoords(line: Line, dataStorage) -> List[List[float]]:
+    """Scaled and transformed vertices of a Speckle Line, without arcpy calls"""
+    pts = [pointToCoord(pt) for pt in [line.start, line.end]]
+    scale = get_scale_factor(line.units)
+    pts = [[pt[0] * scale, pt[1] * scale, pt[2] * scale] for pt in pts]
+    return transform_speckle_coords_on_receive(pts, dataStorage).tolist()
+
+
 def lineToNative(line: Line, sr: arcpy.SpatialReference, dataStorage) -> arcpy.Polyline:
     """Converts a Speckle Line to Native"""
     print("___Line to Native___")
     try:
-        pts = [pointToCoord(pt) for pt in [line.start, line.end]]
-        scale = get_scale_factor(line.units)
-        pts = [[pt[0] * scale, pt[1] * scale, pt[2] * scale] for pt in pts]
+        pts = lineToNativeCoords(line, dataStorage)
 
         line = arcpy.Polyline(
             arcpy.Array([arcpy.Point(*coords) for coords in pts]), sr, has_z=True
@@ -626,6 +632,7 @@ def circleToNative(
 
         scale = get_scale_factor(poly.units)
         points = [[pt[0] * scale, pt[1] * scale, pt[2] * scale] for pt in points]
+        points = transform_speckle_coords_on_receive(points, dataStorage).tolist()
 
         curve = arcpy.Polyline(
             arcpy.Array([arcpy.Point(*coords) for coords in points]), sr, has_z=True
@@ -725,6 +732,7 @@ def arcToNativePolyline(
 
         scale = get_scale_factor(poly.units)
         points = [[pt[0] * scale, pt[1] * scale, pt[2] * scale] for pt in points]
+        points = transform_speckle_coords_on_receive(points, dataStorage).tolist()
 
         curve = arcpy.Polyline(
             arcpy.Array([arcpy.Point(*coords) for coords in points]), sr, has_z=True
@@ -0,0 +1,378 @@
+"""
+Contains NumPy routines building raster display meshes from whole band arrays.
+"""
+
+import math
+from typing import Any, List, Tuple, Union
+
+import numpy as np
+
+RASTER_MESH_CELLS = "cells"
+RASTER_MESH_SHARED = "shared"
+
+RASTER_LOD_METHODS = ["mean", "mode", "nearest"]
+
+
+def packColors(
+    colorR: np.ndarray, colorG: np.ndarray, colorB: np.ndarray
+) -> np.ndarray:
+    """Packs R, G, B channel arrays (0-255) into Speckle int colors"""
+    return (
+        (np.asarray(colorR, dtype=np.int64) << 16)
+        + (np.asarray(colorG, dtype=np.int64) << 8)
+        + np.asarray(colorB, dtype=np.int64)
+    )
+
+
+def remapToColorRange(
+    bandVals: np.ndarray, valMin: float, valMax: float, invert: bool = False
+) -> np.ndarray:
+    """Remaps band values from the (min, max) range to the (0, 255) range"""
+    valMin = float(valMin)
+    valMax = float(valMax)
+    valRange = valMax - valMin
+    if valRange == 0:
+        colorVal = 0 if (valMax if invert else valMin) == 0 else 255
+        return np.full(bandVals.shape, colorVal, dtype=np.int64)
+    if invert:
+        remapped = (valMax - bandVals) / valRange * 255
+    else:
+        remapped = (bandVals - valMin) / valRange * 255
+    remapped = np.nan_to_num(np.clip(np.trunc(remapped), 0, 255), nan=0)
+    return remapped.astype(np.int64)
+
+
+def rasterStretchColors(
+    bandVals: np.ndarray, minLabel: float, maxLabel: float, invert: bool = False
+) -> np.ndarray:
+    """Greyscale colors of the stretch colorizer; values outside of the labels range are black"""
+    colorVal = remapToColorRange(bandVals, minLabel, maxLabel, invert)
+    inRange = (bandVals >= float(minLabel)) & (bandVals <= float(maxLabel))
+    colorVal = np.where(inRange, colorVal, 0)
+    return packColors(colorVal, colorVal, colorVal)
+
+
+def rasterGreyscaleColors(
+    bandVals: np.ndarray,
+    valMin: Union[float, None] = None,
+    valMax: Union[float, None] = None,
+) -> np.ndarray:
+    """Greyscale colors remapped over the entire band range, computed once if not given"""
+    if valMin is None or valMax is None:
+        if np.isnan(bandVals).all():
+            return np.zeros(bandVals.shape, dtype=np.int64)
+        valMin = np.nanmin(bandVals)
+        valMax = np.nanmax(bandVals)
+    colorVal = remapToColorRange(bandVals, valMin, valMax)
+    return packColors(colorVal, colorVal, colorVal)
+
+
+def uniqueValueColorTable(
+    classes: List[Tuple[float, int]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted class values and their colors; the first class of a repeated value wins"""
+    table = {}
+    for value, color in classes:
+        if value not in table:
+            table[value] = color
+    values = np.array(sorted(table.keys()), dtype=np.float64)
+    colors = np.array([table[v] for v in values.tolist()], dtype=np.int64)
+    return values, colors
+
+
+def rasterUniqueValueColors(
+    bandVals: np.ndarray, classes: List[Tuple[float, int]]
+) -> np.ndarray:
+    """Colors of the unique value colorizer; unclassified values are black"""
+    values, colors = uniqueValueColorTable(classes)
+    if len(values) == 0:
+        return np.zeros(bandVals.shape, dtype=np.int64)
+
+    # binary search of every pixel value in the sorted class values
+    positions = np.searchsorted(values, bandVals)
+    positions = np.minimum(positions, len(values) - 1)
+    found = values[positions] == bandVals
+    return np.where(found, colors[positions], 0)
+
+
+def rasterRgbColors(
+    bands: List[Union[np.ndarray, None]],
+    valMins: List[Union[float, None]],
+    valMaxs: List[Union[float, None]],
+    cellCount: int,
+) -> np.ndarray:
+    """Colors of the RGB colorizer, each channel remapped over its band range"""
+    channels = []
+    for bandVals, valMin, valMax in zip(bands, valMins, valMaxs):
+        if bandVals is None or valMin is None or valMax is None:
+            channels.append(np.zeros(cellCount, dtype=np.int64))
+        else:
+            channels.append(remapToColorRange(bandVals, valMin, valMax))
+    return packColors(*channels)
+
+
+def rasterNoDataMask(
+    bands: List[np.ndarray], noDataVals: List[Any]
+) -> Union[np.ndarray, None]:
+    """Mask of the cells with a value in at least one of the bands; None if no cells are NoData"""
+    valid = None
+    for bandVals, noDataVal in zip(bands, noDataVals):
+        bandValid = ~np.isnan(bandVals)
+        if isinstance(noDataVal, (int, float)) and not math.isnan(noDataVal):
+            bandValid &= bandVals != noDataVal
+        valid = bandValid if valid is None else (valid | bandValid)
+    if valid is None or valid.all():
+        return None
+    return valid
+
+
+def rasterGridVertices(
+    x_min: float,
+    y_min: float,
+    res_x: float,
+    res_y: float,
+    width: int,
+    height: int,
+    validCells: Union[np.ndarray, None] = None,
+) -> np.ndarray:
+    """Flat vertex array with 4 corners per cell, rows (Y) outside and columns (X) inside"""
+    xs = x_min + np.arange(width + 1, dtype=np.float64) * res_x
+    ys = y_min + np.arange(height + 1, dtype=np.float64) * res_y
+
+    vertices = np.zeros((height, width, 4, 3), dtype=np.float64)
+    vertices[:, :, 0, 0] = xs[None, :-1]
+    vertices[:, :, 0, 1] = ys[:-1, None]
+    vertices[:, :, 1, 0] = xs[None, :-1]
+    vertices[:, :, 1, 1] = ys[1:, None]
+    vertices[:, :, 2, 0] = xs[None, 1:]
+    vertices[:, :, 2, 1] = ys[1:, None]
+    vertices[:, :, 3, 0] = xs[None, 1:]
+    vertices[:, :, 3, 1] = ys[:-1, None]
+    if validCells is not None:
+        return vertices.reshape(height * width, 12)[validCells].ravel()
+    return vertices.ravel()
+
+
+def rasterGridFaces(cellCount: int) -> np.ndarray:
+    """Flat face array with one quad [4, i, i+1, i+2, i+3] per cell"""
+    faces = np.empty((cellCount, 5), dtype=np.int64)
+    faces[:, 0] = 4
+    faces[:, 1:] = np.arange(cellCount * 4, dtype=np.int64).reshape(cellCount, 4)
+    return faces.ravel()
+
+
+def rasterGridColors(cellColors: np.ndarray) -> np.ndarray:
+    """Repeats each cell color for the 4 vertices of the cell"""
+    return np.repeat(np.asarray(cellColors, dtype=np.int64), 4)
+
+
+def rasterSharedGridVertices(
+    x_min: float, y_min: float, res_x: float, res_y: float, width: int, height: int
+) -> np.ndarray:
+    """Flat vertex array with one vertex per grid node, (width + 1) x (height + 1)"""
+    xs = x_min + np.arange(width + 1, dtype=np.float64) * res_x
+    ys = y_min + np.arange(height + 1, dtype=np.float64) * res_y
+
+    vertices = np.zeros((height + 1, width + 1, 3), dtype=np.float64)
+    vertices[:, :, 0] = xs[None, :]
+    vertices[:, :, 1] = ys[:, None]
+    return vertices.ravel()
+
+
+def rasterSharedGridFaces(width: int, height: int) -> np.ndarray:
+    """Flat face array with one quad per cell, indexing the shared grid nodes"""
+    nodes = np.arange((height + 1) * (width + 1), dtype=np.int64).reshape(
+        height + 1, width + 1
+    )
+    faces = np.empty((height, width, 5), dtype=np.int64)
+    faces[:, :, 0] = 4
+    faces[:, :, 1] = nodes[:-1, :-1]
+    faces[:, :, 2] = nodes[1:, :-1]
+    faces[:, :, 3] = nodes[1:, 1:]
+    faces[:, :, 4] = nodes[:-1, 1:]
+    return faces.ravel()
+
+
+def rasterSharedGridCull(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    colors: np.ndarray,
+    validCells: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Removes the faces of invalid cells and the grid nodes no longer used"""
+    cellNodes = faces.reshape(-1, 5)[validCells, 1:]
+    usedNodes, newIndices = np.unique(cellNodes, return_inverse=True)
+
+    newFaces = np.empty((cellNodes.shape[0], 5), dtype=np.int64)
+    newFaces[:, 0] = 4
+    newFaces[:, 1:] = newIndices.reshape(-1, 4)
+    return (
+        vertices.reshape(-1, 3)[usedNodes].ravel(),
+        newFaces.ravel(),
+        colors[usedNodes],
+    )
+
+
+def rasterSharedGridColors(cellColors: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Samples cell colors at the grid nodes; last row and column repeat the edge cells"""
+    cellColors = np.asarray(cellColors, dtype=np.int64).reshape(height, width)
+    rows = np.minimum(np.arange(height + 1), height - 1)
+    cols = np.minimum(np.arange(width + 1), width - 1)
+    return cellColors[rows[:, None], cols[None, :]].ravel()
+
+
+def rasterDownsampleFactor(width: int, height: int, cellBudget: Union[int, None]) -> int:
+    """Smallest block factor fitting the raster into the cell budget; no budget keeps full resolution"""
+    if cellBudget is None or cellBudget <= 0 or width * height <= cellBudget:
+        return 1
+    factor = max(1, math.ceil(math.sqrt(width * height / cellBudget)))
+    while math.ceil(width / factor) * math.ceil(height / factor) > cellBudget:
+        factor += 1
+    return factor
+
+
+def blockMode(blocks: np.ndarray) -> np.ndarray:
+    """Most frequent value of each row, ignoring NaN"""
+    values = np.sort(blocks, axis=-1)
+    k = values.shape[-1]
+    positions = np.arange(k)
+
+    # length of the run of equal values ending at each position
+    starts = np.ones(values.shape, dtype=bool)
+    starts[:, 1:] = values[:, 1:] != values[:, :-1]
+    runStarts = np.where(starts, positions, 0)
+    np.maximum.accumulate(runStarts, axis=1, out=runStarts)
+    runLengths = positions - runStarts + 1
+    runLengths[np.isnan(values)] = 0
+
+    return values[np.arange(values.shape[0]), runLengths.argmax(axis=1)]
+
+
+def rasterDownsample(
+    bandVals: np.ndarray,
+    width: int,
+    height: int,
+    factor: int,
+    method: str = "mean",
+    noDataVal: Union[float, None] = None,
+) -> Tuple[np.ndarray, int, int]:
+    """Downsamples the flat band array by a single block factor (one level, not a pyramid),
+    one row of blocks at a time"""
+    if factor <= 1:
+        return bandVals, width, height
+
+    newWidth = math.ceil(width / factor)
+    newHeight = math.ceil(height / factor)
+    grid = np.asarray(bandVals).reshape(height, width)
+    result = np.empty((newHeight, newWidth), dtype=np.float64)
+
+    for row in range(newHeight):
+        if method == "nearest":
+            result[row] = grid[row * factor, ::factor]
+            continue
+
+        # NaN-padded strip of blocks, NoData excluded from the statistics
+        strip = np.full((factor, newWidth * factor), np.nan, dtype=np.float64)
+        rows = grid[row * factor : (row + 1) * factor]
+        strip[: rows.shape[0], :width] = rows
+        if noDataVal is not None:
+            strip[strip == noDataVal] = np.nan
+        blocks = (
+            strip.reshape(factor, newWidth, factor)
+            .swapaxes(0, 1)
+            .reshape(newWidth, factor * factor)
+        )
+
+        if method == "mode":
+            result[row] = blockMode(blocks)
+        else:
+            valid = ~np.isnan(blocks)
+            counts = valid.sum(axis=1)
+            sums = np.where(valid, blocks, 0).sum(axis=1)
+            result[row] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    if noDataVal is not None:
+        result[np.isnan(result)] = noDataVal
+    return result.ravel(), newWidth, newHeight
+
+
+def rasterMergedRectangles(
+    cellColors: np.ndarray,
+    width: int,
+    height: int,
+    validCells: Union[np.ndarray, None] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Greedy run merging: cells of the same color are joined into horizontal runs per row,
+    and a run is extended down only while the next row has an identical run
+    (same start column, length and color). Not a minimal rectangle cover.
+    Returns rectangles as [row_start, col_start, row_end, col_end] (end exclusive) and their colors.
+    """
+    cellColors = np.asarray(cellColors, dtype=np.int64)
+    if validCells is None:
+        validCells = np.ones(width * height, dtype=bool)
+
+    # horizontal runs of the same color, not crossing the rows
+    change = np.ones(width * height, dtype=bool)
+    change[1:] = (cellColors[1:] != cellColors[:-1]) | (
+        validCells[1:] != validCells[:-1]
+    )
+    change[::width] = True
+    runStarts = np.flatnonzero(change)
+    runEnds = np.append(runStarts[1:], width * height)
+    keep = validCells[runStarts]
+    runStarts = runStarts[keep]
+    runEnds = runEnds[keep]
+
+    runRows = runStarts // width
+    runCols = runStarts % width
+    runLengths = runEnds - runStarts
+    runColors = cellColors[runStarts]
+    if runStarts.size == 0:
+        return np.zeros((0, 4), dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # identical runs in consecutive rows belong to the same rectangle
+    order = np.lexsort((runRows, runColors, runLengths, runCols))
+    rows = runRows[order]
+    sameRun = (
+        (runCols[order][1:] == runCols[order][:-1])
+        & (runLengths[order][1:] == runLengths[order][:-1])
+        & (runColors[order][1:] == runColors[order][:-1])
+        & (rows[1:] == rows[:-1] + 1)
+    )
+    rectStarts = np.flatnonzero(np.append(True, ~sameRun))
+    rectEnds = np.append(rectStarts[1:], rows.size) - 1
+    first = order[rectStarts]
+
+    rectangles = np.stack(
+        [
+            runRows[first],
+            runCols[first],
+            rows[rectEnds] + 1,
+            runCols[first] + runLengths[first],
+        ],
+        axis=1,
+    )
+    # keep the row-major order of the cells
+    rowMajor = np.argsort(runStarts[first], kind="stable")
+    return rectangles[rowMajor].astype(np.int64), runColors[first][rowMajor]
+
+
+def rasterMergedGridVertices(
+    x_min: float, y_min: float, res_x: float, res_y: float, rectangles: np.ndarray
+) -> np.ndarray:
+    """Flat vertex array with 4 corners per merged rectangle, same order as the cells"""
+    x0 = x_min + rectangles[:, 1] * res_x
+    x1 = x_min + rectangles[:, 3] * res_x
+    y0 = y_min + rectangles[:, 0] * res_y
+    y1 = y_min + rectangles[:, 2] * res_y
+
+    vertices = np.zeros((rectangles.shape[0], 4, 3), dtype=np.float64)
+    vertices[:, 0, 0] = x0
+    vertices[:, 0, 1] = y0
+    vertices[:, 1, 0] = x0
+    vertices[:, 1, 1] = y1
+    vertices[:, 2, 0] = x1
+    vertices[:, 2, 1] = y1
+    vertices[:, 3, 0] = x1
+    vertices[:, 3, 1] = y0
+    return vertices.ravel()
@@ -0,0 +1,144 @@
+"""
+Contains the bulk reprojection of feature coordinates, transforming many geometries in one call.
+"""
+
+import inspect
+from typing import Any, List, Tuple, Union
+
+import arcpy
+import numpy as np
+from osgeo import osr
+
+from speckle.speckle.converter.geometry.codec import (
+    GeometryArrays,
+    decodeWkb,
+    withCoords,
+)
+from speckle.speckle.converter.layers.utils import getConversionContext
+from speckle.speckle.utils.panel_logging import logToUser
+
+
+def osrFromArcpy(sr: arcpy.SpatialReference) -> Union[osr.SpatialReference, None]:
+    """Converts arcpy SpatialReference to osr SpatialReference (x, y axis order)"""
+    wkt = sr.exportToString().split(";")[0]
+    osrSr = osr.SpatialReference()
+    err = 1
+    try:
+        err = osrSr.ImportFromWkt(wkt)
+    except Exception:
+        pass
+    if err != 0:
+        try:
+            err = osrSr.ImportFromESRI([wkt])
+        except Exception:
+            return None
+        if err != 0:
+            return None
+    osrSr.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return osrSr
+
+
+def getBulkTransformation(
+    layer_sr: arcpy.SpatialReference, x_form: Tuple, dataStorage
+) -> Union[osr.CoordinateTransformation, None]:
+    """Returns osr transformation from the layer to the project CRS, cached for the send.
+    Returns None if an ArcGIS datum transformation is needed, so geometries should use projectAs.
+    """
+    try:
+        context = getConversionContext(dataStorage)
+        projectCRS = context["projectCRS"]
+        _, tr0, tr1, tr2, tr_custom = x_form
+        if layer_sr.name == projectCRS.name:
+            return None
+        if tr0 is not None or tr1 is not None or tr2 is not None:
+            return None
+        if tr_custom is not None:
+            return None
+        if layer_sr.GCS.name != projectCRS.GCS.name:
+            return None
+
+        cache = context["bulkTransforms"]
+        key = (layer_sr.name, projectCRS.name)
+        if key not in cache:
+            source = osrFromArcpy(layer_sr)
+            target = osrFromArcpy(projectCRS)
+            transformation = None
+            if source is not None and target is not None:
+                transformation = osr.CoordinateTransformation(source, target)
+            cache[key] = transformation
+        return cache[key]
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return None
+
+
+def reprojectCoordinates(
+    coords: np.ndarray, transformation: osr.CoordinateTransformation
+) -> np.ndarray:
+    """Transforms Nx3 array of coordinates in one call; NaN Z values stay NaN"""
+    coords = np.asarray(coords, dtype=float).reshape(-1, 3)
+    if len(coords) == 0:
+        return coords
+    noZ = np.isnan(coords[:, 2])
+    source = coords.copy()
+    source[noZ, 2] = 0
+    result = np.array(transformation.TransformPoints(source), dtype=float)
+    result = result.reshape(-1, 3)
+    result[noZ, 2] = np.nan
+    return result
+
+
+def geometryArrays(geom: Any) -> Union[GeometryArrays, None]:
+    """Returns the geometry as GeometryArrays (arcpy geometry decoded from its WKB),
+    or None if it is not supported
+    """
+    if geom is None or isinstance(geom, GeometryArrays):
+        return geom
+    if geom.type not in ["point", "multipoint", "polyline", "polygon"] or geom.hasCurves:
+        return None
+    try:
+        return decodeWkb(geom.WKB)
+    except Exception:
+        return None
+
+
+def canReprojectInBulk(
+    layer_sr: arcpy.SpatialReference, x_form: Tuple, dataStorage
+) -> bool:
+    """Whether features of the layer don't need arcpy projectAs to reach the project CRS"""
+    projectCRS = getConversionContext(dataStorage)["projectCRS"]
+    if layer_sr.name == projectCRS.name:
+        return True
+    return getBulkTransformation(layer_sr, x_form, dataStorage) is not None
+
+
+def reprojectGeometries(
+    geometries: List[Any], layer_sr: arcpy.SpatialReference, x_form: Tuple, dataStorage
+) -> List[Any]:
+    """Reprojects a chunk of arcpy geometries or GeometryArrays to the project CRS with one coordinate transform.
+    Returns a list of the same length with reprojected GeometryArrays, and None for geometries
+    that need per-feature projectAs (or are already in the project CRS).
+    """
+    result = [None for _ in geometries]
+    try:
+        transformation = getBulkTransformation(layer_sr, x_form, dataStorage)
+        if transformation is None:
+            return result
+        # one coordinate array for the whole chunk, transformed in a single call
+        arrays = [geometryArrays(geom) for geom in geometries]
+        coords = [geom.coords for geom in arrays if geom is not None]
+        if len(coords) == 0:
+            return result
+        projected = reprojectCoordinates(np.concatenate(coords), transformation)
+
+        start = 0
+        for n, geom in enumerate(arrays):
+            if geom is None:
+                continue
+            end = start + len(geom.coords)
+            result[n] = withCoords(geom, projected[start:end])
+            start = end
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return [None for _ in geometries]
+    return result
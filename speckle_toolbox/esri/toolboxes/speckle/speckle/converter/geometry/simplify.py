@@ -0,0 +1,198 @@
+"""
+Contains Douglas-Peucker simplification of polygon rings for display meshes, by tolerance and vertex budget.
+"""
+
+from typing import List
+
+import numpy as np
+
+RING_MIN_VERTICES = 3
+
+
+def segmentDistances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Distances of Nx2 points to the segment start-end"""
+    direction = end - start
+    lengthSq = float(np.dot(direction, direction))
+    if lengthSq == 0:
+        return np.hypot(points[:, 0] - start[0], points[:, 1] - start[1])
+    t = np.clip(((points - start) @ direction) / lengthSq, 0, 1)
+    closest = start + t[:, None] * direction
+    return np.hypot(points[:, 0] - closest[:, 0], points[:, 1] - closest[:, 1])
+
+
+def ringVertexImportance(coords: np.ndarray, tolerance: float = 0.0) -> np.ndarray:
+    """Douglas-Peucker importance of each vertex of a ring (not closed): the largest tolerance
+    at which the vertex is kept. Keeping vertices with importance > tolerance gives the
+    Douglas-Peucker result for that tolerance. Segments within the tolerance are not split
+    further, their vertices get importance 0.
+    """
+    xy = np.asarray(coords, dtype=float)[:, :2]
+    count = len(xy)
+    importance = np.zeros(count)
+    if count <= RING_MIN_VERTICES:
+        importance[:] = np.inf
+        return importance
+
+    # anchors: first vertex and the vertex farthest from it
+    far = int(np.argmax(np.hypot(xy[:, 0] - xy[0, 0], xy[:, 1] - xy[0, 1])))
+    importance[0] = importance[far] = np.inf
+    chain = np.concatenate((xy, xy[:1]))  # closed, to split the ring into two chains
+    stack = [(0, far, np.inf), (far, count, np.inf)]
+    while stack:
+        start, end, parent = stack.pop()
+        if end - start < 2:
+            continue
+        distances = segmentDistances(chain[start + 1 : end], chain[start], chain[end])
+        k = int(np.argmax(distances))
+        if distances[k] <= tolerance:
+            continue
+        split = start + 1 + k
+        value = min(float(distances[k]), parent)  # never above the parent split
+        importance[split] = value
+        stack.append((start, split, value))
+        stack.append((split, end, value))
+    return importance
+
+
+def orientation(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Sign of the turn a-b-c for each row: 1 counterclockwise, -1 clockwise, 0 collinear"""
+    return np.sign(
+        (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1])
+        - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    )
+
+
+def ringsCross(rings: List[np.ndarray], maxPairs: int = 1000000) -> bool:
+    """Whether any two edges of the rings (not closed) properly cross each other,
+    including edges of the same ring; edges meeting at a shared vertex don't count.
+    Sweeps the edges sorted by min X, testing only the pairs with overlapping X ranges.
+    """
+    rings = [np.asarray(ring, dtype=float)[:, :2] for ring in rings if len(ring) >= 3]
+    if len(rings) == 0:
+        return False
+    starts = np.concatenate(rings)
+    ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+    ringIds = np.concatenate([np.full(len(ring), k) for k, ring in enumerate(rings)])
+    positions = np.concatenate([np.arange(len(ring)) for ring in rings])
+    lengths = np.array([len(ring) for ring in rings])[ringIds]
+
+    minXY = np.minimum(starts, ends)
+    maxXY = np.maximum(starts, ends)
+    order = np.argsort(minXY[:, 0], kind="stable")
+    sortedMinX = minXY[order, 0]
+    # edges after each edge (in the sweep order) starting within its X range
+    counts = np.searchsorted(sortedMinX, maxXY[order, 0], side="right") - np.arange(
+        1, len(order) + 1
+    )
+    counts = np.maximum(counts, 0)
+
+    first = 0
+    while first < len(order):
+        # limit the candidate pairs held in memory at once
+        cumulative = np.cumsum(counts[first:])
+        last = first + max(1, int(np.searchsorted(cumulative, maxPairs, side="right")))
+        blockCounts = counts[first:last]
+        i = np.repeat(np.arange(first, last), blockCounts)
+        j = (
+            i
+            + 1
+            + np.arange(len(i))
+            - np.repeat(np.cumsum(blockCounts) - blockCounts, blockCounts)
+        )
+        first = last
+        if len(i) == 0:
+            continue
+        i, j = order[i], order[j]
+
+        step = (positions[j] - positions[i]) % lengths[i]
+        adjacent = (ringIds[i] == ringIds[j]) & ((step == 1) | (step == lengths[i] - 1))
+        overlapY = (minXY[i, 1] <= maxXY[j, 1]) & (minXY[j, 1] <= maxXY[i, 1])
+        keep = overlapY & ~adjacent
+        i, j = i[keep], j[keep]
+        p1, q1, p2, q2 = starts[i], ends[i], starts[j], ends[j]
+        crossing = (orientation(p1, q1, p2) * orientation(p1, q1, q2) < 0) & (
+            orientation(p2, q2, p1) * orientation(p2, q2, q1) < 0
+        )
+        if crossing.any():
+            return True
+    return False
+
+
+def pointInRing(point: np.ndarray, ring: np.ndarray) -> bool:
+    """Even-odd test of the point against the ring (not closed)"""
+    x, y = float(point[0]), float(point[1])
+    xs = ring[:, 0]
+    ys = ring[:, 1]
+    xn = np.roll(xs, -1)
+    yn = np.roll(ys, -1)
+    spans = (ys > y) != (yn > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossX = xs + (y - ys) * (xn - xs) / (yn - ys)
+    return bool(np.count_nonzero(spans & (x < crossX)) % 2)
+
+
+def ringsTopologyValid(rings: List[np.ndarray]) -> bool:
+    """Whether the rings (exterior first) don't cross, and every hole is inside the exterior
+    ring and outside of the other holes
+    """
+    if ringsCross(rings):
+        return False
+    exterior = rings[0]
+    for n, hole in enumerate(rings[1:], 1):
+        point = hole[0]
+        if not pointInRing(point, exterior):
+            return False
+        for m, other in enumerate(rings[1:], 1):
+            if m != n and pointInRing(point, other):
+                return False
+    return True
+
+
+def simplifyPolygonRings(
+    rings: List[np.ndarray], tolerance: float = 0.0, vertexBudget: int = None
+) -> List[np.ndarray]:
+    """Simplifies rings of a polygon (exterior first, not closed): drops vertices within the tolerance
+    (map units), then keeps the most important ones within the vertex budget of the whole polygon.
+    Exterior ring keeps at least 3 vertices; holes reduced below 3 vertices are dropped.
+    Falls back to the unsimplified rings if the simplified ones are not topologically valid.
+    """
+    rings = [np.asarray(ring, dtype=float) for ring in rings]
+    if len(rings) == 0 or len(rings[0]) < RING_MIN_VERTICES:
+        return []
+    if tolerance is None:
+        tolerance = 0.0
+    total = sum(len(ring) for ring in rings)
+    if tolerance <= 0 and (vertexBudget is None or total <= vertexBudget):
+        return [ring for ring in rings if len(ring) >= RING_MIN_VERTICES]
+    importances = [ringVertexImportance(ring, tolerance) for ring in rings]
+
+    keep = [imp > tolerance for imp in importances]
+    # always keep the ring anchors (infinite importance) of the exterior ring
+    keep[0] |= np.isinf(importances[0])
+
+    total = sum(int(k.sum()) for k in keep)
+    if vertexBudget is not None and vertexBudget > 0 and total > vertexBudget:
+        allImportance = np.concatenate(
+            [np.where(k, imp, -1.0) for k, imp in zip(keep, importances)]
+        )
+        threshold = np.sort(allImportance)[::-1][
+            max(vertexBudget, RING_MIN_VERTICES) - 1
+        ]
+        keep = [k & (imp >= threshold) for k, imp in zip(keep, importances)]
+        keep[0] |= np.isinf(importances[0])
+
+    result = []
+    for n, (ring, k) in enumerate(zip(rings, keep)):
+        if n == 0 and k.sum() < RING_MIN_VERTICES:
+            # keep the 3 most important vertices, in ring order
+            k = np.zeros(len(ring), dtype=bool)
+            k[np.argsort(-importances[0], kind="stable")[:RING_MIN_VERTICES]] = True
+        if k.sum() < RING_MIN_VERTICES:
+            continue
+        result.append(ring[k])
+
+    # rings are simplified independently: if they now cross, or a hole moved out of
+    # the exterior ring or into another hole, the unsimplified rings are used
+    if not ringsTopologyValid(result):
+        return [ring for ring in rings if len(ring) >= RING_MIN_VERTICES]
+    return result
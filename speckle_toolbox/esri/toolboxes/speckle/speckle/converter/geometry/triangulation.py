@@ -0,0 +1,637 @@
+"""
+Contains polygon triangulation (ear clipping with hole elimination and z-order hashing, after
+the earcut algorithm), producing display mesh faces for many polygons per call. Pure Python/NumPy.
+"""
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+EARCUT_HASH_MIN_VERTICES = 80  # use z-order hashing for larger polygons
+
+
+class _Node:
+    __slots__ = ("i", "x", "y", "prev", "next", "z", "prevZ", "nextZ", "steiner")
+
+    def __init__(self, i: int, x: float, y: float):
+        self.i = i  # vertex index
+        self.x = x
+        self.y = y
+        self.prev = None
+        self.next = None
+        self.z = 0  # z-order curve value
+        self.prevZ = None
+        self.nextZ = None
+        self.steiner = False
+
+
+def earcut(data: List[float], holeIndices: List[int] = None, dim: int = 2) -> List[int]:
+    """Triangulates a polygon given as flat vertex coordinates, holes starting at holeIndices.
+    Returns vertex indices, 3 per triangle.
+    """
+    hasHoles = holeIndices is not None and len(holeIndices) > 0
+    outerLen = holeIndices[0] * dim if hasHoles else len(data)
+    outerNode = _linkedList(data, 0, outerLen, dim, True)
+    triangles = []
+
+    if outerNode is None or outerNode.next is outerNode.prev:
+        return triangles
+    if hasHoles:
+        outerNode = _eliminateHoles(data, holeIndices, outerNode, dim)
+
+    minX = minY = invSize = 0
+    if len(data) > EARCUT_HASH_MIN_VERTICES * dim:
+        xs = data[0:outerLen:dim]
+        ys = data[1:outerLen:dim]
+        minX, minY = min(xs), min(ys)
+        invSize = max(max(xs) - minX, max(ys) - minY)
+        invSize = 32767 / invSize if invSize != 0 else 0
+
+    _earcutLinked(outerNode, triangles, dim, minX, minY, invSize, 0)
+    return triangles
+
+
+def _linkedList(data, start: int, end: int, dim: int, clockwise: bool):
+    """Creates circular doubly linked list of the ring vertices in the given winding order"""
+    last = None
+    if clockwise == (_signedArea(data, start, end, dim) > 0):
+        for i in range(start, end, dim):
+            last = _insertNode(i, data[i], data[i + 1], last)
+    else:
+        for i in range(end - dim, start - 1, -dim):
+            last = _insertNode(i, data[i], data[i + 1], last)
+
+    if last is not None and _equals(last, last.next):
+        _removeNode(last)
+        last = last.next
+    return last
+
+
+def _filterPoints(start, end=None):
+    """Removes duplicate and collinear vertices"""
+    if start is None:
+        return start
+    if end is None:
+        end = start
+
+    p = start
+    while True:
+        again = False
+        if not p.steiner and (_equals(p, p.next) or _area(p.prev, p, p.next) == 0):
+            _removeNode(p)
+            p = end = p.prev
+            if p is p.next:
+                break
+            again = True
+        else:
+            p = p.next
+        if not again and p is end:
+            break
+    return end
+
+
+def _earcutLinked(ear, triangles, dim, minX, minY, invSize, stage: int):
+    """Cuts off ears one by one; on failure cleans up the polygon, cures intersections, then splits"""
+    if ear is None:
+        return
+    if stage == 0 and invSize:
+        _indexCurve(ear, minX, minY, invSize)
+
+    stop = ear
+    while ear.prev is not ear.next:
+        prev = ear.prev
+        nxt = ear.next
+
+        if _isEarHashed(ear, minX, minY, invSize) if invSize else _isEar(ear):
+            triangles.append(prev.i // dim)
+            triangles.append(ear.i // dim)
+            triangles.append(nxt.i // dim)
+            _removeNode(ear)
+            # skipping the next vertex leads to less sliver triangles
+            ear = nxt.next
+            stop = nxt.next
+            continue
+
+        ear = nxt
+        if ear is stop:
+            if stage == 0:
+                _earcutLinked(
+                    _filterPoints(ear), triangles, dim, minX, minY, invSize, 1
+                )
+            elif stage == 1:
+                ear = _cureLocalIntersections(_filterPoints(ear), triangles, dim)
+                _earcutLinked(ear, triangles, dim, minX, minY, invSize, 2)
+            elif stage == 2:
+                _splitEarcut(ear, triangles, dim, minX, minY, invSize)
+            break
+
+
+def _isEar(ear) -> bool:
+    a = ear.prev
+    b = ear
+    c = ear.next
+    if _area(a, b, c) >= 0:
+        return False  # reflex
+
+    ax, bx, cx, ay, by, cy = a.x, b.x, c.x, a.y, b.y, c.y
+    x0, y0 = min(ax, bx, cx), min(ay, by, cy)
+    x1, y1 = max(ax, bx, cx), max(ay, by, cy)
+
+    p = c.next
+    while p is not a:
+        if (
+            x0 <= p.x <= x1
+            and y0 <= p.y <= y1
+            and _pointInTriangle(ax, ay, bx, by, cx, cy, p.x, p.y)
+            and _area(p.prev, p, p.next) >= 0
+        ):
+            return False
+        p = p.next
+    return True
+
+
+def _isEarHashed(ear, minX, minY, invSize) -> bool:
+    a = ear.prev
+    b = ear
+    c = ear.next
+    if _area(a, b, c) >= 0:
+        return False  # reflex
+
+    ax, bx, cx, ay, by, cy = a.x, b.x, c.x, a.y, b.y, c.y
+    x0, y0 = min(ax, bx, cx), min(ay, by, cy)
+    x1, y1 = max(ax, bx, cx), max(ay, by, cy)
+
+    minZ = _zOrder(x0, y0, minX, minY, invSize)
+    maxZ = _zOrder(x1, y1, minX, minY, invSize)
+
+    def blocks(p) -> bool:
+        return (
+            x0 <= p.x <= x1
+            and y0 <= p.y <= y1
+            and p is not a
+            and p is not c
+            and _pointInTriangle(ax, ay, bx, by, cx, cy, p.x, p.y)
+            and _area(p.prev, p, p.next) >= 0
+        )
+
+    p = ear.prevZ
+    n = ear.nextZ
+    # look for points inside the triangle in both directions of the z-order curve
+    while p is not None and p.z >= minZ and n is not None and n.z <= maxZ:
+        if blocks(p):
+            return False
+        p = p.prevZ
+        if blocks(n):
+            return False
+        n = n.nextZ
+    while p is not None and p.z >= minZ:
+        if blocks(p):
+            return False
+        p = p.prevZ
+    while n is not None and n.z <= maxZ:
+        if blocks(n):
+            return False
+        n = n.nextZ
+    return True
+
+
+def _cureLocalIntersections(start, triangles, dim):
+    p = start
+    while True:
+        a = p.prev
+        b = p.next.next
+        if (
+            not _equals(a, b)
+            and _intersects(a, p, p.next, b)
+            and _locallyInside(a, b)
+            and _locallyInside(b, a)
+        ):
+            triangles.append(a.i // dim)
+            triangles.append(p.i // dim)
+            triangles.append(b.i // dim)
+            _removeNode(p)
+            _removeNode(p.next)
+            p = start = b
+        p = p.next
+        if p is start:
+            break
+    return _filterPoints(p)
+
+
+def _splitEarcut(start, triangles, dim, minX, minY, invSize):
+    """Splits the polygon by a valid diagonal and triangulates both halves"""
+    a = start
+    while True:
+        b = a.next.next
+        while b is not a.prev:
+            if a.i != b.i and _isValidDiagonal(a, b):
+                c = _splitPolygon(a, b)
+                a = _filterPoints(a, a.next)
+                c = _filterPoints(c, c.next)
+                _earcutLinked(a, triangles, dim, minX, minY, invSize, 0)
+                _earcutLinked(c, triangles, dim, minX, minY, invSize, 0)
+                return
+            b = b.next
+        a = a.next
+        if a is start:
+            break
+
+
+def _eliminateHoles(data, holeIndices, outerNode, dim):
+    """Links every hole into the outer loop, producing a single-ring polygon without holes"""
+    queue = []
+    for k, index in enumerate(holeIndices):
+        start = index * dim
+        end = holeIndices[k + 1] * dim if k < len(holeIndices) - 1 else len(data)
+        ring = _linkedList(data, start, end, dim, False)
+        if ring is None:
+            continue
+        if ring is ring.next:
+            ring.steiner = True
+        queue.append(_getLeftmost(ring))
+
+    queue.sort(key=lambda node: node.x)
+    for hole in queue:
+        outerNode = _eliminateHole(hole, outerNode)
+    return outerNode
+
+
+def _eliminateHole(hole, outerNode):
+    bridge = _findHoleBridge(hole, outerNode)
+    if bridge is None:
+        return outerNode
+    bridgeReverse = _splitPolygon(bridge, hole)
+    _filterPoints(bridgeReverse, bridgeReverse.next)
+    return _filterPoints(bridge, bridge.next)
+
+
+def _findHoleBridge(hole, outerNode):
+    """Finds a vertex of the outer ring visible from the leftmost vertex of the hole"""
+    p = outerNode
+    hx = hole.x
+    hy = hole.y
+    qx = -math.inf
+    m = None
+
+    # find a segment intersected by a ray from the hole's leftmost point to the left
+    while True:
+        if hy <= p.y and hy >= p.next.y and p.next.y != p.y:
+            x = p.x + (hy - p.y) * (p.next.x - p.x) / (p.next.y - p.y)
+            if x <= hx and x > qx:
+                qx = x
+                m = p if p.x < p.next.x else p.next
+                if x == hx:
+                    return m  # hole touches outer segment
+        p = p.next
+        if p is outerNode:
+            break
+    if m is None:
+        return None
+
+    # look for points inside the triangle of hole point, segment intersection and endpoint
+    stop = m
+    mx = m.x
+    my = m.y
+    tanMin = math.inf
+    p = m
+    while True:
+        if (
+            hx >= p.x >= mx
+            and hx != p.x
+            and _pointInTriangle(
+                hx if hy < my else qx, hy, mx, my, qx if hy < my else hx, hy, p.x, p.y
+            )
+        ):
+            tan = abs(hy - p.y) / (hx - p.x)
+            if _locallyInside(p, hole) and (
+                tan < tanMin
+                or (
+                    tan == tanMin
+                    and (p.x > m.x or (p.x == m.x and _sectorContainsSector(m, p)))
+                )
+            ):
+                m = p
+                tanMin = tan
+        p = p.next
+        if p is stop:
+            break
+    return m
+
+
+def _sectorContainsSector(m, p) -> bool:
+    return _area(m.prev, m, p.prev) < 0 and _area(p.next, m, m.next) < 0
+
+
+def _indexCurve(start, minX, minY, invSize):
+    p = start
+    while True:
+        if p.z == 0:
+            p.z = _zOrder(p.x, p.y, minX, minY, invSize)
+        p.prevZ = p.prev
+        p.nextZ = p.next
+        p = p.next
+        if p is start:
+            break
+    p.prevZ.nextZ = None
+    p.prevZ = None
+    _sortLinked(p)
+
+
+def _sortLinked(first):
+    """Merge sort of the linked list by z-order"""
+    inSize = 1
+    while True:
+        p = first
+        first = None
+        tail = None
+        numMerges = 0
+
+        while p is not None:
+            numMerges += 1
+            q = p
+            pSize = 0
+            for _ in range(inSize):
+                pSize += 1
+                q = q.nextZ
+                if q is None:
+                    break
+            qSize = inSize
+
+            while pSize > 0 or (qSize > 0 and q is not None):
+                if pSize != 0 and (qSize == 0 or q is None or p.z <= q.z):
+                    e = p
+                    p = p.nextZ
+                    pSize -= 1
+                else:
+                    e = q
+                    q = q.nextZ
+                    qSize -= 1
+                if tail is not None:
+                    tail.nextZ = e
+                else:
+                    first = e
+                e.prevZ = tail
+                tail = e
+            p = q
+
+        tail.nextZ = None
+        inSize *= 2
+        if numMerges <= 1:
+            return first
+
+
+def _zOrder(x, y, minX, minY, invSize) -> int:
+    """z-order of a point, from coordinates scaled to 15-bit integers"""
+    x = int((x - minX) * invSize)
+    y = int((y - minY) * invSize)
+
+    x = (x | (x << 8)) & 0x00FF00FF
+    x = (x | (x << 4)) & 0x0F0F0F0F
+    x = (x | (x << 2)) & 0x33333333
+    x = (x | (x << 1)) & 0x55555555
+
+    y = (y | (y << 8)) & 0x00FF00FF
+    y = (y | (y << 4)) & 0x0F0F0F0F
+    y = (y | (y << 2)) & 0x33333333
+    y = (y | (y << 1)) & 0x55555555
+    return x | (y << 1)
+
+
+def _getLeftmost(start):
+    p = start
+    leftmost = start
+    while True:
+        if p.x < leftmost.x or (p.x == leftmost.x and p.y < leftmost.y):
+            leftmost = p
+        p = p.next
+        if p is start:
+            break
+    return leftmost
+
+
+def _pointInTriangle(ax, ay, bx, by, cx, cy, px, py) -> bool:
+    return (
+        (cx - px) * (ay - py) >= (ax - px) * (cy - py)
+        and (ax - px) * (by - py) >= (bx - px) * (ay - py)
+        and (bx - px) * (cy - py) >= (cx - px) * (by - py)
+    )
+
+
+def _isValidDiagonal(a, b) -> bool:
+    return (
+        a.next.i != b.i
+        and a.prev.i != b.i
+        and not _intersectsPolygon(a, b)
+        and (
+            (
+                _locallyInside(a, b)
+                and _locallyInside(b, a)
+                and _middleInside(a, b)
+                and (_area(a.prev, a, b.prev) != 0 or _area(a, b.prev, b) != 0)
+            )
+            or (
+                _equals(a, b)
+                and _area(a.prev, a, a.next) > 0
+                and _area(b.prev, b, b.next) > 0
+            )
+        )
+    )
+
+
+def _area(p, q, r) -> float:
+    return (q.y - p.y) * (r.x - q.x) - (q.x - p.x) * (r.y - q.y)
+
+
+def _equals(p1, p2) -> bool:
+    return p1.x == p2.x and p1.y == p2.y
+
+
+def _sign(num: float) -> int:
+    return 1 if num > 0 else (-1 if num < 0 else 0)
+
+
+def _onSegment(p, q, r) -> bool:
+    return (
+        min(p.x, r.x) <= q.x <= max(p.x, r.x) and min(p.y, r.y) <= q.y <= max(p.y, r.y)
+    )
+
+
+def _intersects(p1, q1, p2, q2) -> bool:
+    o1 = _sign(_area(p1, q1, p2))
+    o2 = _sign(_area(p1, q1, q2))
+    o3 = _sign(_area(p2, q2, p1))
+    o4 = _sign(_area(p2, q2, q1))
+
+    if o1 != o2 and o3 != o4:
+        return True
+    if o1 == 0 and _onSegment(p1, p2, q1):
+        return True
+    if o2 == 0 and _onSegment(p1, q2, q1):
+        return True
+    if o3 == 0 and _onSegment(p2, p1, q2):
+        return True
+    if o4 == 0 and _onSegment(p2, q1, q2):
+        return True
+    return False
+
+
+def _intersectsPolygon(a, b) -> bool:
+    p = a
+    while True:
+        if (
+            p.i != a.i
+            and p.next.i != a.i
+            and p.i != b.i
+            and p.next.i != b.i
+            and _intersects(p, p.next, a, b)
+        ):
+            return True
+        p = p.next
+        if p is a:
+            break
+    return False
+
+
+def _locallyInside(a, b) -> bool:
+    if _area(a.prev, a, a.next) < 0:
+        return _area(a, b, a.next) >= 0 and _area(a, a.prev, b) >= 0
+    return _area(a, b, a.prev) < 0 or _area(a, a.next, b) < 0
+
+
+def _middleInside(a, b) -> bool:
+    p = a
+    inside = False
+    px = (a.x + b.x) / 2
+    py = (a.y + b.y) / 2
+    while True:
+        if (
+            (p.y > py) != (p.next.y > py)
+            and p.next.y != p.y
+            and px < (p.next.x - p.x) * (py - p.y) / (p.next.y - p.y) + p.x
+        ):
+            inside = not inside
+        p = p.next
+        if p is a:
+            break
+    return inside
+
+
+def _splitPolygon(a, b):
+    """Links a and b with a diagonal, splitting the ring in two; returns the new b copy"""
+    a2 = _Node(a.i, a.x, a.y)
+    b2 = _Node(b.i, b.x, b.y)
+    an = a.next
+    bp = b.prev
+
+    a.next = b
+    b.prev = a
+    a2.next = an
+    an.prev = a2
+    b2.next = a2
+    a2.prev = b2
+    bp.next = b2
+    b2.prev = bp
+    return b2
+
+
+def _insertNode(i: int, x: float, y: float, last):
+    p = _Node(i, x, y)
+    if last is None:
+        p.prev = p
+        p.next = p
+    else:
+        p.next = last.next
+        p.prev = last
+        last.next.prev = p
+        last.next = p
+    return p
+
+
+def _removeNode(p):
+    p.next.prev = p.prev
+    p.prev.next = p.next
+    if p.prevZ is not None:
+        p.prevZ.nextZ = p.nextZ
+    if p.nextZ is not None:
+        p.nextZ.prevZ = p.prevZ
+
+
+def _signedArea(data, start: int, end: int, dim: int) -> float:
+    total = 0.0
+    j = end - dim
+    for i in range(start, end, dim):
+        total += (data[j] - data[i]) * (data[i + 1] + data[j + 1])
+        j = i
+    return total
+
+
+def triangulatePolygon(rings: List[np.ndarray]) -> np.ndarray:
+    """Triangulates one polygon given as rings (Nx2 or Nx3 arrays, exterior first, not closed).
+    Returns Mx3 array of indices into the concatenated rings.
+    """
+    rings = [ring for ring in rings if len(ring) > 0]
+    if len(rings) == 0 or len(rings[0]) < 3:
+        return np.zeros((0, 3), dtype=np.int64)
+    coords = np.concatenate([np.asarray(ring, dtype=float)[:, :2] for ring in rings])
+    holeIndices = np.cumsum([len(ring) for ring in rings])[:-1].tolist()
+    triangles = earcut(coords.ravel().tolist(), holeIndices, 2)
+    return np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+
+def triangulatePolygonsParts(
+    polygons: List[List[np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Triangulates many polygons (lists of Nx3 rings, exterior first, not closed) in one pass.
+    Returns flat vertices, flat Speckle faces ([3, a, b, c, ...], indices into all the vertices),
+    and the offsets of each polygon in vertices (in points) and faces (in triangles), plus the totals.
+    Polygons which can't be triangulated get empty ranges; NaN Z values are set to 0.
+    """
+    vertexArrays = []
+    faceArrays = []
+    vertexOffsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    faceOffsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    offset = 0
+    triangleCount = 0
+    for k, rings in enumerate(polygons):
+        rings = [np.asarray(ring, dtype=float).reshape(len(ring), -1) for ring in rings]
+        rings = [ring for ring in rings if len(ring) >= 3]
+        triangles = triangulatePolygon(rings)
+        if len(triangles) > 0:
+            coords = np.concatenate(rings)
+            if coords.shape[1] < 3:
+                coords = np.column_stack((coords[:, :2], np.zeros(len(coords))))
+            coords = coords[:, :3].copy()
+            coords[np.isnan(coords[:, 2]), 2] = 0
+
+            faces = np.empty((len(triangles), 4), dtype=np.int64)
+            faces[:, 0] = 3
+            faces[:, 1:] = triangles + offset
+            vertexArrays.append(coords.ravel())
+            faceArrays.append(faces.ravel())
+            offset += len(coords)
+            triangleCount += len(triangles)
+        vertexOffsets[k + 1] = offset
+        faceOffsets[k + 1] = triangleCount
+
+    if len(vertexArrays) == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64), vertexOffsets, faceOffsets
+    return (
+        np.concatenate(vertexArrays),
+        np.concatenate(faceArrays),
+        vertexOffsets,
+        faceOffsets,
+    )
+
+
+def triangulatePolygons(
+    polygons: List[List[np.ndarray]], vertexOffset: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Triangulates many polygons (lists of Nx3 rings, exterior first, not closed) into one mesh.
+    Returns flat vertices and flat Speckle faces ([3, a, b, c, ...]), indices starting from vertexOffset.
+    Polygons which can't be triangulated are skipped; NaN Z values are set to 0.
+    """
+    vertices, faces, _, _ = triangulatePolygonsParts(polygons)
+    if vertexOffset != 0 and len(faces) > 0:
+        faces.reshape(-1, 4)[:, 1:] += vertexOffset
+    return vertices, faces
@@ -1,4 +1,6 @@
+import json
 import math
+from functools import lru_cache
 from math import cos, sin, atan
 import numpy as np
 from specklepy.objects.geometry import (
@@ -42,6 +44,68 @@ def addCorrectUnits(geom: Base, dataStorage) -> Base:
     return geom
 
 
+def validOffset(offset) -> bool:
+    return offset is not None and isinstance(offset, float)
+
+
+def validRotation(rotation) -> bool:
+    return (
+        rotation is not None
+        and (isinstance(rotation, float) or isinstance(rotation, int))
+        and -360 < rotation < 360
+    )
+
+
+@lru_cache(maxsize=64)
+def affineMatrix(offset_x: float, offset_y: float, rotation: float) -> np.ndarray:
+    """Returns 3x3 affine matrix of CRS offsets and rotation (degrees) applied on Send:
+    shift by -offsets, then rotate clockwise.
+    Cached, so the returned array should not be modified.
+    """
+    a = rotation * math.pi / 180
+    c = math.cos(a)
+    s = math.sin(a)
+    return np.array(
+        [
+            [c, s, -(c * offset_x + s * offset_y)],
+            [-s, c, -(-s * offset_x + c * offset_y)],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+
+
+def sendAffineMatrix(dataStorage) -> np.ndarray:
+    """Affine matrix of the project offsets and rotation, applied on Send"""
+    offset_x = dataStorage.crs_offset_x
+    offset_y = dataStorage.crs_offset_y
+    rotation = dataStorage.crs_rotation
+    return affineMatrix(
+        offset_x if validOffset(offset_x) else 0.0,
+        offset_y if validOffset(offset_y) else 0.0,
+        float(rotation) if validRotation(rotation) else 0.0,
+    )
+
+
+def applyAffine(coords, matrix: np.ndarray) -> np.ndarray:
+    """Applies 3x3 affine matrix to X, Y columns of Nx2 or Nx3 coordinates, returns a new array"""
+    coords = np.array(coords, dtype=float)
+    if coords.size == 0:
+        return coords
+    coords = coords.reshape(len(coords), -1)
+    xy = coords[:, :2]
+    coords[:, :2] = xy @ matrix[:2, :2].T + matrix[:2, 2]
+    return coords
+
+
+def apply_coords_offsets_rotation_on_send(coords, dataStorage) -> np.ndarray:
+    """Array version of apply_pt_offsets_rotation_on_send"""
+    try:
+        return applyAffine(coords, sendAffineMatrix(dataStorage))
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return np.array(coords, dtype=float)
+
+
 def apply_pt_offsets_rotation_on_send(
     x: float, y: float, dataStorage
 ) -> Tuple[float, float]:  # on Send
@@ -148,6 +212,63 @@ def transform_speckle_pt_on_receive(pt_original: Point, dataStorage) -> Point:
     return pt
 
 
+@lru_cache(maxsize=64)
+def inverseAffineMatrix(
+    offset_x: float, offset_y: float, rotation: float
+) -> np.ndarray:
+    """Returns 3x3 affine matrix of CRS offsets and rotation (degrees) applied on Receive,
+    inverse of affineMatrix: rotate counterclockwise, then shift by +offsets.
+    Cached, so the returned array should not be modified.
+    """
+    a = rotation * math.pi / 180
+    c = math.cos(a)
+    s = math.sin(a)
+    return np.array(
+        [
+            [c, -s, offset_x],
+            [s, c, offset_y],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+
+
+def receiveAffineMatrix(dataStorage) -> np.ndarray:
+    """Affine matrix of transform_speckle_pt_on_receive: project offsets and rotation
+    for data from non-GIS applications, offsets and rotation of the layer for GIS data
+    """
+    gisLayer = None
+    try:
+        gisLayer = dataStorage.latestHostApp.lower().endswith("gis")
+    except Exception:
+        pass
+
+    if gisLayer is True:
+        offset_x = getattr(dataStorage, "current_layer_crs_offset_x", None)
+        offset_y = getattr(dataStorage, "current_layer_crs_offset_y", None)
+        rotation = getattr(dataStorage, "current_layer_crs_rotation", None)
+        if not isinstance(rotation, float):
+            rotation = None
+    else:
+        offset_x = dataStorage.crs_offset_x
+        offset_y = dataStorage.crs_offset_y
+        rotation = dataStorage.crs_rotation
+
+    if not (validOffset(offset_x) and validOffset(offset_y)):
+        offset_x = offset_y = 0.0
+    return inverseAffineMatrix(
+        offset_x, offset_y, float(rotation) if validRotation(rotation) else 0.0
+    )
+
+
+def transform_speckle_coords_on_receive(coords, dataStorage) -> np.ndarray:
+    """Array version of transform_speckle_pt_on_receive"""
+    try:
+        return applyAffine(coords, receiveAffineMatrix(dataStorage))
+    except Exception as e:
+        logToUser(e, level=2, func=inspect.stack()[0][3])
+        return np.array(coords, dtype=float)
+
+
 def apply_pt_transform_matrix(pt_coords: List, dataStorage) -> List:
     try:
         if dataStorage.matrix is not None:
@@ -163,6 +284,56 @@ def apply_pt_transform_matrix(pt_coords: List, dataStorage) -> List:
     return pt_coords
 
 
+def apply_transform_matrix(vertices: np.ndarray, dataStorage) -> np.ndarray:
+    """Same as apply_pt_transform_matrix for Nx3 vertices, in one matrix multiply"""
+    matrix = getattr(dataStorage, "matrix", None)
+    if matrix is None:
+        return vertices
+    try:
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.shape != (4, 4):
+            return vertices
+        # row vectors [x, y, z, 1] * matrix
+        return vertices @ matrix[:3, :3] + matrix[3, :3]
+    except Exception as e:
+        pass
+    return vertices
+
+
+def geometryPartsToArrays(geom) -> List[np.ndarray]:
+    """Returns vertices of each part of arcpy geometry as Nx3 arrays, read from one JSON export.
+    Missing Z values are set to 0, same as in pointToSpeckle.
+    """
+    geomJson = json.loads(geom.JSON)
+    hasZ = geomJson.get("hasZ", False)
+    if "x" in geomJson:
+        parts = [[[geomJson["x"], geomJson["y"], geomJson.get("z")]]]
+        hasZ = "z" in geomJson
+    else:
+        parts = (
+            geomJson.get("paths") or geomJson.get("rings") or [geomJson.get("points")]
+        )
+
+    arrays = []
+    for part in parts:
+        if not part:
+            continue
+        coords = np.array(part, dtype=float)
+        if hasZ:
+            coords = coords[:, :3]
+        else:
+            coords = np.column_stack((coords[:, :2], np.zeros(len(coords))))
+        arrays.append(coords)
+    return arrays
+
+
+def specklePointsToCoords(points: List[Point]) -> np.ndarray:
+    """Returns Nx3 array of Speckle Points coordinates"""
+    if len(points) == 0:
+        return np.zeros((0, 3))
+    return np.array([[pt.x, pt.y, pt.z] for pt in points], dtype=float)
+
+
 def speckleBoundaryToSpecklePts(
     boundary: Union[None, Polyline, Arc, Line, Polycurve]
 ) -> List[Point]:
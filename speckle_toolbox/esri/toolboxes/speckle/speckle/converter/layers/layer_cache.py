@@ -0,0 +1,181 @@
+"""
+Contains the session cache of converted layers, reused when unchanged layers are sent again
+(e.g. to another branch or stream).
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import inspect
+import json
+import os
+from typing import Any, List, Tuple, Union
+
+from specklepy.objects import Base
+
+from speckle.speckle.converter.layers.symbology import jsonFromLayerStyle
+from speckle.speckle.converter.layers.utils import getConversionContext
+from speckle.speckle.plugin_utils.helpers import findOrCreatePath
+from speckle.speckle.utils.panel_logging import logToUser
+
+LAYER_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+class LayerCache:
+    """Converted layers by layer cache key, least recently used first; bounded by the estimated size"""
+
+    def __init__(self, maxBytes: int = LAYER_CACHE_MAX_BYTES):
+        self.maxBytes = maxBytes
+        self.size = 0
+        self.entries = OrderedDict()
+
+    def get(self, key: str) -> Union[Tuple[Base, Any, List[dict]], None]:
+        """Returns the converted layer, its sent feature keys and report items"""
+        if key not in self.entries:
+            return None
+        self.entries.move_to_end(key)
+        return self.entries[key][:3]
+
+    def put(self, key: str, layer: Base, featureKeys: Any, report: List[dict]):
+        size = estimateObjectSize(layer)
+        if size > self.maxBytes:
+            return
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[3]
+        self.entries[key] = (layer, featureKeys, report, size)
+        self.size += size
+        while self.size > self.maxBytes:
+            _, entry = self.entries.popitem(last=False)
+            self.size -= entry[3]
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+def estimateObjectSize(obj: Any) -> int:
+    """Approximate memory of a Speckle object tree: 8 bytes per number, string lengths;
+    lists of numbers are not iterated
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Base):
+            size += 64
+            for name in item.get_member_names():
+                stack.append(getattr(item, name, None))
+        elif isinstance(item, (list, tuple)):
+            if len(item) > 0 and isinstance(item[0], (int, float)):
+                size += 8 * len(item)
+            else:
+                stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, str):
+            size += len(item)
+        else:
+            size += 8
+    return size
+
+
+def dataSourceModified(dataSource: str) -> Union[float, None]:
+    """Last modification time of the layer data: the file (with its sidecar files), or the
+    newest file of the file geodatabase. None if unknown (e.g. enterprise geodatabase).
+    """
+    path = dataSource
+    while path and not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    if not path or path.lower().endswith(".sde"):
+        return None
+    if os.path.isdir(path):
+        return max(
+            [os.path.getmtime(os.path.join(path, f)) for f in os.listdir(path)]
+            + [os.path.getmtime(path)]
+        )
+    stem = os.path.splitext(path)[0]
+    folder = os.path.dirname(path) or "."
+    return max(
+        os.path.getmtime(os.path.join(folder, f))
+        for f in os.listdir(folder)
+        if os.path.join(folder, f).startswith(stem)
+    )
+
+
+def layerRendererJson(layer) -> Union[str, None]:
+    """Renderer (or raster colorizer) definition of the layer, from its layer file"""
+    root_path: str = (
+        os.path.expandvars(r"%LOCALAPPDATA%")
+        + "\\Temp\\Speckle_ArcGIS_temp\\"
+        + datetime.now().strftime("%Y-%m-%d_%H-%M")
+    )
+    root_path += "\\Layers_Speckle\\layer_cache\\"
+    findOrCreatePath(root_path)
+    symJson = jsonFromLayerStyle(layer, root_path + layer.name + "_temp.lyrx")
+    if symJson is None:
+        return None
+    definition = symJson["layerDefinitions"][0]
+    definition = {
+        k: definition.get(k) for k in ["renderer", "colorizer", "transparency"]
+    }
+    return json.dumps(definition, sort_keys=True, default=str)
+
+
+def layerCacheKey(layer, projectCRS, dataStorage) -> Union[str, None]:
+    """Hash of the layer data source, its modification time, renderer, project CRS,
+    offsets/rotation and layer send options; None if the layer can't be cached
+    """
+    try:
+        # resolved once per send: writing the layer file is not free
+        context = getConversionContext(dataStorage)
+        keys = context.setdefault("layerCacheKeys", {}) if context is not None else {}
+        if (layer.dataSource, layer.name) in keys:
+            return keys[(layer.dataSource, layer.name)]
+        keys[(layer.dataSource, layer.name)] = None
+
+        modified = dataSourceModified(layer.dataSource)
+        if modified is None:
+            return None
+        renderer = layerRendererJson(layer)
+        if renderer is None:
+            return None
+        layer_settings = getattr(dataStorage, "layer_settings", None) or {}
+        data = repr(
+            (
+                layer.dataSource,
+                layer.name,
+                modified,
+                renderer,
+                projectCRS.exportToString(),
+                dataStorage.crs_offset_x,
+                dataStorage.crs_offset_y,
+                dataStorage.crs_rotation,
+                dataStorage.currentUnits,
+                sorted(layer_settings.get(layer.dataSource, {}).items()),
+            )
+        )
+        key = hashlib.sha1(data.encode("utf-8")).hexdigest()
+        keys[(layer.dataSource, layer.name)] = key
+        return key
+    except Exception as e:
+        logToUser(str(e), level=1, func=inspect.stack()[0][3])
+        return None
+
+
+def getLayerCache(dataStorage) -> LayerCache:
+    """Returns the converted layers cache of the session"""
+    cache = getattr(dataStorage, "layerCache", None)
+    if cache is None:
+        cache = LayerCache()
+        dataStorage.layerCache = cache
+    return cache
+
+
+def clearLayerCache(dataStorage):
+    """Drops all converted layers, so the next send converts them again"""
+    cache = getattr(dataStorage, "layerCache", None)
+    if cache is not None:
+        cache.clear()
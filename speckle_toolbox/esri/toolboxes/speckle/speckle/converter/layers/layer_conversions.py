@@ -7,7 +7,8 @@ import hashlib
 import inspect
 import math
 import random
-from typing import List, Tuple, Union
+from collections import Counter
+from typing import Any, Dict, List, Tuple, Union
 
 import os
 import time
@@ -62,7 +63,8 @@ from speckle.speckle.plugin_utils.helpers import (
     UNSUPPORTED_PROVIDERS,
 )
 
-from speckle.speckle.converter.geometry.mesh import writeMeshToShp
+from speckle.speckle.converter.geometry.mesh import featureDisplayMeshes, writeMeshToShp
+from speckle.speckle.converter.geometry.mesh_cache import closeMeshCache
 from speckle.speckle.converter.geometry.point import (
     pointToNative,
     pointToNativeWithoutTransforms,
@@ -70,13 +72,44 @@ from speckle.speckle.converter.geometry.point import (
 from speckle.speckle.converter.features.feature_conversions import (
     featureToSpeckle,
     rasterFeatureToSpeckle,
-    featureToNative,
+    featureGeometryToNative,
+    featureGeometryToNativeCoords,
+    featureAttributesToNative,
     nonGeomFeatureToNative,
     cadFeatureToNative,
     bimFeatureToNative,
 )
+from speckle.speckle.converter.features.feature_reader import readFeatureChunks
+from speckle.speckle.converter.geometry.codec import (
+    ARRAY_GEOMETRY_TYPES,
+    GeometryArrays,
+)
+from speckle.speckle.converter.geometry.reproject import (
+    canReprojectInBulk,
+    reprojectGeometries,
+)
+from speckle.speckle.converter.layers.layer_cache import (
+    getLayerCache,
+    layerCacheKey,
+)
+from speckle.speckle.converter.layers.parallel import (
+    collectFeatureResult,
+    createConversionPool,
+    getConversionWorkers,
+    submitLayerJobs,
+)
+from speckle.speckle.converter.layers.sent_objects import (
+    closeSentObjectsCache,
+    featureCacheKey,
+    getSentObjectsCache,
+    layerConversionStamp,
+)
 from speckle.speckle.converter.layers.utils import (
     collectionsFromJson,
+    createConversionContext,
+    findTransformationCached,
+    getLayerDescribe,
+    getLayerSetting,
     colorFromSpeckle,
     colorFromSpeckle,
     generate_qgis_app_id,
@@ -96,8 +129,16 @@ from speckle.speckle.converter.layers.symbology import (
     rasterRendererToNative,
     rendererToSpeckle,
     cadBimRendererToNative,
+    rendererColorTable,
+    featureColorFromTable,
+    featureRendererValue,
 )
 
+from speckle.speckle.plugin_utils.threads import (
+    convertInBackground,
+    emitToMainThread,
+    resolvesTicket,
+)
 from speckle.speckle.utils.panel_logging import logToUser
 from speckle.speckle.utils.project_vars import (
     findOrCreateTableField,
@@ -126,8 +167,20 @@ def convertSelectedLayersToSpeckle(
     """Converts the current selected layers to Speckle"""
     dataStorage = plugin.dataStorage
     result = []
+    executor = None
     try:
         project = plugin.project
+        # Describe results and transformations are resolved once per send
+        createConversionContext(dataStorage, projectCRS)
+        dataStorage.sentFeatureKeys = {}
+
+        # feature layers are converted in worker processes if enabled, while
+        # the other layers are converted here; results are collected in layer order
+        futures = {}
+        workers = getConversionWorkers(dataStorage, layers)
+        if workers > 1:
+            executor = createConversionPool(workers)
+            futures = submitLayerJobs(layers, projectCRS, plugin, executor, workers)
 
         ## Generate dictionnary from the list of layers to send
         jsonTree = {}
@@ -152,7 +205,9 @@ def convertSelectedLayersToSpeckle(
                 plugin=plugin.dockwidget,
             )
 
-            converted = layerToSpeckle(layer, projectCRS, plugin)
+            converted = cachedLayerToSpeckle(
+                layer, projectCRS, plugin, futures.get(i)
+            )
             # print(converted)
             if converted is not None:
                 # print(tree_structure)
@@ -173,16 +228,236 @@ def convertSelectedLayersToSpeckle(
                     plugin=plugin.dockwidget,
                 )
 
+        sentObjects = closeSentObjectsCache(dataStorage)
+        if sentObjects is not None and sentObjects.reused + sentObjects.converted > 0:
+            dataStorage.latestActionReport.append(
+                {
+                    "feature_id": "Unchanged features",
+                    "obj_type": "",
+                    "errors": f"{sentObjects.reused} reused, {sentObjects.converted} converted",
+                }
+            )
+        meshCache = closeMeshCache(dataStorage)
+        if meshCache is not None and meshCache.hits + meshCache.misses > 0:
+            dataStorage.latestActionReport.append(
+                {
+                    "feature_id": "Mesh cache",
+                    "obj_type": "",
+                    "errors": f"{meshCache.hits} hits, {meshCache.misses} misses",
+                }
+            )
         return baseCollection
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
+        closeSentObjectsCache(dataStorage)
+        closeMeshCache(dataStorage)
         return baseCollection
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def cachedLayerToSpeckle(
+    selectedLayer: arcLayer,
+    projectCRS,
+    plugin,
+    featureResult=None,
+) -> Union[VectorLayer, RasterLayer]:
+    """Returns the layer converted in an earlier send of the session if nothing changed,
+    otherwise converts it
+    """
+    dataStorage = plugin.dataStorage
+    key = layerCacheKey(selectedLayer, projectCRS, dataStorage)
+    cache = getLayerCache(dataStorage)
+    cached = cache.get(key) if key is not None else None
+    if cached is not None:
+        converted, featureKeys, report = cached
+        logToUser(
+            f"Layer '{selectedLayer.name}' unchanged, conversion skipped",
+            level=0,
+            plugin=plugin.dockwidget,
+        )
+        if featureKeys is not None and dataStorage.sentFeatureKeys is not None:
+            dataStorage.sentFeatureKeys[id(converted)] = featureKeys
+        dataStorage.latestActionReport.extend([dict(item) for item in report])
+        return converted
+
+    reportStart = len(dataStorage.latestActionReport)
+    converted = layerToSpeckle(selectedLayer, projectCRS, plugin, featureResult)
+    report = dataStorage.latestActionReport[reportStart:]
+    if (
+        key is not None
+        and converted is not None
+        and len(report) > 0
+        and report[0]["errors"] == ""  # layer converted without failed features
+    ):
+        featureKeys = None
+        if dataStorage.sentFeatureKeys is not None:
+            featureKeys = dataStorage.sentFeatureKeys.get(id(converted))
+        cache.put(key, converted, featureKeys, [dict(item) for item in report])
+    return converted
+
+
+def densifyCurves(feat):
+    """If curves detected, get the same feature but in straight lines"""
+    if feat is not None and not isinstance(feat, GeometryArrays) and feat.hasCurves:
+        return feat.densify("ANGLE", 1000, 0.12)
+    return feat
+
+
+def featuresToSpeckle(
+    selectedLayer: arcLayer,
+    data,
+    projectCRS,
+    plugin,
+    fieldnames: List[str],
+    colorTable: Union[Dict[str, Any], None],
+    renderer: Dict[str, Any],
+    whereClause: str = None,
+    startIndex: int = 0,
+) -> Tuple[List[Base], List[Union[str, None]], int]:
+    """Converts the features of a feature class (or those matching the where clause), in cursor order.
+    Returns the converted features, their keys for the sent objects record and the count of failed features.
+    Feature reports are appended to dataStorage.latestActionFeaturesReport.
+    """
+    dataStorage = plugin.dataStorage
+    # geometry and attributes are streamed from one cursor, reading the layer once
+    layer_sr = data.spatialReference
+    x_form = findTransformationCached(
+        data.shapeType, layer_sr, projectCRS, selectedLayer, dataStorage
+    )
+    # features reprojected in bulk are already in the project CRS
+    x_form_projected = (projectCRS, None, None, None, None)
+    # decoding WKB/JSON into arrays needs no arcpy calls per vertex,
+    # but only works for simple geometries not needing arcpy projectAs
+    backend = getLayerSetting(dataStorage, selectedLayer, "feature_reader")
+    if backend != "cursor" and (
+        data.shapeType not in ARRAY_GEOMETRY_TYPES
+        or not canReprojectInBulk(layer_sr, x_form, dataStorage)
+    ):
+        backend = "cursor"
+    # features unchanged since the last send to the stream are sent as
+    # references to their objects in the local Speckle cache, not converted again
+    streamId = getattr(dataStorage, "currentStreamId", None)
+    sentObjects = None
+    if streamId is not None:
+        sentObjects = getSentObjectsCache(dataStorage)
+    layerStamp = layerConversionStamp(selectedLayer, renderer, dataStorage)
+    layerObjs = []
+    layerKeys = []
+    all_errors_count = 0
+    # in OID order, as startIndex of the OID range chunks (ignored by file formats
+    # without ORDER BY support, which are read in OID order anyway)
+    sqlClause = (None, None)
+    if data.hasOID:
+        sqlClause = (None, f"ORDER BY {data.OIDFieldName}")
+    i = startIndex - 1
+    for chunk in readFeatureChunks(
+        selectedLayer.dataSource,
+        fieldnames,
+        backend=backend,
+        where_clause=whereClause,
+        sql_clause=sqlClause,
+    ):
+        appIds = [
+            generate_qgis_app_id(selectedLayer, feat, row_attr)
+            for _, feat, row_attr in chunk
+        ]
+        keys = [
+            featureCacheKey(a, layerStamp, featureRendererValue(colorTable, oid, row_attr))
+            for a, (oid, _, row_attr) in zip(appIds, chunk)
+        ]
+        sentIds = {}
+        if sentObjects is not None:
+            sentIds = sentObjects.get(streamId, keys)
+
+        shapes = [
+            None if key in sentIds else densifyCurves(feat)
+            for (_, feat, _), key in zip(chunk, keys)
+        ]
+        projectedShapes = reprojectGeometries(shapes, layer_sr, x_form, dataStorage)
+        # polygon display meshes of the chunk, triangulated together
+        chunkMeshes = featureDisplayMeshes(
+            [
+                feat if projected is None else projected
+                for feat, projected in zip(shapes, projectedShapes)
+            ],
+            selectedLayer,
+            dataStorage,
+        )
+
+        for (oid, rawFeat, row_attr), appId, key, feat, projected, meshes in zip(
+            chunk, appIds, keys, shapes, projectedShapes, chunkMeshes
+        ):
+            i += 1
+            if key in sentIds:
+                b = sentObjects.reference(sentIds[key])
+                if b is not None:
+                    sentObjects.reused += 1
+                    dataStorage.latestActionFeaturesReport.append(
+                        {
+                            "feature_id": str(i + 1),
+                            "obj_type": b.referencedType,
+                            "errors": "",
+                        }
+                    )
+                    layerObjs.append(b)
+                    layerKeys.append(key)
+                    continue
+                # not in the local cache anymore: convert
+                feat = densifyCurves(rawFeat)
+                projected = reprojectGeometries([feat], layer_sr, x_form, dataStorage)[0]
+            if feat is None:
+                logToUser(
+                    "Feature skipped due to invalid geometry",
+                    level=2,
+                    func=inspect.stack()[0][3],
+                )
+                continue
+
+            dataStorage.latestActionFeaturesReport.append(
+                {"feature_id": str(i + 1), "obj_type": "", "errors": ""}
+            )
+            color = None
+            if colorTable is not None:
+                color = featureColorFromTable(colorTable, oid, row_attr)
+            b = featureToSpeckle(
+                fieldnames,
+                row_attr,
+                i,
+                feat if projected is None else projected,
+                projectCRS,
+                selectedLayer,
+                plugin,
+                None if projected is None else x_form_projected,
+                color,
+                meshes,
+            )
+            failed = (
+                dataStorage.latestActionFeaturesReport[
+                    len(dataStorage.latestActionFeaturesReport) - 1
+                ]["errors"]
+                != ""
+            )
+            if b is not None:
+                b.applicationId = appId
+                layerObjs.append(b)
+                # only features converted without errors are reused
+                layerKeys.append(None if failed else key)
+                if sentObjects is not None:
+                    sentObjects.converted += 1
+
+            if failed:
+                all_errors_count += 1
+
+    return layerObjs, layerKeys, all_errors_count
 
 
 def layerToSpeckle(
     selectedLayer: arcLayer,
     projectCRS,
     plugin,
+    featureResult=None,
 ) -> Union[
     VectorLayer, RasterLayer
 ]:  # now the input is QgsVectorLayer instead of qgis._core.QgsLayerTreeLayer
@@ -195,7 +470,7 @@ def layerToSpeckle(
         project: ArcGISProject = plugin.project
 
         try:
-            data = arcpy.Describe(selectedLayer.dataSource)
+            data = getLayerDescribe(selectedLayer, dataStorage)
         except OSError as e:
             logToUser(str(e.args[0]), level=2, func=inspect.stack()[0][3])
             return
@@ -261,81 +536,27 @@ def layerToSpeckle(
 
                     # write feature attributes
                     fieldnames = [field.name for field in data.fields]
-                    rows_shapes = arcpy.da.SearchCursor(
-                        selectedLayer.dataSource, "Shape@"
-                    )  # arcpy.da.SearchCursor(in_table, field_names, {where_clause}, {spatial_reference}, {explode_to_points}, {sql_clause})
-                    # print("__ start iterating features")
-                    row_shapes_list = [x for k, x in enumerate(rows_shapes)]
-                    for i, features in enumerate(row_shapes_list):
-
-                        print(
-                            "____error Feature # " + str(i + 1)
-                        )  # + " / " + str(sum(1 for _ in enumerate(rows_shapes))))
-                        if features[0] is None:
-                            continue
-                        feat = features[0]
-                        # print(feat) # <geoprocessing describe geometry object object at 0x000002A75D6A4BD0>
-                        # print(feat.hasCurves)
-                        # print(feat.partCount)
-
-                        if feat is not None:
-                            print(
-                                feat
-                            )  # <geoprocessing describe geometry object object at 0x0000026796C47780>
-                            rows_attributes = arcpy.da.SearchCursor(
-                                selectedLayer.dataSource, fieldnames
-                            )
-                            row_attr = []
-                            for k, attrs in enumerate(rows_attributes):
-                                if i == k:
-                                    row_attr = attrs
-                                    break
-
-                            # if curves detected, createa new feature class, turn to segments and get the same feature but in straigt lines
-                            # print(feat.hasCurves)
-                            if feat.hasCurves:
-                                # f_class_modified = curvedFeatureClassToSegments(layer)
-                                # rows_shapes_modified = arcpy.da.SearchCursor(f_class_modified, "Shape@")
-                                # row_shapes_list_modified = [x for k, x in enumerate(rows_shapes_modified)]
-
-                                feat = feat.densify("ANGLE", 1000, 0.12)
-                                # print(feat)
-
-                            all_errors_count = 0
-                            dataStorage.latestActionFeaturesReport.append(
-                                {"feature_id": str(i + 1), "obj_type": "", "errors": ""}
-                            )
-                            b = featureToSpeckle(
-                                fieldnames,
-                                row_attr,
-                                i,
-                                feat,
-                                projectCRS,
-                                selectedLayer,
-                                plugin,
-                            )
-                            if b is not None:
-                                layerObjs.append(b)
-                                # print(b)
-
-                            if (
-                                dataStorage.latestActionFeaturesReport[
-                                    len(dataStorage.latestActionFeaturesReport) - 1
-                                ]["errors"]
-                                != ""
-                            ):
-                                all_errors_count += 1
-                        else:
-                            logToUser(
-                                "Feature skipped due to invalid geometry",
-                                level=2,
-                                func=inspect.stack()[0][3],
-                            )
-
-                        # print("____End of Feature # " + str(i + 1))
-
+                    layerObjs = None
+                    if featureResult is not None:  # converted in a worker process
+                        layerObjs, layerKeys, all_errors_count = collectFeatureResult(
+                            featureResult, plugin, layerName
+                        )
+                    if layerObjs is None:
+                        # feature colors are looked up from a table built once per layer
+                        colorTable = rendererColorTable(selectedLayer, fieldnames)
+                        layerObjs, layerKeys, all_errors_count = featuresToSpeckle(
+                            selectedLayer,
+                            data,
+                            projectCRS,
+                            plugin,
+                            fieldnames,
+                            colorTable,
+                            speckleLayer.renderer,
+                        )
                     # print("__ finish iterating features")
                     speckleLayer.elements = layerObjs
+                    if getattr(dataStorage, "sentFeatureKeys", None) is not None:
+                        dataStorage.sentFeatureKeys[id(speckleLayer)] = layerKeys
                     speckleLayer.geomType = data.shapeType
 
                     if len(speckleLayer.elements) == 0:
@@ -481,7 +702,9 @@ def nonGeometryLayerToNative(
         newFields = getLayerAttributes(geomList)
 
         if plugin.dataStorage.latestHostApp.endswith("excel"):
-            plugin.dockwidget.signal_6.emit(
+            emitToMainThread(
+                plugin,
+                plugin.dockwidget.signal_6,
                 {
                     "plugin": plugin,
                     "layerName": layerName,
@@ -489,10 +712,12 @@ def nonGeometryLayerToNative(
                     "streamBranch": streamBranch,
                     "newFields": newFields,
                     "geomList": geomList,
-                }
+                },
             )
         else:
-            plugin.dockwidget.signal_5.emit(
+            emitToMainThread(
+                plugin,
+                plugin.dockwidget.signal_5,
                 {
                     "plugin": plugin,
                     "layerName": layerName,
@@ -500,7 +725,7 @@ def nonGeometryLayerToNative(
                     "streamBranch": streamBranch,
                     "newFields": newFields,
                     "geomList": geomList,
-                }
+                },
             )
 
         return
@@ -510,6 +735,7 @@ def nonGeometryLayerToNative(
         return
 
 
+@resolvesTicket
 def addExcelMainThread(obj: Tuple):
     # print("___addExcelMainThread")
     try:
@@ -639,6 +865,7 @@ def addExcelMainThread(obj: Tuple):
         dataStorage.latestConversionTime = datetime.now()
 
 
+@resolvesTicket
 def addNonGeometryMainThread(obj: Tuple):
     # print("___addCadMainThread")
     try:
@@ -917,7 +1144,9 @@ def bimVectorLayerToNative(
 
         newFields = getLayerAttributes(geomList)
 
-        plugin.dockwidget.signal_2.emit(
+        emitToMainThread(
+            plugin,
+            plugin.dockwidget.signal_2,
             {
                 "plugin": plugin,
                 "geomType": "Multipatch",
@@ -927,7 +1156,7 @@ def bimVectorLayerToNative(
                 "newFields": newFields,
                 "geomList": geomList,
                 "matrix": matrix,
-            }
+            },
         )
 
         return
@@ -936,6 +1165,7 @@ def bimVectorLayerToNative(
         return
 
 
+@resolvesTicket
 def addBimMainThread(obj: Tuple):
     try:
         finalName = ""
@@ -1047,10 +1277,6 @@ def addBimMainThread(obj: Tuple):
             return
         # print("____ meshes saved___")
 
-        cursor = arcpy.da.SearchCursor(shp, "Speckle_ID")
-        class_shapes = [shp_id[0] for n, shp_id in enumerate(cursor)]
-        del cursor
-
         validated_class_path = validate_path(class_name, plugin)
         # print(validated_class_path)
         validated_class_name = validated_class_path.split("\\")[
@@ -1136,129 +1362,106 @@ def addBimMainThread(obj: Tuple):
             print(e)
         # print(matrix)
 
-        fets = []
-        fetIds = []
         fetColors = []
-        rows_delete = []
+        rows_delete = set()
 
-        cursor = arcpy.da.SearchCursor(f_class, "Speckle_ID")
-        class_shapes = [shp_id[0] for n, shp_id in enumerate(cursor)]
-        del cursor
+        # row position of each Speckle_ID, in one pass
+        class_shapes = {}
+        with arcpy.da.SearchCursor(f_class, "Speckle_ID") as cursor:
+            for n, shp_id in enumerate(cursor):
+                class_shapes.setdefault(shp_id[0], n)
 
         # print(len(class_shapes))
         # print(len(geomList))
 
-        # print("_________BIM FeatureS To Native___________")
-        report_features = []
-        all_feature_errors_count = 0
-        for f in geomList[:]:
+        def convertBimFeature(f):
+            # returns the row position of the feature, its converted attributes and error
+            n = class_shapes.get(f.id)
+            if n is None:
+                return n, None, None
             try:
-                # pre-fill report:
-                report_features.append(
-                    {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
+                return (
+                    n,
+                    bimFeatureToNative(f, newFields, sr, path_bim, dataStorage),
+                    None,
                 )
-                exist_feat = None
-                shape_id = None
-                n = None
-                for n, shape_id in enumerate(class_shapes):
-                    # print(shape_id[0])
-                    if shape_id == f.id:
-                        exist_feat = f
-                        break
-
-                if exist_feat is None:
-                    logToUser(
-                        f"Feature skipped due to invalid geometry",
-                        level=2,
-                        func=inspect.stack()[0][3],
-                    )
-                    report_features[len(report_features) - 1].update(
-                        {"errors": "Feature skipped due to invalid geometry"}
-                    )
-                    all_feature_errors_count += 1
-                    rows_delete.append(n)
-                    continue
-
-                new_feat = bimFeatureToNative(
-                    exist_feat, newFields, sr, path_bim, dataStorage
-                )
-                if new_feat is not None and new_feat != "":
-                    fetColors = findFeatColors(fetColors, f)
-
-                    fets.append(new_feat)
-                    fetIds.append(f.id)
-                    # print(len(fets))
-                else:
-                    logToUser(
-                        f"Feature skipped due to invalid geometry",
-                        level=2,
-                        func=inspect.stack()[0][3],
-                    )
-                    report_features[len(report_features) - 1].update(
-                        {"errors": "Feature skipped due to invalid geometry"}
-                    )
-                    all_feature_errors_count += 1
-                    rows_delete.append(n)
-
             except Exception as e:
-                print(e)
-
-        # print(rows_delete)
-        cursor = arcpy.da.UpdateCursor(f_class, "Speckle_ID")
-        for n, row in enumerate(cursor):
-            if n in rows_delete:
-                cursor.deleteRow()
-        del cursor
-        # print(n)
+                return n, None, str(e)
 
-        if len(fets) == 0:
-            return None
-        count = 0
-        rowValues = []
-        for i, feat in enumerate(fets):
+        # number of features to be written to each row
+        rowFeatures = Counter(
+            class_shapes[f.id] for f in geomList if f.id in class_shapes
+        )
 
-            row = []
-            heads = []
-            for key in all_keys:
+        # print("_________BIM FeatureS To Native___________")
+        # attributes are converted in a background thread and written here with one
+        # UpdateCursor pass, as soon as all features of the current row are converted
+        report_features = []
+        all_feature_errors_count = 0
+        heads = list(all_keys)
+        rowValues = {}  # by row position, until the row is written
+        featuresConverted = 0
+        batches = convertInBackground(geomList, convertBimFeature)
+
+        def addBimBatch(batch):
+            nonlocal fetColors, all_feature_errors_count, featuresConverted
+            for f, (n, new_feat, error) in batch:
                 try:
-                    row.append(feat[key])
-                    heads.append(key)
+                    # pre-fill report:
+                    report_features.append(
+                        {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
+                    )
+                    if n is not None:
+                        rowFeatures[n] -= 1
+                    if new_feat is not None and new_feat != "":
+                        fetColors = findFeatColors(fetColors, f)
+                        rowValues[n] = [new_feat.get(key) for key in heads]
+                        featuresConverted += 1
+                    else:
+                        if error is None:
+                            error = "Feature skipped due to invalid geometry"
+                        logToUser(error, level=2, func=inspect.stack()[0][3])
+                        report_features[len(report_features) - 1].update(
+                            {"errors": error}
+                        )
+                        all_feature_errors_count += 1
+                        if n is not None:
+                            rows_delete.add(n)
+
                 except Exception as e:
-                    row.append(None)
-                    heads.append(key)
+                    logToUser(str(e), level=2, func=inspect.stack()[0][3])
 
-            rowValues.append(row)
-            count += 1
-        # print(heads)
-        # print(len(heads))
+        # one pass: delete rows of failed features, set attributes of the others
+        with arcpy.da.UpdateCursor(f_class, heads or ["Speckle_ID"]) as cur:
+            try:
+                for n, rowShape in enumerate(cur):
+                    while rowFeatures[n] > 0:
+                        addBimBatch(next(batches))
+                    if n in rows_delete:
+                        cur.deleteRow()
+                        rowValues.pop(n, None)
+                        continue
+                    values = rowValues.pop(n, None)
+                    if values is None or len(heads) == 0:
+                        continue
+                    for i, value in enumerate(values):
+                        rowShape[i] = value
+                        if matrix[i][1] == "TEXT" and value is not None:
+                            rowShape[i] = str(value)
+                        if isinstance(value, str):  # cut if string is too long
+                            rowShape[i] = value[:255]
+                    cur.updateRow(rowShape)
+            except Exception as e:
+                logToUser(
+                    "Layer attribute error: " + str(e),
+                    level=2,
+                    func=inspect.stack()[0][3],
+                )
+        for batch in batches:  # features without a row, only reported
+            addBimBatch(batch)
 
-        if len(heads) > 0:
-            with arcpy.da.UpdateCursor(f_class, heads) as cur:
-                # For each row, evaluate the WELL_YIELD value (index position
-                # of 0), and update WELL_CLASS (index position of 1)
-                shp_num = 0
-                try:
-                    for rowShape in cur:
-                        for i, r in enumerate(rowShape):
-                            rowShape[i] = rowValues[shp_num][i]
-                            if matrix[i][1] == "TEXT" and rowShape[i] is not None:
-                                rowShape[i] = str(rowValues[shp_num][i])
-                            if isinstance(
-                                rowValues[shp_num][i], str
-                            ):  # cut if string is too long
-                                rowShape[i] = rowValues[shp_num][i][:255]
-                        cur.updateRow(rowShape)
-                        shp_num += 1
-                except Exception as e:
-                    # print("Layer attr error: " + str(e))
-                    # print(shp_num)
-                    # print(len(rowValues))
-                    logToUser(
-                        "Layer attribute error: " + e,
-                        level=2,
-                        func=inspect.stack()[0][3],
-                    )
-            del cur
+        if featuresConverted == 0:
+            return None
 
         # print("create layer:")
         vl = MakeFeatureLayer(
@@ -1335,7 +1538,9 @@ def cadVectorLayerToNative(
 ):
     print("_______cadVectorLayerToNative__")
     try:
-        plugin.dockwidget.signal_3.emit(
+        emitToMainThread(
+            plugin,
+            plugin.dockwidget.signal_3,
             {
                 "plugin": plugin,
                 "geomType": geomType,
@@ -1344,7 +1549,7 @@ def cadVectorLayerToNative(
                 "streamBranch": streamBranch,
                 "geomList": geomList,
                 "matrix": matrix,
-            }
+            },
         )
 
     except Exception as e:
@@ -1352,6 +1557,7 @@ def cadVectorLayerToNative(
         return
 
 
+@resolvesTicket
 def addCadMainThread(obj: Tuple):
     print("___addCadMainThread")
     try:
@@ -1641,12 +1847,13 @@ def vectorLayerToNative(
             "nameBase": nameBase,
             "plugin": plugin,
         }
-        plugin.dockwidget.signal_1.emit(objectEmit)
+        emitToMainThread(plugin, plugin.dockwidget.signal_1, objectEmit)
 
     except Exception as e:
         logToUser(str(e), level=2, func=inspect.stack()[0][3])
 
 
+@resolvesTicket
 def addVectorMainThread(obj: Tuple):
     try:
         layer = obj["layer"]
@@ -1818,59 +2025,63 @@ def addVectorMainThread(obj: Tuple):
         if len(matrix) > 0:
             AddFields(str(f_class), matrix)
 
-        # print(layer_elements)
-        fets = []
+        # attributes and geometry vertices (scaled, offset, rotated) are converted in a
+        # background thread while the previous batches are written here: only arcpy
+        # geometry objects are built on this thread
         report_features = []
         all_feature_errors_count = 0
-        for f in layer_elements:
-            # pre-fill report:
-            report_features.append(
-                {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
-            )
-            new_feat = featureToNative(f, newFields, geomType, sr, plugin.dataStorage)
-            if new_feat != "" and new_feat != None:
-                fets.append(new_feat)
-            else:
-                logToUser(
-                    f"'{geomType}' feature skipped due to invalid data",
-                    level=2,
-                    func=inspect.stack()[0][3],
-                )
-                report_features[len(report_features) - 1].update(
-                    {"errors": f"'{geomType}' feature skipped due to invalid data"}
-                )
-                all_feature_errors_count += 1
-
-        # print(fets)
-        if len(fets) == 0:
-            return None
         count = 0
-        rowValues = []
         heads = None
-        for feat in fets:
-            # print(feat)
-            try:
-                feat["applicationId"]
-            except:
-                feat.update({"applicationId": count})
-
-            row = [feat["arcGisGeomFromSpeckle"], feat["applicationId"]]
-            heads = ["Shape@", "OBJECTID"]
-
-            for key, value in feat.items():
-                if key in all_keys and key.lower() not in fields_to_ignore:
-                    heads.append(key)
-                    row.append(value)
-            rowValues.append(row)
-            count += 1
-            # print(heads)
-            # print(row)
-        cur = arcpy.da.InsertCursor(str(f_class), tuple(heads))
-        for row in rowValues:
-            # print(tuple(heads))
-            # print(tuple(row))
-            cur.insertRow(tuple(row))
-        del cur
+        cur = None
+        try:
+            for batch in convertInBackground(
+                layer_elements,
+                lambda f: (
+                    featureAttributesToNative(f, newFields),
+                    featureGeometryToNativeCoords(f, geomType, dataStorage),
+                ),
+            ):
+                for f, (feat, coords) in batch:
+                    # pre-fill report:
+                    report_features.append(
+                        {"speckle_id": f.id, "obj_type": f.speckle_type, "errors": ""}
+                    )
+                    arcGisGeom = featureGeometryToNative(
+                        f, geomType, sr, dataStorage, coords
+                    )
+                    if arcGisGeom is None:
+                        logToUser(
+                            f"'{geomType}' feature skipped due to invalid data",
+                            level=2,
+                            func=inspect.stack()[0][3],
+                        )
+                        report_features[len(report_features) - 1].update(
+                            {
+                                "errors": f"'{geomType}' feature skipped due to invalid data"
+                            }
+                        )
+                        all_feature_errors_count += 1
+                        continue
+
+                    if heads is None:
+                        heads = ["Shape@", "OBJECTID"] + [
+                            key
+                            for key in feat.keys()
+                            if key in all_keys and key.lower() not in fields_to_ignore
+                        ]
+                        cur = arcpy.da.InsertCursor(str(f_class), tuple(heads))
+                    row = [
+                        arcGisGeom,
+                        feat.get("applicationId", count),
+                    ] + [feat.get(key) for key in heads[2:]]
+                    cur.insertRow(tuple(row))
+                    count += 1
+        finally:
+            if cur is not None:
+                del cur
+
+        if count == 0:
+            return None
 
         # vl = MakeFeatureLayer(str(f_class), newName).getOutput(0)
         vl = MakeFeatureLayer(
@@ -2125,18 +2336,21 @@ def addTableMainThread(obj: Tuple) -> Union[str, None]:
 
 def rasterLayerToNative(layer: RasterLayer, streamBranch: str, nameBase: str, plugin):
     try:
-        plugin.dockwidget.signal_4.emit(
+        emitToMainThread(
+            plugin,
+            plugin.dockwidget.signal_4,
             {
                 "layer": layer,
                 "streamBranch": streamBranch,
                 "nameBase": nameBase,
                 "plugin": plugin,
-            }
+            },
         )
     except Exception as e:
         logToUser(e, level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
 
 
+@resolvesTicket
 def addRasterMainThread(obj: Tuple):
     rasterLayer = None
     try:
@@ -0,0 +1,302 @@
+"""
+Contains the conversion of feature layers in worker processes. Jobs carry only picklable
+settings (data source, project CRS, offsets, renderer color table); workers open the data
+with arcpy and return the converted features with their reports.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+import inspect
+import multiprocessing
+import os
+import sys
+from typing import Any, Dict, List, Tuple, Union
+
+import arcpy
+import numpy as np
+from specklepy.objects import Base
+
+from speckle.speckle.converter.geometry.mesh_cache import (
+    closeMeshCache,
+    getMeshCache,
+)
+from speckle.speckle.converter.layers.layer_cache import getLayerCache, layerCacheKey
+from speckle.speckle.converter.layers.sent_objects import (
+    closeSentObjectsCache,
+    getSentObjectsCache,
+)
+from speckle.speckle.converter.layers.symbology import (
+    rendererColorTable,
+    rendererToSpeckle,
+)
+from speckle.speckle.converter.layers.utils import (
+    CONVERSION_WORKERS,
+    createConversionContext,
+    getLayerDescribe,
+    getLayerSetting,
+)
+from speckle.speckle.utils.panel_logging import logToUser
+
+
+class WorkerLayer:
+    """Stand-in for the arcpy.mp Layer in worker processes"""
+
+    def __init__(self, dataSource: str, name: str):
+        self.dataSource = dataSource
+        self.name = name
+        self.isFeatureLayer = True
+        self.isRasterLayer = False
+
+
+class WorkerDataStorage:
+    """Settings of the send used by the feature conversion, without project or UI objects"""
+
+    def __init__(self, job: Dict[str, Any]):
+        self.project = None
+        self.currentUnits = job["currentUnits"]
+        self.crs_offset_x = job["crs_offset_x"]
+        self.crs_offset_y = job["crs_offset_y"]
+        self.crs_rotation = job["crs_rotation"]
+        self.layer_settings = job["layer_settings"]
+        self.currentStreamId = job["currentStreamId"]
+        self.conversionContext = None
+        self.latestActionFeaturesReport = []
+
+
+class WorkerPlugin:
+    def __init__(self, dataStorage: WorkerDataStorage):
+        self.dataStorage = dataStorage
+        self.dockwidget = None
+        self.project = None
+
+
+FEATURES_PER_JOB = 50000  # large layers are split into OID ranges of about this size
+
+
+def getConversionWorkers(dataStorage, layers: List = None) -> int:
+    """Worker processes for the send; 0 or 1 converts on the current thread.
+    Layers with the "feature_chunks" option need at least that many workers.
+    """
+    workers = getattr(dataStorage, "conversion_workers", CONVERSION_WORKERS) or 0
+    for layer in layers or []:
+        try:
+            if layer.isFeatureLayer:
+                chunks = getLayerSetting(dataStorage, layer, "feature_chunks")
+                workers = max(workers, chunks or 0)
+        except Exception:
+            pass
+    if workers < 0:
+        return 0
+    return min(int(workers), os.cpu_count() or 1)
+
+
+def oidRangeChunks(
+    dataSource: str, oidField: str, chunks: int
+) -> List[Tuple[str, int, int]]:
+    """Splits the features into chunks of consecutive OIDs with about the same feature count.
+    Returns (where clause, index of the first feature, feature count) of each chunk.
+    """
+    oids = arcpy.da.TableToNumPyArray(dataSource, ["OID@"])["OID@"]
+    oids = np.sort(oids)
+    if len(oids) == 0:
+        return []
+    field = arcpy.AddFieldDelimiters(dataSource, oidField)
+    result = []
+    bounds = np.linspace(0, len(oids), max(1, min(chunks, len(oids))) + 1).astype(int)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end <= start:
+            continue
+        where = f"{field} >= {int(oids[start])} AND {field} <= {int(oids[end - 1])}"
+        result.append((where, int(start), int(end - start)))
+    return result
+
+
+def createConversionPool(workers: int) -> ProcessPoolExecutor:
+    """Process pool running the Python of the ArcGIS Pro environment (not ArcGISPro.exe)"""
+    context = multiprocessing.get_context("spawn")
+    if not os.path.basename(sys.executable).lower().startswith("python"):
+        context.set_executable(os.path.join(sys.exec_prefix, "python.exe"))
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def createFeatureJob(
+    layer,
+    projectCRS: arcpy.SpatialReference,
+    dataStorage,
+    fieldnames: List[str],
+    colorTable: Union[Dict[str, Any], None],
+    renderer: Dict[str, Any],
+    whereClause: str = None,
+    startIndex: int = 0,
+) -> Dict[str, Any]:
+    """Picklable description of the features to convert in a worker"""
+    layer_settings = getattr(dataStorage, "layer_settings", None) or {}
+    return {
+        "dataSource": layer.dataSource,
+        "name": layer.name,
+        "projectCRS": projectCRS.exportToString(),
+        "currentUnits": dataStorage.currentUnits,
+        "crs_offset_x": dataStorage.crs_offset_x,
+        "crs_offset_y": dataStorage.crs_offset_y,
+        "crs_rotation": dataStorage.crs_rotation,
+        "layer_settings": {
+            layer.dataSource: dict(layer_settings.get(layer.dataSource, {}))
+        },
+        "currentStreamId": getattr(dataStorage, "currentStreamId", None),
+        "fieldnames": list(fieldnames),
+        "colorTable": colorTable,
+        "renderer": renderer,
+        "whereClause": whereClause,
+        "startIndex": startIndex,
+    }
+
+
+def convertFeatureJob(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: converts the features of the job"""
+    # imported here: layer_conversions imports this module
+    from speckle.speckle.converter.layers.layer_conversions import featuresToSpeckle
+
+    dataStorage = WorkerDataStorage(job)
+    plugin = WorkerPlugin(dataStorage)
+    layer = WorkerLayer(job["dataSource"], job["name"])
+    projectCRS = arcpy.SpatialReference(text=job["projectCRS"])
+    createConversionContext(dataStorage, projectCRS)
+
+    elements, keys, errors = featuresToSpeckle(
+        layer,
+        getLayerDescribe(layer, dataStorage),
+        projectCRS,
+        plugin,
+        job["fieldnames"],
+        job["colorTable"],
+        job["renderer"],
+        job["whereClause"],
+        job["startIndex"],
+    )
+    stats = {"reused": 0, "converted": 0, "meshHits": 0, "meshMisses": 0}
+    sentObjects = closeSentObjectsCache(dataStorage)
+    if sentObjects is not None:
+        stats["reused"] = sentObjects.reused
+        stats["converted"] = sentObjects.converted
+    meshCache = closeMeshCache(dataStorage)
+    if meshCache is not None:
+        stats["meshHits"] = meshCache.hits
+        stats["meshMisses"] = meshCache.misses
+    return {
+        "elements": elements,
+        "keys": keys,
+        "errors": errors,
+        "reports": dataStorage.latestActionFeaturesReport,
+        "stats": stats,
+    }
+
+
+def submitLayerJobs(
+    layers: List,
+    projectCRS: arcpy.SpatialReference,
+    plugin,
+    executor: ProcessPoolExecutor,
+    workers: int,
+) -> Dict[int, List[Future]]:
+    """Starts conversion of the feature layers in worker processes; returns futures by layer index,
+    one per OID range chunk. Layers are split into the number of chunks of their "feature_chunks"
+    option, or, by default, into chunks of FEATURES_PER_JOB features (at most one per worker).
+    Raster and other layers, and layers already converted in the session, are left to the main thread.
+    """
+    dataStorage = plugin.dataStorage
+    project = plugin.project
+    futures = {}
+    for i, layer in enumerate(layers):
+        try:
+            if not layer.isFeatureLayer:
+                continue
+            key = layerCacheKey(layer, projectCRS, dataStorage)
+            if key is not None and getLayerCache(dataStorage).get(key) is not None:
+                continue
+            data = getLayerDescribe(layer, dataStorage)
+            if data.datasetType != "FeatureClass":
+                continue
+            fieldnames = [field.name for field in data.fields]
+            colorTable = rendererColorTable(layer, fieldnames)
+            renderer = rendererToSpeckle(project, project.activeMap, layer, None)
+
+            chunks = getLayerSetting(dataStorage, layer, "feature_chunks")
+            if chunks is None:
+                count = int(arcpy.management.GetCount(layer.dataSource)[0])
+                chunks = min(workers, -(-count // FEATURES_PER_JOB))
+            ranges = [(None, 0, None)]
+            if chunks > 1 and data.hasOID:
+                ranges = oidRangeChunks(layer.dataSource, data.OIDFieldName, chunks)
+            futures[i] = [
+                executor.submit(
+                    convertFeatureJob,
+                    createFeatureJob(
+                        layer,
+                        projectCRS,
+                        dataStorage,
+                        fieldnames,
+                        colorTable,
+                        renderer,
+                        whereClause,
+                        startIndex,
+                    ),
+                )
+                for whereClause, startIndex, _ in ranges
+            ]
+        except Exception as e:
+            logToUser(
+                f"Layer '{layer.name}' will be converted on the main thread: {e}",
+                level=1,
+                func=inspect.stack()[0][3],
+            )
+    return futures
+
+
+def collectFeatureResult(
+    futures: Union[Future, List[Future]], plugin, layerName: str = ""
+) -> Tuple[Union[List[Base], None], List[Union[str, None]], int]:
+    """Waits for the worker results and merges them in job (OID range) order: features, their keys
+    and the failed feature count; feature reports and cache counters go to dataStorage.
+    Returns None features if any job failed, so the layer is converted on the current thread.
+    """
+    dataStorage = plugin.dataStorage
+    if isinstance(futures, Future):
+        futures = [futures]
+    try:
+        for done, future in enumerate(as_completed(futures)):
+            future.result()
+            if len(futures) > 1:
+                logToUser(
+                    f"Layer '{layerName}': {done + 1} of {len(futures)} chunks converted",
+                    level=0,
+                    plugin=plugin.dockwidget,
+                )
+        results = [future.result() for future in futures]
+    except Exception as e:
+        logToUser(
+            f"Conversion in worker process failed, converting on the main thread: {e}",
+            level=1,
+            func=inspect.stack()[0][3],
+        )
+        return None, [], 0
+
+    elements = []
+    keys = []
+    errors = 0
+    for result in results:
+        elements.extend(result["elements"])
+        keys.extend(result["keys"])
+        errors += result["errors"]
+        dataStorage.latestActionFeaturesReport.extend(result["reports"])
+
+        stats = result["stats"]
+        if getattr(dataStorage, "currentStreamId", None) is not None:
+            sentObjects = getSentObjectsCache(dataStorage)
+            if sentObjects is not None:
+                sentObjects.reused += stats["reused"]
+                sentObjects.converted += stats["converted"]
+        if stats["meshHits"] + stats["meshMisses"] > 0:
+            meshCache = getMeshCache(dataStorage)
+            if meshCache is not None:
+                meshCache.hits += stats["meshHits"]
+                meshCache.misses += stats["meshMisses"]
+    return elements, keys, errors
@@ -0,0 +1,274 @@
+"""
+Contains the local record of features sent to each stream, so unchanged features
+are sent again as references to their objects in the local Speckle cache instead
+of being converted again.
+"""
+
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+from specklepy.logging.exceptions import SpeckleException
+from specklepy.objects import Base
+from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+from specklepy.transports.abstract_transport import AbstractTransport
+from specklepy.transports.sqlite import SQLiteTransport
+
+from speckle.speckle.converter.layers.utils import getConversionContext
+from speckle.speckle.plugin_utils.helpers import findOrCreatePath
+from speckle.speckle.utils.panel_logging import logToUser
+
+SENT_OBJECTS_FOLDER = os.path.expandvars(r"%LOCALAPPDATA%") + "\\Temp\\Speckle_ArcGIS_temp\\"
+SENT_OBJECTS_FILE = "sent_objects.sqlite"
+# ReferenceSerializer extends private methods of the specklepy serializer:
+# references are only sent with the version it is tested with (see requirements.txt)
+SPECKLEPY_REFERENCES_VERSION = "2.17.17"
+
+
+def referencesSupported() -> bool:
+    """True if the installed specklepy is the version ReferenceSerializer is tested with"""
+    try:
+        return importlib.metadata.version("specklepy") == SPECKLEPY_REFERENCES_VERSION
+    except Exception:
+        return False
+
+
+class SentObjectReference(Base, speckle_type="Speckle.ArcGIS.SentObjectReference"):
+    """Feature sent before, written by ReferenceSerializer as a reference to its object
+    in the local Speckle cache"""
+
+    referencedId: str = None
+    referencedType: str = None
+    closure: Dict[str, int] = None
+
+
+class ReferenceSerializer(BaseObjectSerializer):
+    """Serializer writing SentObjectReference elements as references; the cached JSON
+    of the object and its children is copied to the write transports as it is"""
+
+    def __init__(
+        self,
+        write_transports: List[AbstractTransport],
+        cache_transport: SQLiteTransport,
+    ) -> None:
+        super().__init__(write_transports=write_transports)
+        self.cache_transport = cache_transport
+
+    def _traverse_base(self, base: Base) -> Tuple[str, Dict]:
+        if not isinstance(base, SentObjectReference):
+            return super()._traverse_base(base)
+
+        # detach flag pushed by the parent; the parent records the reference itself
+        self.detach_lineage.pop()
+        # children of the cached object are part of the closures of all parents
+        depth = len(self.detach_lineage)
+        for childId, childDepth in base.closure.items():
+            for parent in self.lineage:
+                tree = self.family_tree.setdefault(parent, {})
+                if childId not in tree or tree[childId] > depth + childDepth:
+                    tree[childId] = depth + childDepth
+
+        objJson = None
+        for objId in [base.referencedId] + list(base.closure):
+            serialized = self.cache_transport.get_object(objId)
+            if serialized is None:
+                raise SpeckleException(f"Object {objId} missing in the local cache")
+            if objId == base.referencedId:
+                objJson = serialized
+            for t in self.write_transports:
+                if t is not self.cache_transport:
+                    t.save_object(id=objId, serialized_object=serialized)
+        return base.referencedId, json.loads(objJson)
+
+
+def sendWithReferences(base: Base, transports: List[AbstractTransport]) -> str:
+    """Sends the object like operations.send, with unchanged features sent as references"""
+    cache = SQLiteTransport()
+    serializer = ReferenceSerializer([cache] + list(transports), cache)
+    objId, _ = serializer.traverse_base(base)
+    return objId
+
+
+class SentObjectsCache:
+    """SQLite table of Speckle object ids by stream and feature key"""
+
+    def __init__(self, path: str = None):
+        if path is None:
+            findOrCreatePath(SENT_OBJECTS_FOLDER)
+            path = SENT_OBJECTS_FOLDER + SENT_OBJECTS_FILE
+        self.path = path
+        self.reused = 0
+        self.converted = 0
+        self.connection = sqlite3.connect(path, timeout=30)  # shared with worker processes
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS objects (stream_id TEXT, key TEXT, object_id TEXT, last_used REAL, PRIMARY KEY (stream_id, key))"
+        )
+        self.connection.commit()
+        self.transport = None
+
+    def get(self, streamId: str, keys: List[str]) -> Dict[str, str]:
+        """Returns object ids of the keys sent before to the stream"""
+        result = {}
+        for k in range(0, len(keys), 500):  # SQLite parameter limit
+            batch = keys[k : k + 500]
+            query = "SELECT key, object_id FROM objects WHERE stream_id = ? AND key IN ({})".format(
+                ",".join("?" * len(batch))
+            )
+            result.update(self.connection.execute(query, [streamId] + batch))
+        return result
+
+    def put(self, streamId: str, objectIds: Dict[str, str]):
+        """Records object ids of the sent features"""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?)",
+                [(streamId, key, objId, now) for key, objId in objectIds.items()],
+            )
+
+    def reference(self, objectId: str) -> Union[SentObjectReference, None]:
+        """Returns a reference to the sent object, if it and its children are still
+        in the local Speckle cache"""
+        if self.transport is None:
+            self.transport = SQLiteTransport()
+        try:
+            serialized = self.transport.get_object(objectId)
+            if serialized is None:
+                return None
+            objJson = json.loads(serialized)
+            closure = objJson.get("__closure") or {}
+            if closure and not all(self.transport.has_objects(list(closure)).values()):
+                return None
+            return SentObjectReference(
+                referencedId=objectId,
+                referencedType=objJson.get("speckle_type"),
+                closure=closure,
+            )
+        except Exception:
+            return None
+
+    def close(self):
+        self.connection.close()
+
+
+def featureCacheKey(appId: str, layerStamp: str, rendererValue: Any = None) -> str:
+    """Key of the converted feature: its content hash, the layer conversion settings and
+    the value of the renderer field, which may not be one of the sent attributes"""
+    return hashlib.sha1(
+        (appId + layerStamp + repr(rendererValue)).encode("utf-8")
+    ).hexdigest()
+
+
+def layerConversionStamp(layer, renderer: Any, dataStorage) -> str:
+    """Hash of everything besides feature content that changes the converted features:
+    project CRS, offsets/rotation, renderer and layer send options
+    """
+    context = getConversionContext(dataStorage)
+    layer_settings = getattr(dataStorage, "layer_settings", None) or {}
+    data = repr(
+        (
+            context["key"] if context is not None else None,
+            json.dumps(renderer, sort_keys=True, default=str),
+            sorted(layer_settings.get(layer.dataSource, {}).items()),
+        )
+    )
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def getSentObjectsCache(dataStorage) -> Union[SentObjectsCache, None]:
+    """Returns the sent objects record for the current send, opening it if needed; None if unavailable"""
+    context = getConversionContext(dataStorage)
+    if context is None:
+        return None
+    if "sentObjects" not in context:
+        if not referencesSupported():
+            context["sentObjects"] = None
+            return None
+        try:
+            context["sentObjects"] = SentObjectsCache()
+        except Exception as e:
+            logToUser(
+                f"Sent objects record unavailable: {e}",
+                level=1,
+                func=inspect.stack()[0][3],
+            )
+            context["sentObjects"] = None
+    return context["sentObjects"]
+
+
+def closeSentObjectsCache(dataStorage) -> Union[SentObjectsCache, None]:
+    """Closes the sent objects record of the current send; returns it for the reuse counts"""
+    context = getattr(dataStorage, "conversionContext", None)
+    if context is None:
+        return None
+    cache = context.pop("sentObjects", None)
+    if cache is None:
+        return None
+    try:
+        cache.close()
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+    return cache
+
+
+def _referencedIds(objJson: Dict, transport: SQLiteTransport) -> List[Dict]:
+    """Returns JSON of the elements of the serialized collection, in order"""
+    elements = objJson.get("elements") or objJson.get("@elements") or []
+    result = []
+    for item in elements:
+        if isinstance(item, dict) and "referencedId" in item:
+            child = transport.get_object(item["referencedId"])
+            result.append(json.loads(child) if child is not None else {})
+        else:
+            result.append(item if isinstance(item, dict) else {})
+    return result
+
+
+def recordSentObjects(baseCollection: Base, objId: str, streamId: str, dataStorage):
+    """Matches the converted features with their object ids in the local Speckle cache after
+    sending, and records them for the next send to the stream
+    """
+    try:
+        featureKeys = getattr(dataStorage, "sentFeatureKeys", None)
+        dataStorage.sentFeatureKeys = None
+        if not featureKeys or streamId is None:
+            return
+        transport = SQLiteTransport()
+        rootJson = transport.get_object(objId)
+        if rootJson is None:
+            return
+
+        objectIds = {}
+        stack = [(baseCollection, json.loads(rootJson))]
+        while stack:
+            collection, collectionJson = stack.pop()
+            elements = getattr(collection, "elements", None)
+            if not isinstance(elements, list):
+                continue
+            keys = featureKeys.get(id(collection))
+            if keys is not None:  # layer: only ids of the features are needed
+                elementsJson = collectionJson.get("elements") or []
+                for key, item in zip(keys, elementsJson):
+                    if not isinstance(item, dict):
+                        continue
+                    elementId = item.get("referencedId") or item.get("id")
+                    if key is not None and elementId is not None:
+                        objectIds[key] = elementId
+                continue
+            for child, childJson in zip(
+                elements, _referencedIds(collectionJson, transport)
+            ):
+                stack.append((child, childJson))
+
+        cache = SentObjectsCache()
+        try:
+            cache.put(streamId, objectIds)
+        finally:
+            cache.close()
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
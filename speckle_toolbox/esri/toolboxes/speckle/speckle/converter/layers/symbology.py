@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from datetime import datetime
 import json
 from typing import Any, List, Tuple, Union
@@ -26,6 +27,8 @@ from specklepy.objects.GIS.layers import Layer, VectorLayer, RasterLayer
 from speckle.speckle.utils.panel_logging import logToUser
 from speckle.speckle.plugin_utils.helpers import findOrCreatePath
 
+DEFAULT_FEATURE_COLOR = (100 << 16) + (100 << 8) + 100  # grey, when the renderer gives no color
+
 
 def jsonFromLayerStyle(layerArcgis, path_style):
     # write updated renderer to file and get layerStyle variable
@@ -867,6 +870,156 @@ def rendererToSpeckle(project: ArcGISProject, active_map, arcLayer, rasterFeat:
         return None
 
 
+def readLayerFieldValues(arcLayer: arcLayer, attribute: str) -> Dict[int, Any]:
+    """Reads the values of one field for all features, by OID"""
+    with arcpy.da.SearchCursor(
+        arcLayer.dataSource, ["OID@", attribute]
+    ) as rows_attributes:
+        return {oid: value for oid, value in rows_attributes}
+
+
+def rendererColorTable(
+    arcLayer: arcLayer, fieldnames: List[str]
+) -> Union[Dict[str, Any], None]:
+    """Builds the lookup from the classification value to the feature color, once per layer"""
+    colorTable = None
+    try:
+        sym = arcLayer.symbology
+        if not hasattr(sym, "renderer"):
+            return None
+        renderer = sym.renderer
+
+        if renderer.type == "SimpleRenderer":
+            attribute = None
+            colorTable = {
+                "type": renderer.type,
+                "default": symbol_color_to_speckle(renderer.symbol.color),
+            }
+
+        elif renderer.type == "UniqueValueRenderer":
+            attribute = renderer.fields[0]
+            colorTable = {
+                "type": renderer.type,
+                "default": symbol_color_to_speckle(renderer.defaultSymbol.color),
+                "values": {},
+            }
+            for grp in renderer.groups:
+                for itm in grp.items:
+                    value = itm.values[0][0]
+                    key = None if str(value) == "<Null>" else str(value)
+                    # first matching class wins
+                    if key not in colorTable["values"]:
+                        colorTable["values"][key] = symbol_color_to_speckle(
+                            itm.symbol.color
+                        )
+
+        elif (
+            renderer.type == "GraduatedColorsRenderer"
+            or renderer.type == "GraduatedSymbolsRenderer"
+        ):
+            attribute = renderer.classificationField
+            classBreaks = []
+            for itm in renderer.classBreaks:
+                try:
+                    classBreaks.append(
+                        (float(itm.upperBound), symbol_color_to_speckle(itm.symbol.color))
+                    )
+                except:
+                    pass
+            classBreaks.sort(key=lambda x: x[0])
+            colorTable = {
+                "type": renderer.type,
+                "default": DEFAULT_FEATURE_COLOR,
+                "upperBounds": [x[0] for x in classBreaks],
+                "colors": [x[1] for x in classBreaks],
+            }
+
+        elif renderer.type == "UnclassedColorsRenderer":
+            attribute = renderer.field
+            row_attrs = [
+                x
+                for x in readLayerFieldValues(arcLayer, attribute).values()
+                if x is not None
+            ]
+            if len(row_attrs) == 0:
+                return None
+            row_min = min(row_attrs)
+            row_range = max(row_attrs) - row_min
+
+            # run as gradient colors, one class per unique value
+            sym.updateRenderer("GraduatedColorsRenderer")
+            sym.renderer.classificationField = attribute
+            sym.renderer.breakCount = len(set(row_attrs))
+
+            classBreaks = []
+            for itm in sym.renderer.classBreaks:
+                try:
+                    rgb = 255 - int((itm.upperBound - row_min) / row_range * 255)
+                    classBreaks.append(
+                        (float(itm.upperBound), (rgb << 16) + (rgb << 8) + rgb)
+                    )
+                except:
+                    pass
+            classBreaks.sort(key=lambda x: x[0])
+            colorTable = {
+                "type": renderer.type,
+                "default": DEFAULT_FEATURE_COLOR,
+                "upperBounds": [x[0] for x in classBreaks],
+                "colors": [x[1] for x in classBreaks],
+            }
+        else:
+            return None
+
+        colorTable["fieldIndex"] = None
+        colorTable["rowValues"] = None
+        if attribute is not None:
+            names = [name.lower() for name in fieldnames]
+            if attribute.lower() in names:
+                colorTable["fieldIndex"] = names.index(attribute.lower())
+            else:  # e.g. joined field, not part of the layer fields
+                colorTable["rowValues"] = readLayerFieldValues(arcLayer, attribute)
+
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return None
+    return colorTable
+
+
+def featureRendererValue(
+    colorTable: Union[Dict[str, Any], None], oid: int, attr_list: Union[List, Tuple]
+) -> Any:
+    """Returns the value of the renderer field for the feature, None for single symbol renderers"""
+    if colorTable is None or colorTable["type"] == "SimpleRenderer":
+        return None
+    if colorTable["fieldIndex"] is not None:
+        return attr_list[colorTable["fieldIndex"]]
+    return colorTable["rowValues"].get(oid)
+
+
+def featureColorFromTable(
+    colorTable: Dict[str, Any], oid: int, attr_list: Union[List, Tuple]
+) -> int:
+    """Returns the feature color from the prebuilt renderer color table"""
+    col = colorTable["default"]
+    try:
+        if colorTable["type"] == "SimpleRenderer":
+            return col
+
+        value = featureRendererValue(colorTable, oid, attr_list)
+
+        if colorTable["type"] == "UniqueValueRenderer":
+            key = None if value is None else str(value)
+            return colorTable["values"].get(key, col)
+
+        # graduated: first class with the upper bound not below the value
+        k = bisect_left(colorTable["upperBounds"], float(value))
+        if k < len(colorTable["colors"]):
+            col = colorTable["colors"][k]
+    except:
+        pass
+    return col
+
+
 def featureColorfromNativeRenderer(index: int, arcLayer: arcLayer) -> int:
     # case with one color for the entire layer
     # try:
@@ -17,6 +17,7 @@ import inspect
 from PyQt5.QtGui import QColor
 
 from speckle.speckle.converter.layers.emptyLayerTemplates import createGroupLayer
+from speckle.speckle.converter.features.feature_reader import DEFAULT_FEATURE_READER
 from speckle.speckle.plugin_utils.helpers import findOrCreatePath, SYMBOL
 from speckle.speckle.utils.panel_logging import logToUser
 from speckle.speckle.plugin_utils.helpers import validateNewFclassName
@@ -36,34 +37,134 @@ ATTRS_REMOVE = [
     "displayValue",
 ]
 
+# send options, which can be overwritten per layer in dataStorage.layer_settings
+LAYER_SETTINGS_DEFAULTS = {
+    "raster_mesh_mode": "cells",  # "cells": 4 vertices per cell, "shared": 1 vertex per grid node
+    "raster_cell_budget": None,  # max cells in the raster display mesh (one block factor), None for full resolution
+    "raster_lod_method": None,  # "mean", "mode" or "nearest"; None to pick from the colorizer
+    "raster_lod_values": False,  # also send downsampled band values instead of the full ones
+    "raster_merge_cells": False,  # greedy run merging of same-color cells of unique value rasters
+    "mesh_simplify_tolerance": 0.0,  # polygon display mesh simplification, in map units
+    "mesh_vertex_budget": 250,  # max vertices of a polygon display mesh (~2.5 ms of earcut with voids), None for no limit
+    "mesh_cache": True,  # reuse polygon display meshes of unchanged geometries between sends
+    "feature_chunks": None,  # OID range chunks converted in parallel processes, None to split by size
+    "feature_reader": DEFAULT_FEATURE_READER,  # "cursor" (arcpy geometry), "wkb" or "json" (decoded into arrays)
+}
+# value type (or list of choices) of each option, and its label in the layer send settings
+LAYER_SETTINGS_TYPES = {
+    "raster_mesh_mode": ["cells", "shared"],
+    "raster_cell_budget": int,
+    "raster_lod_method": [None, "mean", "mode", "nearest"],
+    "raster_lod_values": bool,
+    "raster_merge_cells": bool,
+    "mesh_simplify_tolerance": float,
+    "mesh_vertex_budget": int,
+    "mesh_cache": bool,
+    "feature_chunks": int,
+    "feature_reader": ["cursor", "wkb", "json"],
+}
+LAYER_SETTINGS_LABELS = {
+    "raster_mesh_mode": "Raster mesh vertices",
+    "raster_cell_budget": "Raster max cells",
+    "raster_lod_method": "Raster downsampling",
+    "raster_lod_values": "Send downsampled band values",
+    "raster_merge_cells": "Merge same-color raster cells",
+    "mesh_simplify_tolerance": "Polygon mesh tolerance",
+    "mesh_vertex_budget": "Polygon mesh max vertices",
+    "mesh_cache": "Cache polygon meshes",
+    "feature_chunks": "Parallel feature chunks",
+    "feature_reader": "Feature geometry reader",
+}
+# project-wide worker processes converting feature layers (dataStorage.conversion_workers),
+# saved with the layer settings; 0 or 1 converts on the current thread
+CONVERSION_WORKERS = 0
+# project-wide limit of received layers waiting for the main thread to be added
+# (dataStorage.layers_in_flight), saved with the layer settings
+LAYERS_IN_FLIGHT = 4
+
+
+def getLayerSetting(dataStorage, layer, key: str) -> Any:
+    """Returns the layer send option, or the default value"""
+    default = LAYER_SETTINGS_DEFAULTS.get(key)
+    try:
+        layer_settings = getattr(dataStorage, "layer_settings", None)
+        if layer_settings is None:
+            return default
+        return layer_settings.get(layer.dataSource, {}).get(key, default)
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return default
+
+
+def setLayerSetting(dataStorage, layer, key: str, value: Any):
+    """Overwrites the send option for the given layer; the default value removes the overwrite"""
+    try:
+        if key not in LAYER_SETTINGS_DEFAULTS:
+            logToUser(f"Unknown layer setting '{key}'", level=1)
+            return
+        if getattr(dataStorage, "layer_settings", None) is None:
+            dataStorage.layer_settings = {}
+        settings = dataStorage.layer_settings.setdefault(layer.dataSource, {})
+        if value == LAYER_SETTINGS_DEFAULTS[key]:
+            settings.pop(key, None)
+        else:
+            settings[key] = value
+        if len(settings) == 0:
+            dataStorage.layer_settings.pop(layer.dataSource)
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+
+
+def parseLayerSetting(key: str, text: str) -> Any:
+    """Converts the text entered for the send option to its value; empty text is None.
+    Raises ValueError if the text is not valid for the option.
+    """
+    valueType = LAYER_SETTINGS_TYPES[key]
+    text = text.strip()
+    if isinstance(valueType, list):
+        value = None if text in ("", "None") else text
+        if value not in valueType:
+            raise ValueError(f"'{text}' is not one of {valueType}")
+        return value
+    if text == "":
+        return None
+    if valueType is bool:
+        return text.lower() in ("true", "1", "yes")
+    value = valueType(text)
+    if value < 0:
+        raise ValueError(f"'{text}' is negative")
+    return value
+
 
 def generate_qgis_app_id(
-    base: Base,
     layer,
-    f,
-):
-    """Generate unique ID for Vector feature."""
-    return ""
+    geometry,
+    attributes: List[Any],
+) -> str:
+    """Generate unique ID for Vector feature: stable hash of the layer data source,
+    geometry and attribute values. Same content gives the same ID between sends.
+    """
     try:
-        fieldnames = [str(field.name()) for field in layer.fields()]
-        props = [str(f[prop]) for prop in fieldnames]
-        try:
-            geoms = f.geometry()
-        except Exception as e:
-            geoms = ""
-
-        id_data: str = (
-            layer.id()
-            + str(layer.wkbType())
-            + str(fieldnames)
-            + str(props)
-            + str(geoms)
-        )
-        return hashlib.md5(id_data.encode("utf-8")).hexdigest()
+        digest = hashlib.sha1()
+        digest.update(str(layer.dataSource).encode("utf-8"))
+        if geometry is None:
+            pass
+        elif hasattr(geometry, "coords"):  # decoded GeometryArrays
+            digest.update(geometry.geomType.encode("utf-8"))
+            digest.update(geometry.coords.tobytes())
+            digest.update(geometry.partOffsets.tobytes())
+            digest.update(geometry.polygonOffsets.tobytes())
+        else:
+            try:
+                digest.update(bytes(geometry.WKB))
+            except Exception:
+                digest.update(geometry.JSON.encode("utf-8"))
+        digest.update(repr(list(attributes)).encode("utf-8"))
+        return digest.hexdigest()
 
     except Exception as e:
         logToUser(
-            f"Application ID not generated for feature in layer {layer.name()}: {e}",
+            f"Application ID not generated for feature in layer {layer.name}: {e}",
             level=1,
         )
         return ""
@@ -522,6 +623,86 @@ def get_scale_factor(units: str) -> float:
     return 1.0
 
 
+def createConversionContext(dataStorage, projectCRS=None) -> Dict[str, Any]:
+    """Creates the cache of Describe results, spatial references and transformations for a send.
+    Transformations are kept between sends, unless the map CRS, offsets or rotation changed.
+    """
+    try:
+        if projectCRS is None:
+            projectCRS = dataStorage.project.activeMap.spatialReference
+        key = (
+            projectCRS.exportToString(),
+            dataStorage.crs_offset_x,
+            dataStorage.crs_offset_y,
+            dataStorage.crs_rotation,
+        )
+        previous = getattr(dataStorage, "conversionContext", None)
+        transforms = {}
+        if previous is not None and previous["key"] == key:
+            transforms = previous["transforms"]
+
+        context = {
+            "key": key,
+            "projectCRS": projectCRS,
+            "projectCRSFromText": arcpy.SpatialReference(
+                text=projectCRS.exportToString()
+            ),
+            "midSr": arcpy.SpatialReference("WGS 1984"),  # GCS_WGS_1984
+            "describe": {},
+            "transforms": transforms,
+            "bulkTransforms": {},
+        }
+        dataStorage.conversionContext = context
+        return context
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3])
+        return None
+
+
+def getConversionContext(dataStorage) -> Dict[str, Any]:
+    """Returns the conversion context of the current send, creating it if needed"""
+    context = getattr(dataStorage, "conversionContext", None)
+    if context is None:
+        context = createConversionContext(dataStorage)
+    return context
+
+
+def invalidateConversionContext(dataStorage):
+    """Drops all cached Describe results and transformations, e.g. after CRS changes"""
+    dataStorage.conversionContext = None
+
+
+def getLayerDescribe(layer, dataStorage):
+    """Returns arcpy.Describe of the layer data source, cached for the send"""
+    context = getConversionContext(dataStorage)
+    if context is None:
+        return arcpy.Describe(layer.dataSource)
+    data = context["describe"].get(layer.dataSource)
+    if data is None:
+        data = arcpy.Describe(layer.dataSource)
+        context["describe"][layer.dataSource] = data
+    return data
+
+
+def findTransformationCached(
+    geomType,
+    layer_sr: arcpy.SpatialReference,
+    projectCRS: arcpy.SpatialReference,
+    selectedLayer: arcLayer,
+    dataStorage,
+) -> Tuple:
+    """findTransformation, resolved once per layer spatial reference and geometry type"""
+    context = getConversionContext(dataStorage)
+    if context is None:
+        return findTransformation(geomType, layer_sr, projectCRS, selectedLayer)
+    key = (selectedLayer.dataSource, layer_sr.name, geomType)
+    x_form = context["transforms"].get(key)
+    if x_form is None:
+        x_form = findTransformation(geomType, layer_sr, projectCRS, selectedLayer)
+        context["transforms"][key] = x_form
+    return x_form
+
+
 def findTransformation(
     geomType,
     layer_sr: arcpy.SpatialReference,
@@ -630,13 +811,21 @@ def findTransformation(
 def apply_reproject(f_shape, transforms: Tuple, dataStorage):
     try:
         layer_sr, tr0, tr1, tr2, tr_custom = transforms
-        projectCRS = dataStorage.project.activeMap.spatialReference
+        context = getConversionContext(dataStorage)
+        projectCRS = context["projectCRS"]
+        if (
+            layer_sr.name == projectCRS.name
+            and tr0 is None
+            and tr1 is None
+            and tr_custom is None
+        ):  # already in the project CRS
+            return f_shape
         # reproject geometry using chosen transformstion(s)
         if tr0 is not None:
             ptgeo1 = f_shape.projectAs(projectCRS, tr0)
             f_shape = ptgeo1
         elif tr1 is not None and tr2 is not None:
-            midSr = arcpy.SpatialReference("WGS 1984")
+            midSr = context["midSr"]
             ptgeo1 = f_shape.projectAs(midSr, tr1)
             ptgeo2 = ptgeo1.projectAs(projectCRS, tr2)
             f_shape = ptgeo2
@@ -647,7 +836,7 @@ def apply_reproject(f_shape, transforms: Tuple, dataStorage):
                 f_shape = ptgeo1
             """
         else:
-            projectCRS = arcpy.SpatialReference(text=projectCRS.exportToString())
+            projectCRS = context["projectCRSFromText"]
             ptgeo1 = f_shape.projectAs(projectCRS)
             f_shape = ptgeo1
     except Exception as e:
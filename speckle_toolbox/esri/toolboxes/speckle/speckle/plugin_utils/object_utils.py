@@ -1,4 +1,3 @@
-import time
 from typing import Any, Callable, List, Optional
 
 import inspect
@@ -241,7 +240,6 @@ def loopObj(
 
                         except:
                             matrix = None
-                        time.sleep(0.3)
                     except Exception as e:
                         print(f"ERROR: {e}")
                 loopVal(
@@ -306,7 +304,6 @@ def loopVal(
                             geometryLayerToNative(
                                 value, name, val_id, streamBranch, plugin
                             )
-                            time.sleep(0.3)
                             objectListConverted += 1
                     except:
                         try:
@@ -317,14 +314,12 @@ def loopVal(
                                 geometryLayerToNative(
                                     value, name, val_id, streamBranch, plugin
                                 )
-                                time.sleep(0.3)
                                 objectListConverted += 1
                         except:
                             pass
                 elif item.speckle_type and item.speckle_type.endswith(".ModelCurve"):
                     if item["baseCurve"] is not None:
                         geometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                        time.sleep(0.3)
                         break
                 elif (
                     plugin.dataStorage.latestHostApp.lower().endswith("excel")
@@ -332,7 +327,6 @@ def loopVal(
                 ):
                     # should be before the check for "BuiltElements"
                     nonGeometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                    time.sleep(0.3)
                     break
                 elif item.speckle_type and (
                     item.speckle_type == "Objects.Geometry.Mesh"
@@ -340,7 +334,6 @@ def loopVal(
                     or item.speckle_type.startswith("Objects.BuiltElements.")
                 ):
                     geometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                    time.sleep(0.3)
                     break
                 elif (
                     item.speckle_type
@@ -349,7 +342,6 @@ def loopVal(
                     and item.speckle_type.startswith("Objects.Geometry.")
                 ):  # or item.speckle_type == 'Objects.BuiltElements.Alignment'):
                     geometryLayerToNative(value, name, val_id, streamBranch, plugin)
-                    time.sleep(0.3)
                     break
                 elif item.speckle_type:
                     try:
@@ -357,7 +349,6 @@ def loopVal(
                             geometryLayerToNative(
                                 value, name, val_id, streamBranch, plugin
                             )
-                            time.sleep(0.3)
                             break
                     except Exception as e:
                         pass
@@ -1,7 +1,14 @@
 
+import functools
+import inspect
+import queue
 import sys
 import trace
 import threading
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from speckle.speckle.converter.layers.utils import LAYERS_IN_FLIGHT
+from speckle.speckle.utils.panel_logging import logToUser
 
 class KThread(threading.Thread):
     """A subclass of threading.Thread, with a kill()
@@ -60,4 +67,157 @@ class KillableThread(threading.Thread):
         print("Killing Thread")
 
     def kill(self):
-        self._kill.set()
\ No newline at end of file
+        self._kill.set()
+
+
+PIPELINE_BATCH_SIZE = 500  # converted items handed to the writer at once
+PIPELINE_QUEUE_SIZE = 4  # batches waiting for the writer; bounds the memory of converted items
+
+
+def convertInBackground(
+    items: Iterable,
+    convert: Callable[[Any], Any],
+    batchSize: int = PIPELINE_BATCH_SIZE,
+    queueSize: int = PIPELINE_QUEUE_SIZE,
+) -> Iterator[List[Tuple[Any, Any]]]:
+    """Converts the items in a worker thread, yielding batches of (item, result) in the item order
+    while the conversion continues. The converter waits when queueSize batches are not consumed yet.
+    Errors of the conversion are raised in the consuming thread.
+    """
+    batches = queue.Queue(maxsize=queueSize)
+    stop = threading.Event()
+    done = object()
+
+    def put(value) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            batch = []
+            for item in items:
+                if stop.is_set():
+                    return
+                batch.append((item, convert(item)))
+                if len(batch) >= batchSize:
+                    if not put(batch):
+                        return
+                    batch = []
+            if len(batch) > 0 and not put(batch):
+                return
+            put(done)
+        except BaseException as e:
+            put(e)
+
+    producer = threading.Thread(target=produce, name="speckle_pipeline", daemon=True)
+    producer.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is done:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield batch
+    finally:
+        stop.set()  # consumer stopped early: let the producer exit
+        producer.join()
+
+
+TICKET_WAIT_TIMEOUT = 600  # seconds to wait for the main thread before continuing anyway
+
+
+class LayerTicket:
+    """Completion of a layer handed to the main thread; resolved by the signal handler"""
+
+    def __init__(self, dispatcher: "MainThreadDispatcher", hasSlot: bool = True):
+        self.dispatcher = dispatcher
+        self.hasSlot = hasSlot
+        self.done = threading.Event()
+
+    def resolve(self):
+        if not self.done.is_set():
+            self.done.set()
+            if self.hasSlot:
+                self.dispatcher.slots.release()
+
+
+class MainThreadDispatcher:
+    """Limits the layers waiting for the main thread: emitting blocks until one of
+    maxInFlight earlier layers is added. Signals are handled in the order they are emitted.
+    """
+
+    def __init__(self, maxInFlight: int = LAYERS_IN_FLIGHT):
+        self.maxInFlight = max(1, int(maxInFlight))
+        self.slots = threading.Semaphore(self.maxInFlight)
+        self.tickets = []
+
+    def _acquire(self, timeout: float) -> bool:
+        waited = 0.0
+        while waited < timeout:  # short waits, so the thread can still be killed (cancel)
+            if self.slots.acquire(timeout=0.1):
+                return True
+            waited += 0.1
+        return False
+
+    def emit(self, signal, obj: dict) -> LayerTicket:
+        """Adds a ticket to the signal arguments and emits it once a slot is free"""
+        hasSlot = self._acquire(TICKET_WAIT_TIMEOUT)
+        if not hasSlot:
+            logToUser(
+                "Main thread busy, continuing without waiting",
+                level=1,
+                func=inspect.stack()[0][3],
+            )
+        ticket = LayerTicket(self, hasSlot)
+        self.tickets = [t for t in self.tickets if not t.done.is_set()] + [ticket]
+        obj["ticket"] = ticket
+        signal.emit(obj)
+        return ticket
+
+    def wait(self, timeout: float = TICKET_WAIT_TIMEOUT) -> bool:
+        """Waits until all emitted layers are added"""
+        for ticket in self.tickets:
+            waited = 0.0
+            while not ticket.done.wait(0.1):
+                waited += 0.1
+                if waited >= timeout:
+                    return False
+        return True
+
+
+def getMainThreadDispatcher(dataStorage) -> MainThreadDispatcher:
+    """Returns the dispatcher of the current receive, creating it if needed"""
+    dispatcher = getattr(dataStorage, "mainThreadDispatcher", None)
+    if dispatcher is None:
+        dispatcher = MainThreadDispatcher(
+            getattr(dataStorage, "layers_in_flight", LAYERS_IN_FLIGHT)
+            or LAYERS_IN_FLIGHT
+        )
+        dataStorage.mainThreadDispatcher = dispatcher
+    return dispatcher
+
+
+def emitToMainThread(plugin, signal, obj: dict) -> LayerTicket:
+    """Emits the layer to the main thread handler, waiting while too many layers are in flight"""
+    return getMainThreadDispatcher(plugin.dataStorage).emit(signal, obj)
+
+
+def resolvesTicket(handler: Callable[[dict], Any]) -> Callable[[dict], Any]:
+    """Decorator of the main thread handlers: resolves the ticket of the signal when done"""
+
+    @functools.wraps(handler)
+    def wrapper(obj: dict):
+        try:
+            return handler(obj)
+        finally:
+            ticket = obj.get("ticket") if isinstance(obj, dict) else None
+            if ticket is not None:
+                ticket.resolve()
+
+    return wrapper
@@ -38,12 +38,16 @@ from arcpy._mp import ArcGISProject, Map
 from arcpy._mp import Layer as arcLayer
 from specklepy.objects.units import get_units_from_string
 
-from speckle.speckle.plugin_utils.threads import KThread
+from speckle.speckle.plugin_utils.threads import KThread, getMainThreadDispatcher
 from speckle.speckle.plugin_utils.object_utils import callback, traverseObject
 from speckle.speckle.converter.layers import (
+    getAllProjLayers,
     getLayersWithStructure,
 )
-from speckle.speckle.converter.layers.utils import findAndClearLayerGroup
+from speckle.speckle.converter.layers.utils import (
+    findAndClearLayerGroup,
+    invalidateConversionContext,
+)
 from speckle.speckle.utils.validation import (
     tryGetStream,
     tryGetClient,
@@ -62,6 +66,11 @@ from speckle.speckle.converter.layers.layer_conversions import (
     addVectorMainThread,
     convertSelectedLayersToSpeckle,
 )
+from speckle.speckle.converter.layers.layer_cache import clearLayerCache
+from speckle.speckle.converter.layers.sent_objects import (
+    recordSentObjects,
+    sendWithReferences,
+)
 
 from speckle.specklepy_qt_ui.qt_ui.widget_add_stream import AddStreamModalDialog
 from speckle.specklepy_qt_ui.qt_ui.widget_create_stream import CreateStreamModalDialog
@@ -468,6 +477,7 @@ class SpeckleGIS:
 
             self.dataStorage.latestActionReport = []
             self.dataStorage.latestActionFeaturesReport = []
+            self.dataStorage.currentStreamId = current_active_stream[0].stream_id
             base_obj = Collection(
                 units=units,
                 collectionType="ArcGIS commit",
@@ -533,9 +543,12 @@ class SpeckleGIS:
         try:
             self.dockwidget.signal_remove_btn_url.emit("cancel")
             time_start_transfer = datetime.now()
-            # this serialises the block and sends it to the transport
-            objId = operations.send(base=base_obj, transports=[transport])
+            # this serialises the block and sends it to the transport,
+            # with unchanged features as references to the cached objects
+            objId = sendWithReferences(base_obj, [transport])
             time_end_transfer = datetime.now()
+            # unchanged features are not converted again on the next send
+            recordSentObjects(base_obj, objId, streamId, self.dataStorage)
         except SpeckleException as e:
             logToUser(
                 "Error sending data: " + str(e),
@@ -809,7 +822,9 @@ class SpeckleGIS:
             self.dataStorage.latestActionLayers = []
             self.dataStorage.latestActionReport = []
 
+            self.dataStorage.mainThreadDispatcher = None
             traverseObject(self, commitObj, callback, check, str(newGroupName), "")
+            getMainThreadDispatcher(self.dataStorage).wait()
             logToUser(
                 "👌 Data received",
                 level=0,
@@ -836,6 +851,7 @@ class SpeckleGIS:
             get_survey_point,
             get_project_layer_selection,
             get_project_saved_layers,
+            get_layer_settings,
         )
 
         self.dataStorage = DataStorage()
@@ -848,6 +864,7 @@ class SpeckleGIS:
             self.active_stream = None
             get_project_streams(self)
             get_survey_point(self)
+            get_layer_settings(self)
             # get_project_saved_layers(self)
             # get_project_layer_selection(self)
 
@@ -865,6 +882,7 @@ class SpeckleGIS:
                 get_survey_point,
                 get_rotation,
                 get_crs_offsets,
+                get_layer_settings,
                 get_project_saved_layers,
             )
 
@@ -897,6 +915,8 @@ class SpeckleGIS:
                     self.dockwidget.crsSettings.clicked.connect(
                         self.customCRSDialogCreate
                     )
+                    self.dockwidget.addClearCacheButton(self)
+                    self.dockwidget.addLayerSettingsButton(self)
 
                     self.dockwidget.signal_1.connect(addVectorMainThread)
                     self.dockwidget.signal_2.connect(addBimMainThread)
@@ -917,6 +937,7 @@ class SpeckleGIS:
             get_rotation(self)
             get_survey_point(self)
             get_crs_offsets(self)
+            get_layer_settings(self)
 
             self.dockwidget.run(self)
             self.dockwidget.saveLayerSelection.clicked.connect(
@@ -931,6 +952,40 @@ class SpeckleGIS:
         except Exception as e:
             logToUser(str(e), level=2, func=inspect.stack()[0][3])
 
+    def layerSettingsDialogCreate(self):
+        try:
+            from speckle.ui_widgets.layer_settings import LayerSettingsDialog
+
+            layers = getAllProjLayers(self)
+            if layers is None or len(layers) == 0:
+                logToUser(
+                    "No layers in the project Active Map",
+                    level=1,
+                    func=inspect.stack()[0][3],
+                    plugin=self.dockwidget,
+                )
+                return
+            self.dockwidget.layer_settings_modal = LayerSettingsDialog(
+                None, self, layers
+            )
+            self.dockwidget.layer_settings_modal.show()
+        except Exception as e:
+            logToUser(e, level=2, func=inspect.stack()[0][3], plugin=self.dockwidget)
+            return
+
+    def onClearCacheClicked(self):
+        """Drops layers converted earlier in the session and the cached transformations"""
+        try:
+            clearLayerCache(self.dataStorage)
+            invalidateConversionContext(self.dataStorage)
+            logToUser(
+                "Conversion cache cleared, all layers will be converted on the next send",
+                level=0,
+                plugin=self.dockwidget,
+            )
+        except Exception as e:
+            logToUser(str(e), level=2, func=inspect.stack()[0][3])
+
     def onStreamAddButtonClicked(self):
         try:
             self.add_stream_modal = AddStreamModalDialog(None)
@@ -1170,6 +1225,8 @@ class SpeckleGIS:
         if index == 0:  # create custom CRS
             self.crsOffsetsApply()
         self.applyRotation()
+        # cached transformations are no longer valid
+        invalidateConversionContext(self.dataStorage)
         self.dockwidget.custom_crs_modal.close()
 
     def applyRotation(self):
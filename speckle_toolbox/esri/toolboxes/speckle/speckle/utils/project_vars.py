@@ -3,6 +3,7 @@ import arcpy
 from arcpy._mp import ArcGISProject, Map, Layer as arcLayer
 from arcpy.management import CreateTable
 
+import json
 import os.path
 
 from specklepy.api.credentials import Account, get_local_accounts
@@ -23,6 +24,7 @@ from speckle.speckle.utils.validation import tryGetStream
 
 # from speckle.speckle.speckle_arcgis import SpeckleGIS
 from speckle.speckle.converter.layers import getAllProjLayers
+from speckle.speckle.converter.layers.utils import CONVERSION_WORKERS, LAYERS_IN_FLIGHT
 from speckle.speckle.utils.panel_logging import logToUser
 
 FIELDS = [
@@ -31,7 +33,9 @@ FIELDS = [
     "lat_lon",
     "crs_rotation",
     "crs_offsets",
+    "layer_settings",
 ]
+FIELD_LENGTHS = {"layer_settings": 65535}  # JSON of all layer send options
 
 
 def get_project_streams(plugin: "SpeckleGIS", content: str = None):
@@ -324,6 +328,75 @@ def set_crs_offsets(plugin):
         return False
 
 
+def get_layer_settings(plugin):
+    try:
+        print("get_layer_settings")
+        dataStorage = plugin.dataStorage
+        project = plugin.dataStorage.project
+        table = findOrCreateSpeckleTable(project, plugin)
+        if table is None:
+            return
+
+        rows = arcpy.da.SearchCursor(table, "layer_settings")
+        content = ""
+        for x in rows:
+            content = x[0]
+            break
+
+        dataStorage.layer_settings = {}
+        dataStorage.conversion_workers = CONVERSION_WORKERS
+        dataStorage.layers_in_flight = LAYERS_IN_FLIGHT
+        if content is not None and content != "":
+            settings = json.loads(content)
+            dataStorage.layer_settings = settings.get("layers", {})
+            dataStorage.conversion_workers = settings.get(
+                "conversion_workers", CONVERSION_WORKERS
+            )
+            dataStorage.layers_in_flight = settings.get(
+                "layers_in_flight", LAYERS_IN_FLIGHT
+            )
+
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
+
+
+def set_layer_settings(plugin):
+    try:
+        dataStorage = plugin.dataStorage
+        project = dataStorage.project
+        settings = {
+            "layers": getattr(dataStorage, "layer_settings", None) or {},
+            "conversion_workers": getattr(
+                dataStorage, "conversion_workers", CONVERSION_WORKERS
+            ),
+            "layers_in_flight": getattr(
+                dataStorage, "layers_in_flight", LAYERS_IN_FLIGHT
+            ),
+        }
+        content = json.dumps(settings)
+        if len(content) > FIELD_LENGTHS["layer_settings"]:
+            logToUser(
+                "Too many layer settings to save in the project, they will only apply to this session",
+                level=1,
+                func=inspect.stack()[0][3],
+                plugin=plugin.dockwidget,
+            )
+            return False
+
+        table = findOrCreateSpeckleTable(project, plugin)
+        if table is not None:
+            with arcpy.da.UpdateCursor(table, ["layer_settings"]) as cursor:
+                for row in cursor:  # just one row
+                    cursor.updateRow([content])
+                    break
+            del cursor
+        return True
+
+    except Exception as e:
+        logToUser(str(e), level=2, func=inspect.stack()[0][3], plugin=plugin.dockwidget)
+        return False
+
+
 def get_project_saved_layers(plugin):
 
     try:
@@ -524,7 +597,9 @@ def findOrCreateSpeckleTable(project: ArcGISProject, plugin) -> Union[str, None]
             try:
                 table = CreateTable(path, "speckle_gis")
                 for f in FIELDS:
-                    arcpy.management.AddField(table, f, "TEXT")
+                    arcpy.management.AddField(
+                        table, f, "TEXT", field_length=FIELD_LENGTHS.get(f)
+                    )
                     # arcpy.management.AddField(table, "project_layer_selection", "TEXT")
                     # arcpy.management.AddField(table, "lat_lon", "TEXT")
 
@@ -574,7 +649,9 @@ def findOrCreateTableField(table: str, field: str):
         #    del cursor
 
     except Exception as e:  # if field doesn't exist
-        arcpy.management.AddField(table, field, "TEXT")
+        arcpy.management.AddField(
+            table, field, "TEXT", field_length=FIELD_LENGTHS.get(field)
+        )
         # cursor = arcpy.da.InsertCursor(table, [field] )
         # cursor.insertRow([""])
         del cursor
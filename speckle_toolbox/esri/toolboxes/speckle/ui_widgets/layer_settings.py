@@ -0,0 +1,183 @@
+import inspect
+from typing import Any, Dict, List
+
+from PyQt5 import QtCore, QtWidgets
+
+from speckle.speckle.converter.layers.utils import (
+    CONVERSION_WORKERS,
+    LAYERS_IN_FLIGHT,
+    LAYER_SETTINGS_DEFAULTS,
+    LAYER_SETTINGS_LABELS,
+    LAYER_SETTINGS_TYPES,
+    getLayerSetting,
+    parseLayerSetting,
+    setLayerSetting,
+)
+from speckle.speckle.utils.panel_logging import logToUser
+
+
+class LayerSettingsDialog(QtWidgets.QDialog):
+    """Send options of each project layer, saved in the project"""
+
+    def __init__(self, parent=None, plugin=None, layers: List = None):
+        super(LayerSettingsDialog, self).__init__(
+            parent, QtCore.Qt.WindowStaysOnTopHint
+        )
+        self.setWindowTitle("Layer send settings")
+        self.layers = [l for l in (layers or []) if hasattr(l, "dataSource")]
+        self.plugin = plugin
+        self.dataStorage = plugin.dataStorage
+        self.inputs: Dict[str, QtWidgets.QWidget] = {}
+
+        layout = QtWidgets.QVBoxLayout(self)
+        projectForm = QtWidgets.QFormLayout()
+        self.workersInput = QtWidgets.QLineEdit()
+        self.workersInput.setPlaceholderText("Off")
+        self.workersInput.setToolTip(
+            "Feature layers are converted in this many processes; 0 or empty converts on the current thread"
+        )
+        projectForm.addRow("Worker processes (all layers)", self.workersInput)
+        self.inFlightInput = QtWidgets.QLineEdit()
+        self.inFlightInput.setPlaceholderText(str(LAYERS_IN_FLIGHT))
+        self.inFlightInput.setToolTip(
+            "Received layers converted ahead of the layers being added to the map"
+        )
+        projectForm.addRow("Layers in flight (receive)", self.inFlightInput)
+        layout.addLayout(projectForm)
+
+        self.layerDropdown = QtWidgets.QComboBox()
+        self.layerDropdown.addItems([l.name for l in self.layers])
+        layout.addWidget(self.layerDropdown)
+
+        form = QtWidgets.QFormLayout()
+        for key in LAYER_SETTINGS_DEFAULTS:
+            valueType = LAYER_SETTINGS_TYPES[key]
+            if isinstance(valueType, list):
+                widget = QtWidgets.QComboBox()
+                widget.addItems(["Auto" if c is None else c for c in valueType])
+            elif valueType is bool:
+                widget = QtWidgets.QCheckBox()
+            else:
+                widget = QtWidgets.QLineEdit()
+                widget.setPlaceholderText("No limit / auto")
+            widget.setToolTip(f"Default: {LAYER_SETTINGS_DEFAULTS[key]}")
+            self.inputs[key] = widget
+            form.addRow(LAYER_SETTINGS_LABELS[key], widget)
+        layout.addLayout(form)
+
+        self.dialog_button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Apply
+            | QtWidgets.QDialogButtonBox.RestoreDefaults
+            | QtWidgets.QDialogButtonBox.Close
+        )
+        layout.addWidget(self.dialog_button_box)
+        self.dialog_button_box.button(QtWidgets.QDialogButtonBox.Apply).clicked.connect(
+            self.applySettings
+        )
+        self.dialog_button_box.button(
+            QtWidgets.QDialogButtonBox.RestoreDefaults
+        ).clicked.connect(self.restoreDefaults)
+        self.dialog_button_box.button(QtWidgets.QDialogButtonBox.Close).clicked.connect(
+            self.close
+        )
+        self.layerDropdown.currentIndexChanged.connect(self.populateSettings)
+        self.populateSettings()
+
+    def currentLayer(self):
+        index = self.layerDropdown.currentIndex()
+        if index < 0 or index >= len(self.layers):
+            return None
+        return self.layers[index]
+
+    def showValue(self, key: str, value: Any):
+        widget = self.inputs[key]
+        if isinstance(widget, QtWidgets.QComboBox):
+            index = LAYER_SETTINGS_TYPES[key].index(value)
+            widget.setCurrentIndex(index)
+        elif isinstance(widget, QtWidgets.QCheckBox):
+            widget.setChecked(bool(value))
+        else:
+            widget.setText("" if value is None else str(value))
+
+    def populateSettings(self):
+        try:
+            workers = getattr(self.dataStorage, "conversion_workers", CONVERSION_WORKERS)
+            self.workersInput.setText(str(workers) if workers else "")
+            inFlight = getattr(self.dataStorage, "layers_in_flight", LAYERS_IN_FLIGHT)
+            self.inFlightInput.setText(
+                str(inFlight) if inFlight and inFlight != LAYERS_IN_FLIGHT else ""
+            )
+            layer = self.currentLayer()
+            for key in self.inputs:
+                if layer is None:
+                    value = LAYER_SETTINGS_DEFAULTS[key]
+                else:
+                    value = getLayerSetting(self.dataStorage, layer, key)
+                self.showValue(key, value)
+        except Exception as e:
+            logToUser(e, level=2, func=inspect.stack()[0][3])
+
+    def restoreDefaults(self):
+        self.workersInput.setText("")
+        self.inFlightInput.setText("")
+        for key in self.inputs:
+            self.showValue(key, LAYER_SETTINGS_DEFAULTS[key])
+
+    def applySettings(self):
+        """Sets the project options and the options of the selected layer; invalid values are not applied"""
+        try:
+            from speckle.speckle.utils.project_vars import set_layer_settings
+
+            text = self.workersInput.text().strip()
+            try:
+                workers = int(text) if text != "" else CONVERSION_WORKERS
+                if workers < 0:
+                    raise ValueError(f"'{text}' is negative")
+                self.dataStorage.conversion_workers = workers
+            except ValueError as e:
+                logToUser(
+                    f"Worker processes: {e}",
+                    level=1,
+                    func=inspect.stack()[0][3],
+                    plugin=self.plugin.dockwidget,
+                )
+
+            text = self.inFlightInput.text().strip()
+            try:
+                inFlight = int(text) if text != "" else LAYERS_IN_FLIGHT
+                if inFlight < 1:
+                    raise ValueError(f"'{text}' is less than 1")
+                self.dataStorage.layers_in_flight = inFlight
+            except ValueError as e:
+                logToUser(
+                    f"Layers in flight: {e}",
+                    level=1,
+                    func=inspect.stack()[0][3],
+                    plugin=self.plugin.dockwidget,
+                )
+
+            layer = self.currentLayer()
+            if layer is None:
+                set_layer_settings(self.plugin)
+                return
+            for key, widget in self.inputs.items():
+                if isinstance(widget, QtWidgets.QComboBox):
+                    value = LAYER_SETTINGS_TYPES[key][widget.currentIndex()]
+                elif isinstance(widget, QtWidgets.QCheckBox):
+                    value = widget.isChecked()
+                else:
+                    try:
+                        value = parseLayerSetting(key, widget.text())
+                    except ValueError as e:
+                        logToUser(
+                            f"{LAYER_SETTINGS_LABELS[key]}: {e}",
+                            level=1,
+                            func=inspect.stack()[0][3],
+                            plugin=self.plugin.dockwidget,
+                        )
+                        continue
+                setLayerSetting(self.dataStorage, layer, key, value)
+            set_layer_settings(self.plugin)
+            self.populateSettings()
+        except Exception as e:
+            logToUser(e, level=2, func=inspect.stack()[0][3])
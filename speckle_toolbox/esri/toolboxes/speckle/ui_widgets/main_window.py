@@ -129,6 +129,42 @@ class SpeckleGISDialog(SpeckleGISDialog_UI):
             logToUser(e, level=2, func=inspect.stack()[0][3], plugin=self)
             return
 
+    def addClearCacheButton(self, plugin):
+        """Adds the button dropping the layers converted earlier in the session"""
+        try:
+            if getattr(self, "clearCacheButton", None) is not None:
+                return
+            self.clearCacheButton = QtWidgets.QPushButton("Clear conversion cache")
+            self.clearCacheButton.setToolTip(
+                "Convert all layers again on the next send"
+            )
+            layout = self.crsSettings.parentWidget().layout()
+            if layout is None:
+                layout = self.layout()
+            layout.addWidget(self.clearCacheButton)
+            self.clearCacheButton.clicked.connect(plugin.onClearCacheClicked)
+        except Exception as e:
+            logToUser(e, level=2, func=inspect.stack()[0][3], plugin=self)
+            return
+
+    def addLayerSettingsButton(self, plugin):
+        """Adds the button opening the send options of each layer"""
+        try:
+            if getattr(self, "layerSettingsButton", None) is not None:
+                return
+            self.layerSettingsButton = QtWidgets.QPushButton("Layer send settings")
+            self.layerSettingsButton.setToolTip(
+                "Raster and polygon mesh options, feature reading and parallel conversion per layer"
+            )
+            layout = self.crsSettings.parentWidget().layout()
+            if layout is None:
+                layout = self.layout()
+            layout.addWidget(self.layerSettingsButton)
+            self.layerSettingsButton.clicked.connect(plugin.layerSettingsDialogCreate)
+        except Exception as e:
+            logToUser(e, level=2, func=inspect.stack()[0][3], plugin=self)
+            return
+
     def cancelOperations(self):
         for t in threading.enumerate():
             if "speckle_" in t.name:
@@ -0,0 +1,151 @@
+import os
+import struct
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+from speckle.speckle.converter.geometry.codec import (  # noqa: E402
+    decodeEsriJson,
+    decodeWkb,
+    geometryParts,
+    polygonRings,
+    ringSignedArea,
+    withCoords,
+)
+
+
+def wkbPoint(x, y, z=None, endian="<"):
+    flag = 1 if endian == "<" else 0
+    if z is None:
+        return struct.pack(endian + "BIdd", flag, 1, x, y)
+    return struct.pack(endian + "BIddd", flag, 1001, x, y, z)
+
+
+def wkbRing(coords):
+    coords = np.asarray(coords, dtype="<f8")
+    return struct.pack("<I", len(coords)) + coords.tobytes()
+
+
+def wkbPolygon(rings, wkbType=3):
+    return struct.pack("<BII", 1, wkbType, len(rings)) + b"".join(
+        wkbRing(ring) for ring in rings
+    )
+
+
+class Test_DecodeWkb(unittest.TestCase):
+    def test_point(self):
+        geom = decodeWkb(wkbPoint(1.5, 2.5))
+        self.assertEqual(geom.geomType, "Point")
+        self.assertFalse(geom.hasZ)
+        np.testing.assert_array_equal(geom.coords, [[1.5, 2.5, 0.0]])
+
+    def test_point_z_big_endian(self):
+        geom = decodeWkb(wkbPoint(1.0, 2.0, 3.0, endian=">"))
+        self.assertTrue(geom.hasZ)
+        np.testing.assert_array_equal(geom.coords, [[1.0, 2.0, 3.0]])
+
+    def test_empty_point(self):
+        geom = decodeWkb(wkbPoint(float("nan"), float("nan")))
+        self.assertEqual(len(geom.coords), 0)
+        self.assertEqual(geom.partOffsets.tolist(), [0])
+
+    def test_linestring_m_is_dropped(self):
+        coords = [[0, 0, 7], [1, 1, 8], [2, 0, 9]]
+        wkb = struct.pack("<BII", 1, 2002, 3) + np.asarray(coords, "<f8").tobytes()
+        geom = decodeWkb(wkb)
+        self.assertEqual(geom.geomType, "Polyline")
+        self.assertFalse(geom.hasZ)
+        np.testing.assert_array_equal(geom.coords[:, :2], [[0, 0], [1, 1], [2, 0]])
+        np.testing.assert_array_equal(geom.coords[:, 2], 0)
+
+    def test_ewkb_z_flag(self):
+        coords = [[0, 0, 1], [1, 1, 2]]
+        wkb = struct.pack("<BII", 1, 0x80000002, 2) + np.asarray(coords, "<f8").tobytes()
+        geom = decodeWkb(wkb)
+        self.assertTrue(geom.hasZ)
+        np.testing.assert_array_equal(geom.coords, coords)
+
+    def test_polygon_with_hole(self):
+        exterior = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+        hole = [[2, 2], [2, 4], [4, 4], [2, 2]]
+        geom = decodeWkb(wkbPolygon([exterior, hole]))
+        self.assertEqual(geom.geomType, "Polygon")
+        self.assertEqual(geom.partOffsets.tolist(), [0, 5, 9])
+        self.assertEqual(geom.polygonOffsets.tolist(), [0, 2])
+        rings = polygonRings(geom)
+        self.assertEqual(len(rings), 1)
+        self.assertEqual([len(r) for r in rings[0]], [5, 4])
+
+    def test_multipolygon(self):
+        square = [[0, 0], [1, 0], [1, 1], [0, 0]]
+        other = [[5, 5], [6, 5], [6, 6], [5, 5]]
+        wkb = (
+            struct.pack("<BII", 1, 6, 2)
+            + wkbPolygon([square])
+            + wkbPolygon([other])
+        )
+        geom = decodeWkb(wkb)
+        self.assertEqual(geom.geomType, "Polygon")
+        self.assertEqual(geom.polygonOffsets.tolist(), [0, 1, 2])
+        self.assertEqual(len(geometryParts(geom)), 2)
+
+    def test_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            decodeWkb(struct.pack("<BII", 1, 17, 0))
+
+
+class Test_DecodeEsriJson(unittest.TestCase):
+    def test_point(self):
+        geom = decodeEsriJson('{"x": 1, "y": 2, "z": 3}')
+        self.assertEqual(geom.geomType, "Point")
+        self.assertTrue(geom.hasZ)
+        np.testing.assert_array_equal(geom.coords, [[1, 2, 3]])
+
+    def test_empty_point(self):
+        geom = decodeEsriJson({"x": None, "y": None})
+        self.assertEqual(len(geom.coords), 0)
+
+    def test_paths(self):
+        geom = decodeEsriJson({"paths": [[[0, 0], [1, 1]], [], [[2, 2], [3, 3], [4, 4]]]})
+        self.assertEqual(geom.geomType, "Polyline")
+        self.assertEqual(geom.partOffsets.tolist(), [0, 2, 5])
+
+    def test_rings_are_grouped_by_orientation(self):
+        # Esri: exterior rings clockwise, holes counterclockwise
+        exterior1 = [[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]
+        hole = [[2, 2], [4, 2], [4, 4], [2, 2]]
+        exterior2 = [[20, 0], [20, 5], [25, 5], [20, 0]]
+        geom = decodeEsriJson({"rings": [exterior1, hole, exterior2]})
+        self.assertEqual(geom.polygonOffsets.tolist(), [0, 2, 3])
+        self.assertLess(ringSignedArea(np.asarray(exterior1, dtype=float)), 0)
+
+    def test_curves_are_not_decoded(self):
+        self.assertIsNone(decodeEsriJson({"curveRings": []}))
+
+    def test_unknown_geometry(self):
+        self.assertIsNone(decodeEsriJson({"foo": []}))
+
+    def test_same_result_as_wkb(self):
+        exterior = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+        fromWkb = decodeWkb(wkbPolygon([exterior]))
+        fromJson = decodeEsriJson({"rings": [exterior]})
+        np.testing.assert_array_equal(fromWkb.coords, fromJson.coords)
+        np.testing.assert_array_equal(fromWkb.partOffsets, fromJson.partOffsets)
+
+
+class Test_WithCoords(unittest.TestCase):
+    def test_structure_is_kept(self):
+        geom = decodeEsriJson({"paths": [[[0, 0], [1, 1]]]})
+        moved = withCoords(geom, geom.coords + 1)
+        np.testing.assert_array_equal(moved.coords[:, :2], [[1, 1], [2, 2]])
+        self.assertIs(moved.partOffsets, geom.partOffsets)
+        np.testing.assert_array_equal(geom.coords[:, :2], [[0, 0], [1, 1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+try:  # needs arcpy (imported through the logging utils) and specklepy
+    from specklepy.objects.geometry import Point
+    from speckle.speckle.converter.geometry.utils import (
+        apply_coords_offsets_rotation_on_send,
+        apply_pt_offsets_rotation_on_send,
+        transform_speckle_coords_on_receive,
+        transform_speckle_pt_on_receive,
+    )
+except ImportError:
+    Point = None
+
+COORDS = np.array(
+    [[0.0, 0.0, 0.0], [1.5, -2.0, 3.0], [-1234.5, 987.25, 1.0], [5e5, 5.7e6, -10.0]]
+)
+
+
+class FakeDataStorage:
+    latestHostApp = "revit"
+    matrix = None
+    crs_offset_x = None
+    crs_offset_y = None
+    crs_rotation = None
+    current_layer_crs_offset_x = None
+    current_layer_crs_offset_y = None
+    current_layer_crs_rotation = None
+
+
+@unittest.skipIf(Point is None, "arcpy or specklepy is not available")
+class Test_ReceiveTransform(unittest.TestCase):
+    def assertMatchesScalar(self, dataStorage):
+        result = transform_speckle_coords_on_receive(COORDS, dataStorage)
+        for coords, row in zip(COORDS, result):
+            pt = transform_speckle_pt_on_receive(
+                Point(x=coords[0], y=coords[1], z=coords[2], units="m"), dataStorage
+            )
+            np.testing.assert_allclose(row, [pt.x, pt.y, pt.z], rtol=1e-12, atol=1e-6)
+
+    def test_identity(self):
+        dataStorage = FakeDataStorage()
+        np.testing.assert_array_equal(
+            transform_speckle_coords_on_receive(COORDS, dataStorage), COORDS
+        )
+        self.assertMatchesScalar(dataStorage)
+
+    def test_project_offsets_rotation(self):
+        dataStorage = FakeDataStorage()
+        dataStorage.crs_offset_x = 1000.5
+        dataStorage.crs_offset_y = -250.25
+        for rotation in [30.0, -75, 359.0]:
+            dataStorage.crs_rotation = rotation
+            self.assertMatchesScalar(dataStorage)
+
+    def test_offsets_need_both_values(self):
+        dataStorage = FakeDataStorage()
+        dataStorage.crs_offset_x = 10.0
+        dataStorage.crs_rotation = 400.0  # out of range, ignored
+        self.assertMatchesScalar(dataStorage)
+
+    def test_gis_layer_offsets_rotation(self):
+        dataStorage = FakeDataStorage()
+        dataStorage.latestHostApp = "ArcGIS"
+        dataStorage.crs_offset_x = dataStorage.crs_offset_y = 99.0  # not applied
+        dataStorage.current_layer_crs_offset_x = 12.0
+        dataStorage.current_layer_crs_offset_y = 34.0
+        for rotation in [45.0, 45]:  # integer layer rotation is ignored
+            dataStorage.current_layer_crs_rotation = rotation
+            self.assertMatchesScalar(dataStorage)
+
+    def test_send_then_receive(self):
+        dataStorage = FakeDataStorage()
+        dataStorage.crs_offset_x = 1000.5
+        dataStorage.crs_offset_y = -250.25
+        dataStorage.crs_rotation = 30.0
+        sent = apply_coords_offsets_rotation_on_send(COORDS, dataStorage)
+        for coords, row in zip(COORDS, sent):
+            np.testing.assert_allclose(
+                row[:2],
+                apply_pt_offsets_rotation_on_send(coords[0], coords[1], dataStorage),
+                rtol=1e-12,
+                atol=1e-6,
+            )
+        np.testing.assert_allclose(
+            transform_speckle_coords_on_receive(sent, dataStorage), COORDS, atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
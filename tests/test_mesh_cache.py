@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+try:  # needs arcpy (imported through the layer utils)
+    from speckle.speckle.converter.geometry.mesh_cache import (
+        MeshCache,
+        meshCacheKey,
+        offsetFaces,
+    )
+except ImportError:
+    MeshCache = None
+
+
+class FakeDataStorage:
+    crs_offset_x = None
+    crs_offset_y = None
+    crs_rotation = None
+
+
+@unittest.skipIf(MeshCache is None, "arcpy is not available")
+class Test_MeshCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "mesh_cache.sqlite")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_put_get_between_sessions(self):
+        cache = MeshCache(self.path)
+        vertices = np.arange(9, dtype=float)
+        faces = np.array([3, 0, 1, 2])
+        cache.put("a", vertices, faces)
+        self.assertIsNotNone(cache.get("a"))  # pending
+        cache.close()
+
+        cache = MeshCache(self.path)
+        cachedVertices, cachedFaces = cache.get("a")
+        np.testing.assert_array_equal(cachedVertices, vertices)
+        np.testing.assert_array_equal(cachedFaces, faces)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_least_recently_used_are_evicted(self):
+        size = 9 * 8 + 4 * 8
+        cache = MeshCache(self.path, maxBytes=3 * size)
+        for key in ["a", "b", "c", "d"]:
+            cache.put(key, np.zeros(9), np.array([3, 0, 1, 2]))
+            cache.flush()
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("d"))
+        cache.close()
+
+    def test_key(self):
+        ring = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0]], dtype=float)
+        dataStorage = FakeDataStorage()
+        key = meshCacheKey([ring], 0.0, None, dataStorage)
+        self.assertEqual(key, meshCacheKey([ring.copy()], 0.0, None, dataStorage))
+        self.assertNotEqual(key, meshCacheKey([ring], 0.5, None, dataStorage))
+        self.assertNotEqual(key, meshCacheKey([ring + 1], 0.0, None, dataStorage))
+        dataStorage.crs_rotation = 10.0
+        self.assertNotEqual(key, meshCacheKey([ring], 0.0, None, dataStorage))
+
+    def test_offset_faces(self):
+        triangles = np.array([3, 0, 1, 2, 3, 2, 1, 0])
+        self.assertEqual(offsetFaces(triangles, 5).tolist(), [3, 5, 6, 7, 3, 7, 6, 5])
+        mixed = np.array([4, 0, 1, 2, 3, 3, 0, 1, 2])
+        self.assertEqual(
+            offsetFaces(mixed, 1).tolist(), [4, 1, 2, 3, 4, 3, 1, 2, 3]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+from speckle.speckle.converter.geometry.raster_mesh import (  # noqa: E402
+    packColors,
+    rasterDownsample,
+    rasterDownsampleFactor,
+    rasterGreyscaleColors,
+    rasterGridFaces,
+    rasterGridVertices,
+    rasterMergedGridVertices,
+    rasterMergedRectangles,
+    rasterNoDataMask,
+    rasterRgbColors,
+    rasterSharedGridColors,
+    rasterSharedGridCull,
+    rasterSharedGridFaces,
+    rasterSharedGridVertices,
+    rasterStretchColors,
+    rasterUniqueValueColors,
+)
+from speckle.speckle.converter.features.raster_reader import (  # noqa: E402
+    RASTER_EXTREME_VALUE,
+    readRasterBand,
+)
+
+
+class Test_RasterColors(unittest.TestCase):
+    def test_pack(self):
+        self.assertEqual(packColors([255], [0], [1]).tolist(), [(255 << 16) + 1])
+
+    def test_greyscale(self):
+        colors = rasterGreyscaleColors(np.array([0.0, 10.0, np.nan]))
+        self.assertEqual(colors.tolist(), [0, packColors(255, 255, 255), 0])
+
+    def test_stretch_out_of_range_is_black(self):
+        colors = rasterStretchColors(np.array([-1.0, 0.0, 5.0, 11.0]), 0, 10)
+        self.assertEqual(colors[0], 0)
+        self.assertEqual(colors[3], 0)
+        self.assertEqual(colors[2], packColors(127, 127, 127))
+
+    def test_unique_values(self):
+        classes = [(1.0, 100), (2.0, 200), (1.0, 300)]
+        colors = rasterUniqueValueColors(np.array([2, 1, 3], dtype=np.uint8), classes)
+        self.assertEqual(colors.tolist(), [200, 100, 0])
+
+    def test_rgb_missing_band(self):
+        band = np.array([0, 255], dtype=np.uint8)
+        colors = rasterRgbColors([band, None, band], [0, None, 0], [255, None, 255], 2)
+        self.assertEqual(colors.tolist(), [0, packColors(255, 0, 255)])
+
+    def test_nodata_mask(self):
+        self.assertIsNone(rasterNoDataMask([np.array([1.0, 2.0])], [0]))
+        mask = rasterNoDataMask(
+            [np.array([0.0, 0.0, 5.0]), np.array([0.0, 1.0, np.nan])], [0, 0]
+        )
+        self.assertEqual(mask.tolist(), [False, True, True])
+
+
+class Test_RasterGrids(unittest.TestCase):
+    def test_cell_grid(self):
+        vertices = rasterGridVertices(0, 0, 1, -1, 3, 2).reshape(-1, 4, 3)
+        self.assertEqual(len(vertices), 6)
+        np.testing.assert_array_equal(
+            vertices[4, :, :2], [[1, -1], [1, -2], [2, -2], [2, -1]]
+        )
+        faces = rasterGridFaces(6).reshape(-1, 5)
+        self.assertEqual(faces[1].tolist(), [4, 4, 5, 6, 7])
+
+    def test_cell_grid_valid_cells(self):
+        valid = np.array([True, False, True, False])
+        vertices = rasterGridVertices(0, 0, 1, 1, 2, 2, valid)
+        self.assertEqual(len(vertices), 2 * 12)
+
+    def test_shared_grid(self):
+        vertices = rasterSharedGridVertices(0, 0, 1, 1, 3, 2)
+        faces = rasterSharedGridFaces(3, 2).reshape(-1, 5)
+        self.assertEqual(len(vertices), 4 * 3 * 3)
+        self.assertEqual(faces.shape, (6, 5))
+        self.assertEqual(faces[0].tolist(), [4, 0, 4, 5, 1])
+        colors = rasterSharedGridColors(np.arange(6), 3, 2)
+        self.assertEqual(len(colors), 12)
+        self.assertEqual(colors[-1], 5)
+
+    def test_shared_grid_cull(self):
+        vertices = rasterSharedGridVertices(0, 0, 1, 1, 2, 1)
+        faces = rasterSharedGridFaces(2, 1)
+        colors = rasterSharedGridColors(np.array([7, 8]), 2, 1)
+        vertices, faces, colors = rasterSharedGridCull(
+            vertices, faces, colors, np.array([False, True])
+        )
+        self.assertEqual(len(vertices), 4 * 3)
+        self.assertEqual(sorted(faces[1:].tolist()), [0, 1, 2, 3])
+        self.assertEqual(len(colors), 4)
+
+
+class Test_RasterDownsample(unittest.TestCase):
+    def test_factor(self):
+        self.assertEqual(rasterDownsampleFactor(100, 100, None), 1)
+        self.assertEqual(rasterDownsampleFactor(100, 100, 10000), 1)
+        factor = rasterDownsampleFactor(100, 100, 2500)
+        self.assertEqual(factor, 2)
+        self.assertLessEqual(
+            np.ceil(101 / rasterDownsampleFactor(101, 99, 500))
+            * np.ceil(99 / rasterDownsampleFactor(101, 99, 500)),
+            500,
+        )
+
+    def test_mean_ignores_nodata(self):
+        band = np.array([1, 3, 0, 0, 1, 1, 0, 0, 9], dtype=np.int16)
+        values, width, height = rasterDownsample(band, 3, 3, 2, "mean", 0)
+        self.assertEqual((width, height), (2, 2))
+        np.testing.assert_allclose(values, [5 / 3, 1, 0, 9])
+
+    def test_mode_and_nearest(self):
+        band = np.array([[1, 2, 2, 5], [2, 3, 5, 5]]).ravel()
+        values, _, _ = rasterDownsample(band, 4, 2, 2, "mode")
+        self.assertEqual(values.tolist(), [2, 5])
+        values, _, _ = rasterDownsample(band, 4, 2, 2, "nearest")
+        self.assertEqual(values.tolist(), [1, 2])
+
+
+class Test_RasterMergedRectangles(unittest.TestCase):
+    def test_runs_are_extended_down(self):
+        colors = np.array([[1, 1, 2], [1, 1, 2], [3, 3, 2]]).ravel()
+        rectangles, rectColors = rasterMergedRectangles(colors, 3, 3)
+        self.assertEqual(
+            rectangles.tolist(), [[0, 0, 2, 2], [0, 2, 3, 3], [2, 0, 3, 2]]
+        )
+        self.assertEqual(rectColors.tolist(), [1, 2, 3])
+        vertices = rasterMergedGridVertices(0, 0, 1, 1, rectangles).reshape(-1, 4, 3)
+        np.testing.assert_array_equal(
+            vertices[0, :, :2], [[0, 0], [0, 2], [2, 2], [2, 0]]
+        )
+
+    def test_invalid_cells_are_not_merged(self):
+        colors = np.zeros(4, dtype=np.int64)
+        valid = np.array([True, False, False, True])
+        rectangles, _ = rasterMergedRectangles(colors, 2, 2, valid)
+        self.assertEqual(rectangles.tolist(), [[0, 0, 1, 1], [1, 1, 2, 2]])
+        rectangles, _ = rasterMergedRectangles(colors, 2, 2, np.zeros(4, dtype=bool))
+        self.assertEqual(rectangles.shape, (0, 4))
+
+    def test_cells_are_covered_once(self):
+        rng = np.random.default_rng(0)
+        colors = rng.integers(0, 3, 20 * 15)
+        valid = rng.random(20 * 15) > 0.2
+        rectangles, rectColors = rasterMergedRectangles(colors, 20, 15, valid)
+        covered = np.zeros((15, 20), dtype=int)
+        grid = colors.reshape(15, 20)
+        for (r0, c0, r1, c1), color in zip(rectangles.tolist(), rectColors.tolist()):
+            covered[r0:r1, c0:c1] += 1
+            self.assertTrue(np.all(grid[r0:r1, c0:c1] == color))
+        np.testing.assert_array_equal(covered.ravel(), valid.astype(int))
+
+
+class FakeExtent:
+    def __init__(self, width, height):
+        self.XMin, self.YMin, self.XMax, self.YMax = 0, 0, width, height
+
+
+class FakeRasterBand:
+    """Raster band with the read interface of arcpy.ia RasterBand"""
+
+    def __init__(self, values, noDataValue=None):
+        self.values = np.asarray(values)
+        self.noDataValue = noDataValue
+        self.minimum = float(self.values.min())
+        self.extent = FakeExtent(self.values.shape[1], self.values.shape[0])
+        self.meanCellWidth = self.meanCellHeight = 1
+        self.reads = 0
+
+    def read(self, upper_left_corner, ncols, nrows):
+        self.reads += 1
+        row, col = upper_left_corner
+        return self.values[row : row + nrows, col : col + ncols]
+
+
+class Test_ReadRasterBand(unittest.TestCase):
+    def test_blocks_are_assembled(self):
+        values = np.arange(5 * 7, dtype=np.uint8).reshape(5, 7)
+        band = FakeRasterBand(values)
+        result, valMin, noData = readRasterBand(band, 7, 5, None, blockSize=3)
+        self.assertEqual(band.reads, 6)
+        self.assertEqual(result.dtype, np.uint8)
+        np.testing.assert_array_equal(result, values.ravel())
+        self.assertEqual(valMin, 0)
+        self.assertIsNone(noData)
+
+    def test_extreme_nodata_is_replaced(self):
+        values = np.array([[RASTER_EXTREME_VALUE * 10, 5.0], [7.0, 9.0]])
+        band = FakeRasterBand(values)
+        result, valMin, noData = readRasterBand(band, 2, 2, values[0, 0], blockSize=1)
+        self.assertEqual(valMin, 5.0)
+        self.assertEqual(noData, 5.0 - 1000)
+        self.assertEqual(result.tolist(), [noData, 5.0, 7.0, 9.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+try:  # needs arcpy (imported through the layer utils) and specklepy
+    from specklepy.objects import Base
+    from specklepy.objects.geometry import Mesh, Point
+    from specklepy.objects.GIS.layers import VectorLayer
+    from specklepy.objects.other import Collection
+    from specklepy.serialization.base_object_serializer import BaseObjectSerializer
+    from specklepy.transports.memory import MemoryTransport
+    from specklepy.transports.sqlite import SQLiteTransport
+
+    from speckle.speckle.converter.layers.sent_objects import (
+        ReferenceSerializer,
+        SentObjectReference,
+        SentObjectsCache,
+        referencesSupported,
+    )
+except ImportError:
+    ReferenceSerializer = None
+
+
+def feature(k):
+    feat = Base()
+    feat.attributes = Base(name=f"feature {k}")
+    feat.geometry = [Point(x=float(k), y=0.0, z=0.0)]
+    feat["@displayValue"] = [
+        Mesh(vertices=[0, 0, float(k), 1, 0, 0, 1, 1, 0], faces=[3, 0, 1, 2])
+    ]
+    return feat
+
+
+def collection(elements):
+    layer = VectorLayer(name="layer", elements=elements)
+    return Collection(name="root", collectionType="root", elements=[layer])
+
+
+@unittest.skipIf(ReferenceSerializer is None, "arcpy or specklepy is not available")
+@unittest.skipUnless(
+    ReferenceSerializer is not None and referencesSupported(),
+    "specklepy is not the version in requirements.txt",
+)
+class Test_ReferenceSerializer(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.transport = SQLiteTransport(
+            base_path=self.folder, app_name="test", scope="objects"
+        )
+        self.cache = SentObjectsCache(os.path.join(self.folder, "sent.sqlite"))
+        self.cache.transport = self.transport
+
+        self.features = [feature(k) for k in range(4)]
+        self.sent = MemoryTransport()
+        self.rootId, self.rootJson = BaseObjectSerializer(
+            [self.transport, self.sent]
+        ).traverse_base(collection(self.features))
+
+    def tearDown(self):
+        self.cache.close()
+        self.transport.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def featureIds(self):
+        layerId = self.rootJson["elements"][0]["referencedId"]
+        layerJson = json.loads(self.transport.get_object(layerId))
+        return [item["referencedId"] for item in layerJson["elements"]]
+
+    def test_reference(self):
+        objId = self.featureIds()[0]
+        reference = self.cache.reference(objId)
+        self.assertIsInstance(reference, SentObjectReference)
+        self.assertEqual(reference.referencedId, objId)
+        self.assertEqual(
+            reference.closure,
+            json.loads(self.transport.get_object(objId))["__closure"],
+        )
+        self.assertIsNone(self.cache.reference("missing"))
+
+    def test_same_objects_as_serializer(self):
+        ids = self.featureIds()
+        elements = [
+            self.cache.reference(ids[0]),
+            self.features[1],
+            self.cache.reference(ids[2]),
+            self.features[3],
+        ]
+        sent = MemoryTransport()
+        rootId, rootJson = ReferenceSerializer(
+            [self.transport, sent], self.transport
+        ).traverse_base(collection(elements))
+
+        self.assertEqual(rootId, self.rootId)
+        self.assertEqual(rootJson["__closure"], self.rootJson["__closure"])
+        self.assertEqual(set(sent.objects), set(self.sent.objects))
+        for objId, serialized in self.sent.objects.items():
+            self.assertEqual(json.loads(sent.objects[objId]), json.loads(serialized))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+from speckle.speckle.converter.geometry.simplify import (  # noqa: E402
+    pointInRing,
+    ringsCross,
+    ringsTopologyValid,
+    ringVertexImportance,
+    simplifyPolygonRings,
+)
+
+SQUARE = np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=float)
+# square with a bump at the top, dropped by a tolerance of 1.5
+BUMP = np.array([[0, 0], [10, 0], [10, 10], [5.5, 10], [5, 11], [4.5, 10], [0, 10]])
+
+
+def circle(count, radius=10.0, center=(0.0, 0.0)):
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    return np.column_stack(
+        (
+            center[0] + radius * np.cos(angles),
+            center[1] + radius * np.sin(angles),
+            np.zeros(count),
+        )
+    )
+
+
+class Test_RingVertexImportance(unittest.TestCase):
+    def test_collinear_vertices_are_unimportant(self):
+        ring = np.array([[0, 0], [5, 0], [10, 0], [10, 10], [0, 10]], dtype=float)
+        importance = ringVertexImportance(ring)
+        self.assertEqual(importance[1], 0)
+        self.assertTrue(np.all(importance[[0, 2, 3, 4]] > 0))
+
+    def test_small_rings_keep_everything(self):
+        importance = ringVertexImportance(np.zeros((3, 2)))
+        self.assertTrue(np.all(np.isinf(importance)))
+
+
+class Test_SimplifyPolygonRings(unittest.TestCase):
+    def test_unchanged_without_tolerance_or_budget(self):
+        rings = [circle(50)]
+        result = simplifyPolygonRings(rings)
+        np.testing.assert_array_equal(result[0], rings[0])
+
+    def test_tolerance(self):
+        ring = circle(200)
+        result = simplifyPolygonRings([ring], tolerance=0.5)
+        self.assertLess(len(result[0]), len(ring))
+        self.assertGreaterEqual(len(result[0]), 3)
+
+    def test_vertex_budget(self):
+        rings = [circle(200), circle(100, radius=2)]
+        result = simplifyPolygonRings(rings, vertexBudget=40)
+        self.assertLessEqual(sum(len(r) for r in result), 40)
+        self.assertGreaterEqual(len(result[0]), 3)
+
+    def test_vertices_keep_ring_order(self):
+        ring = circle(100)
+        result = simplifyPolygonRings([ring], vertexBudget=10)[0]
+        positions = [int(np.flatnonzero((ring == v).all(axis=1))[0]) for v in result]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_small_holes_are_dropped(self):
+        rings = [circle(100), circle(4, radius=0.01)]
+        result = simplifyPolygonRings(rings, tolerance=1.0)
+        self.assertEqual(len(result), 1)
+
+    def test_hole_crossing_the_simplified_exterior(self):
+        hole = np.array([[4.9, 9.8], [5, 10.6], [5.1, 9.8]])
+        result = simplifyPolygonRings([BUMP, hole], tolerance=1.5)
+        np.testing.assert_array_equal(result[0], BUMP)
+        np.testing.assert_array_equal(result[1], hole)
+
+    def test_hole_outside_of_the_simplified_exterior(self):
+        hole = np.array([[4.9, 10.3], [5, 10.6], [5.1, 10.3]])
+        result = simplifyPolygonRings([BUMP, hole], tolerance=1.5)
+        self.assertEqual(len(result[0]), len(BUMP))
+
+    def test_valid_simplification_is_kept(self):
+        hole = np.array([[4.9, 9.0], [5, 9.5], [5.1, 9.0]])
+        result = simplifyPolygonRings([BUMP, hole], tolerance=1.5)
+        self.assertEqual([len(r) for r in result], [4, 3])
+
+    def test_invalid_exterior(self):
+        self.assertEqual(simplifyPolygonRings([np.zeros((2, 3))]), [])
+        self.assertEqual(simplifyPolygonRings([]), [])
+
+
+class Test_RingsTopology(unittest.TestCase):
+    def test_crossing_edges(self):
+        self.assertFalse(ringsCross([SQUARE]))
+        bowtie = np.array([[0, 0], [10, 10], [10, 0], [0, 10]], dtype=float)
+        self.assertTrue(ringsCross([bowtie]))
+        self.assertTrue(ringsCross([SQUARE, SQUARE + 5]))
+
+    def test_many_edges(self):
+        angles = np.linspace(0, 2 * np.pi, 5000, endpoint=False)
+        ring = np.column_stack((np.cos(angles), np.sin(angles)))
+        self.assertFalse(ringsCross([ring, ring[::-1] * 0.5], maxPairs=100))
+        self.assertTrue(ringsCross([ring, ring[::-1] * 0.5 + [0.6, 0]], maxPairs=100))
+
+    def test_point_in_ring(self):
+        self.assertTrue(pointInRing(np.array([5, 5]), SQUARE))
+        self.assertFalse(pointInRing(np.array([15, 5]), SQUARE))
+
+    def test_holes(self):
+        hole = SQUARE[::-1] * 0.2 + 1
+        self.assertTrue(ringsTopologyValid([SQUARE, hole]))
+        self.assertFalse(ringsTopologyValid([SQUARE, hole + 20]))
+        self.assertFalse(ringsTopologyValid([SQUARE, hole, hole * 0.5 + 1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
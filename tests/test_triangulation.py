@@ -0,0 +1,145 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "speckle_toolbox", "esri", "toolboxes")
+)
+
+from speckle.speckle.converter.geometry.triangulation import (  # noqa: E402
+    earcut,
+    triangulatePolygon,
+    triangulatePolygons,
+    triangulatePolygonsParts,
+)
+
+SQUARE = np.array([[0, 0, 0], [10, 0, 0], [10, 10, 0], [0, 10, 0]], dtype=float)
+
+
+def ringArea(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return abs(0.5 * (np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def trianglesArea(coords, triangles):
+    a, b, c = (coords[triangles[:, k], :2] for k in range(3))
+    cross = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (
+        c[:, 0] - a[:, 0]
+    )
+    return float(np.abs(cross).sum() / 2)
+
+
+def pointInTriangles(point, coords, triangles):
+    px, py = point
+    for tri in coords[triangles][:, :, :2]:
+        d = [
+            (tri[(k + 1) % 3][0] - tri[k][0]) * (py - tri[k][1])
+            - (tri[(k + 1) % 3][1] - tri[k][1]) * (px - tri[k][0])
+            for k in range(3)
+        ]
+        if all(v > 0 for v in d) or all(v < 0 for v in d):
+            return True
+    return False
+
+
+def circle(count, radius, center):
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    return np.column_stack(
+        (
+            center[0] + radius * np.cos(angles),
+            center[1] + radius * np.sin(angles),
+            np.zeros(count),
+        )
+    )
+
+
+class Test_Earcut(unittest.TestCase):
+    def test_square(self):
+        triangles = earcut([0, 0, 1, 0, 1, 1, 0, 1])
+        self.assertEqual(len(triangles), 6)
+        self.assertEqual(sorted(set(triangles)), [0, 1, 2, 3])
+
+    def test_degenerate(self):
+        self.assertEqual(earcut([0, 0, 1, 1]), [])
+
+
+class Test_TriangulatePolygon(unittest.TestCase):
+    def test_convex(self):
+        triangles = triangulatePolygon([SQUARE])
+        self.assertEqual(triangles.shape, (2, 3))
+
+    def test_concave_area(self):
+        ring = np.array([[0, 0], [10, 0], [10, 10], [5, 3], [0, 10]], dtype=float)
+        triangles = triangulatePolygon([ring])
+        self.assertEqual(len(triangles), 3)
+        self.assertAlmostEqual(trianglesArea(ring, triangles), ringArea(ring))
+
+    def test_holes_are_not_covered(self):
+        hole1 = SQUARE[::-1] * 0.2 + [1, 1, 0]
+        hole2 = SQUARE[::-1] * 0.3 + [5, 5, 0]
+        rings = [SQUARE, hole1, hole2]
+        coords = np.concatenate(rings)
+        triangles = triangulatePolygon(rings)
+        self.assertAlmostEqual(
+            trianglesArea(coords, triangles),
+            ringArea(SQUARE) - ringArea(hole1) - ringArea(hole2),
+        )
+        self.assertFalse(pointInTriangles([2, 2], coords, triangles))
+        self.assertFalse(pointInTriangles([6.5, 6.5], coords, triangles))
+        self.assertTrue(pointInTriangles([8, 2], coords, triangles))
+
+    def test_large_polygon_with_holes(self):
+        # above the z-order hashing threshold
+        exterior = circle(300, 100, (0, 0))
+        holes = [circle(40, 10, (x, 0))[::-1] for x in (-50, 0, 50)]
+        rings = [exterior] + holes
+        triangles = triangulatePolygon(rings)
+        self.assertEqual(len(triangles), sum(len(r) for r in rings) + 2 * 3 - 2)
+        self.assertAlmostEqual(
+            trianglesArea(np.concatenate(rings), triangles),
+            ringArea(exterior) - sum(ringArea(h) for h in holes),
+            places=6,
+        )
+
+    def test_too_few_vertices(self):
+        triangles = triangulatePolygon([SQUARE[:2]])
+        self.assertEqual(triangles.shape, (0, 3))
+
+
+class Test_TriangulatePolygons(unittest.TestCase):
+    def test_faces_and_offsets(self):
+        other = SQUARE + [20, 0, 0]
+        vertices, faces = triangulatePolygons([[SQUARE], [other]], 5)
+        self.assertEqual(len(vertices), 8 * 3)
+        faces = faces.reshape(-1, 4)
+        self.assertTrue(np.all(faces[:, 0] == 3))
+        self.assertEqual(faces[:, 1:].min(), 5)
+        self.assertEqual(faces[:, 1:].max(), 5 + 7)
+
+    def test_nan_z_and_2d_rings(self):
+        ring = SQUARE.copy()
+        ring[:, 2] = np.nan
+        vertices, _ = triangulatePolygons([[ring], [SQUARE[:, :2]]])
+        self.assertFalse(np.isnan(vertices).any())
+        self.assertEqual(len(vertices), 8 * 3)
+
+    def test_parts_offsets(self):
+        hole = SQUARE[::-1] * 0.2 + [1, 1, 0]
+        polygons = [[SQUARE, hole], [SQUARE[:2]], [SQUARE + [20, 0, 0]]]
+        vertices, faces, vertexOffsets, faceOffsets = triangulatePolygonsParts(polygons)
+        self.assertEqual(vertexOffsets.tolist(), [0, 8, 8, 12])
+        self.assertEqual(faceOffsets.tolist(), [0, 8, 8, 10])
+        self.assertEqual(len(vertices), 12 * 3)
+        last = faces.reshape(-1, 4)[faceOffsets[2] : faceOffsets[3], 1:]
+        self.assertTrue(np.all(last >= vertexOffsets[2]))
+
+    def test_invalid_polygons_are_skipped(self):
+        vertices, faces = triangulatePolygons([[SQUARE[:2]]])
+        self.assertEqual(len(vertices), 0)
+        self.assertEqual(len(faces), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()